@@ -0,0 +1,388 @@
+"""
+Activity Catalog - Deterministic activity suggestions and content ranking
+
+suggest_activities and personalize_content only depend on a few profile
+fields (age band, learning style, interests), so both psychology agents score
+them locally instead of asking the LLM:
+
+- activities: a fixed catalog tagged with developmental milestones (from
+  developmental_stages.DEVELOPMENTAL_STAGES), learning styles and
+  interests, indexed by age band and interest at import
+- content options: free-form dicts scored on the text of their known fields;
+  personalize_content keeps the keys of the old LLM answer
+  (recommended_content as a display string, difficulty_level, themes,
+  engagement_score) and adds recommended_option and ranked_options
+
+Scores are plain sums, ties keep catalog (or input) order, and interests are
+compared as turkish_text tokens matched as word prefixes, like the story
+search, so "Müzik", "muzik", "müziği" and "Müzikli" match. Without an age
+band (age unknown) activities of every band compete, without milestone points.
+With PSYCHOLOGY_LLM_ENRICHMENT=1 the agents still pass the local result to
+the LLM for extra detail, falling back to it if the call fails.
+"""
+
+import json
+import os
+from typing import Dict, List, Any, Iterable, Optional, Sequence, Set, Tuple
+
+from ..turkish_text import MIN_STEM, tokens
+from .developmental_stages import STAGE_MILESTONES
+
+LLM_ENRICHMENT = os.getenv("PSYCHOLOGY_LLM_ENRICHMENT", "0") == "1"
+
+CATEGORIES = ["Bilişsel", "Sosyal-Duygusal", "Yaratıcılık", "Fiziksel", "Kültürel Değer"]
+LEARNING_STYLES = ["visual", "auditory", "kinesthetic"]
+STAGE_DIFFICULTY = {"3-4": "easy", "5-6": "easy", "7-8": "medium", "9-12": "hard"}
+DIFFICULTY_RANK = {"easy": 0, "medium": 1, "hard": 2}
+
+# personalize_content answer when there is nothing to rank (the old static fallback)
+DEFAULT_RECOMMENDATION = "Hikaye temelli aktiviteler"
+DEFAULT_THEMES = ["Hayvanlar", "Doğa"]
+DEFAULT_ENGAGEMENT = 85
+
+MILESTONE_WEIGHT = 3
+STYLE_WEIGHT = 2
+INTEREST_WEIGHT = 2
+
+# Turkish and English spellings of the Child.learning_style values, as search terms
+_STYLE_ALIASES = {
+    term: style
+    for style, spellings in {
+        "visual": ["visual", "görsel"],
+        "auditory": ["auditory", "işitsel"],
+        "kinesthetic": ["kinesthetic", "kinestetik", "dokunsal"],
+    }.items()
+    for spelling in spellings
+    for term in tokens(spelling)
+}
+
+# Words in a content option that suggest the learning style it suits
+_STYLE_TERMS = {
+    "visual": ["görsel", "resim", "boyama", "çizim", "video", "kart", "visual", "image", "picture"],
+    "auditory": ["sesli", "dinleme", "müzik", "şarkı", "ninni", "tekerleme", "audio", "song"],
+    "kinesthetic": ["hareket", "oyun", "dans", "yapım", "drama", "game", "movement"],
+}
+_STYLE_TOKENS = {style: {term for word in words for term in tokens(word)} for style, words in _STYLE_TERMS.items()}
+
+# Option fields read when ranking content
+_OPTION_TEXT_FIELDS = ["title", "name", "type", "description", "themes", "tags", "values_taught", "cultural_elements"]
+
+_ALL_BANDS = ("3-4", "5-6", "7-8", "9-12")
+
+# (name, category, age bands, milestones, styles, interests, learning goal, materials, minutes, success criteria)
+_CATALOG: List[Tuple] = [
+    ("Hikaye Tamamlama", "Yaratıcılık", ("5-6", "7-8", "9-12"),
+     ("narrative_skills", "story_comprehension", "symbolic_thinking"), ("auditory",), ("masallar",),
+     "Hikayenin sonunu kendi cümleleriyle kurmak", ["Kısa bir masal"], 10, "Hikayeye tutarlı bir son ekler"),
+    ("Renk ve Şekil Eşleştirme", "Bilişsel", ("3-4",),
+     ("basic_categorization", "symbolic_thinking"), ("visual", "kinesthetic"), ("resim",),
+     "Renkleri ve şekilleri gruplamak", ["Renkli kartlar"], 5, "Kartların çoğunu doğru gruplar"),
+    ("Hayvan Sesleri Oyunu", "Bilişsel", ("3-4", "5-6"),
+     ("vocabulary_expansion", "basic_categorization"), ("auditory",), ("hayvanlar",),
+     "Hayvanları sesleriyle tanımak", ["Hayvan sesleri kaydı", "Hayvan resimleri"], 10, "Beş hayvanı sesinden bilir"),
+    ("Duygu Kartları", "Sosyal-Duygusal", ("3-4", "5-6"),
+     ("emotion_identification", "basic_empathy", "emotion_regulation"), ("visual",), (),
+     "Yüz ifadelerinden duyguları adlandırmak", ["Duygu yüz kartları"], 10, "Dört temel duyguyu adlandırır"),
+    ("Müzikle Dur-Kalk", "Fiziksel", ("3-4", "5-6"),
+     ("self_regulation_beginning", "rule_understanding"), ("auditory", "kinesthetic"), ("müzik", "spor"),
+     "Müzik durunca durarak kendini düzenlemek", ["Müzik çalar"], 10, "Müzik durduğunda hareketsiz kalır"),
+    ("Ninni ve Tekerleme Söyleme", "Kültürel Değer", ("3-4", "5-6"),
+     ("sentence_formation", "attachment_security"), ("auditory",), ("müzik", "masallar"),
+     "Geleneksel ninni ve tekerlemeleri tekrar etmek", ["Tekerleme listesi"], 5, "Bir tekerlemeyi ezberden söyler"),
+    ("Parmak Boyası ile Doğa Resmi", "Yaratıcılık", ("3-4", "5-6"),
+     ("symbolic_thinking", "independence"), ("visual", "kinesthetic"), ("resim", "doğa"),
+     "Gördüğü doğayı resimle anlatmak", ["Parmak boyası", "Kağıt"], 15, "Resmini anlatan iki cümle kurar"),
+    ("Sırayla Oyuncak Paylaşma", "Sosyal-Duygusal", ("3-4", "5-6"),
+     ("parallel_play", "cooperative_play", "social_rules"), ("kinesthetic",), (),
+     "Sıra beklemek ve paylaşmak", ["Oyuncaklar", "Kum saati"], 10, "Sırasını bekleyerek oyuncağı paylaşır"),
+    ("Sayı Avı", "Bilişsel", ("5-6",),
+     ("number_concepts", "logical_reasoning"), ("visual", "kinesthetic"), ("doğa",),
+     "Çevredeki nesneleri saymak ve gruplamak", ["Sayı kartları"], 10, "Onlu gruplar oluşturur"),
+    ("Neden-Sonuç Kartları", "Bilişsel", ("5-6", "7-8"),
+     ("cause_effect", "logical_reasoning"), ("visual",), ("doğa", "hayvanlar"),
+     "Olayların sebep ve sonuçlarını eşleştirmek", ["Resimli olay kartları"], 10, "Üç olay zincirini doğru sıralar"),
+    ("Arkadaşlık Masalı Canlandırma", "Sosyal-Duygusal", ("5-6", "7-8"),
+     ("friendship_concepts", "moral_development", "cooperative_play"), ("kinesthetic", "auditory"), ("masallar",),
+     "Arkadaşlık değerlerini rol oyunu ile yaşamak", ["Basit kostümler"], 15, "Karakterin duygusunu ifade eder"),
+    ("Geleneksel Çocuk Oyunları", "Kültürel Değer", ("5-6", "7-8", "9-12"),
+     ("social_rules", "team_work", "competition_understanding"), ("kinesthetic",), ("spor",),
+     "Saklambaç, körebe gibi oyunlarla kurallara uymak", ["Açık alan"], 20, "Oyun kurallarını arkadaşlarına anlatır"),
+    ("Hayvan Taklidi Dansı", "Fiziksel", ("3-4", "5-6"),
+     ("symbolic_thinking", "parallel_play"), ("kinesthetic",), ("hayvanlar", "müzik"),
+     "Hayvan hareketleriyle beden koordinasyonu", ["Müzik çalar"], 10, "Beş hayvanın hareketini taklit eder"),
+    ("Okuma Öncesi Ses Oyunu", "Bilişsel", ("5-6",),
+     ("reading_readiness", "complex_sentences"), ("auditory",), (),
+     "Kelimelerin ilk seslerini ayırt etmek", ["Resimli kelime kartları"], 10, "Aynı sesle başlayan kelimeleri bulur"),
+    ("Sınıflandırma Kutusu", "Bilişsel", ("7-8",),
+     ("classification", "concrete_operations", "conservation"), ("kinesthetic", "visual"), ("doğa",),
+     "Nesneleri birden fazla özelliğe göre sınıflandırmak", ["Yaprak, taş, düğme"], 15, "İki ölçüte göre sınıflar"),
+    ("Takım Bulmacası", "Sosyal-Duygusal", ("7-8", "9-12"),
+     ("team_work", "peer_relationships", "group_dynamics"), ("visual", "kinesthetic"), (),
+     "Birlikte çalışarak bir bulmacayı tamamlamak", ["Yapboz"], 20, "Görev paylaşımı önerir"),
+    ("Hikaye Günlüğü", "Yaratıcılık", ("7-8", "9-12"),
+     ("writing_skills", "self_concept", "identity_formation"), ("visual",), ("masallar",),
+     "Günün olaylarını kısa bir hikaye olarak yazmak", ["Defter", "Kalem"], 15, "Başı, ortası, sonu olan bir metin yazar"),
+    ("Sesli Okuma Saati", "Bilişsel", ("7-8",),
+     ("reading_fluency", "abstract_concepts"), ("auditory",), ("masallar",),
+     "Akıcı ve vurgulu okumak", ["Resimli hikaye kitabı"], 15, "Bir sayfayı takılmadan okur"),
+    ("Gezegen Maketi", "Yaratıcılık", ("7-8", "9-12"),
+     ("concrete_operations", "abstract_thinking"), ("kinesthetic", "visual"), ("uzay",),
+     "Güneş sistemini ölçekli bir maketle anlamak", ["Oyun hamuru", "Çubuklar"], 25, "Gezegenleri doğru sırayla dizer"),
+    ("Dinozor Fosil Kazısı", "Bilişsel", ("5-6", "7-8"),
+     ("classification", "cause_effect"), ("kinesthetic",), ("dinozorlar",),
+     "Kazı yaparak fosilleri tanımak ve sınıflamak", ["Kum havuzu", "Oyuncak fosiller", "Fırça"], 20, "Üç fosili türüne göre ayırır"),
+    ("Doğa Yürüyüşü Gözlem Kartı", "Fiziksel", ("5-6", "7-8", "9-12"),
+     ("classification", "independence", "stress_management"), ("kinesthetic", "visual"), ("doğa", "hayvanlar"),
+     "Yürüyüşte gözlem yapıp not almak", ["Gözlem kartı", "Kalem"], 30, "Beş farklı canlı kaydeder"),
+    ("Müzik Aleti Yapımı", "Yaratıcılık", ("5-6", "7-8"),
+     ("cause_effect", "achievement_motivation"), ("kinesthetic", "auditory"), ("müzik",),
+     "Geri dönüşüm malzemesinden ritim aleti yapmak", ["Boş kutular", "Pirinç", "Bant"], 20, "Yaptığı aletle ritim tutar"),
+    ("Değerler Tartışma Çemberi", "Kültürel Değer", ("9-12",),
+     ("value_systems", "critical_thinking", "moral_development"), ("auditory",), ("masallar",),
+     "Bir masaldaki ikilemi tartışıp görüş bildirmek", ["Kısa bir masal"], 20, "Görüşünü gerekçesiyle açıklar"),
+    ("Aile Büyükleriyle Röportaj", "Kültürel Değer", ("7-8", "9-12"),
+     ("cultural_identity", "communication_skills", "peer_relationships"), ("auditory",), (),
+     "Büyüklerden geçmişe dair hikayeler dinleyip kaydetmek", ["Soru listesi", "Ses kaydedici"], 30, "Beş soru sorup cevapları özetler"),
+    ("Strateji Oyunu: Mangala", "Bilişsel", ("7-8", "9-12"),
+     ("metacognition", "complex_problem_solving", "competition_understanding"), ("kinesthetic", "visual"), (),
+     "Geleneksel mangala ile ileriyi planlamak", ["Mangala tahtası"], 20, "Hamlesinin nedenini açıklar"),
+    ("Liderlik Görevi: Oyun Kurucu", "Sosyal-Duygusal", ("9-12",),
+     ("leadership", "group_dynamics", "emotional_intelligence"), ("kinesthetic", "auditory"), ("spor",),
+     "Küçük bir grup için oyun kurup yönetmek", ["Oyun kartları"], 25, "Herkesin katıldığı bir oyun yönetir"),
+    ("Duygu Günlüğü", "Sosyal-Duygusal", ("7-8", "9-12"),
+     ("stress_management", "emotional_intelligence", "self_concept"), ("visual",), ("resim",),
+     "Gün içindeki duyguları yazıp çizmek", ["Defter", "Boya kalemleri"], 10, "Bir duygunun nedenini yazar"),
+    ("Uzay Yolculuğu Hikayesi", "Yaratıcılık", ("5-6", "7-8", "9-12"),
+     ("narrative_skills", "abstract_thinking", "symbolic_thinking"), ("auditory", "visual"), ("uzay", "masallar"),
+     "Hayali bir uzay yolculuğunu anlatmak", ["Yıldız haritası"], 15, "Olayları sırayla anlatır"),
+    ("Spor Bayramı Parkuru", "Fiziksel", ("7-8", "9-12"),
+     ("team_work", "achievement_motivation"), ("kinesthetic",), ("spor",),
+     "Engel parkurunda denge ve koordinasyon", ["Koniler", "İp"], 20, "Parkuru düşmeden tamamlar"),
+    ("Karagöz Gölge Oyunu", "Kültürel Değer", ("5-6", "7-8", "9-12"),
+     ("narrative_skills", "cultural_identity", "symbolic_thinking"), ("visual", "kinesthetic"), ("masallar", "resim"),
+     "Karagöz ve Hacivat ile kısa bir gösteri hazırlamak", ["Karton figürler", "Fener"], 25, "Kısa bir diyalog sahneler"),
+    ("Dengede Yürüme", "Fiziksel", ("3-4",),
+     ("self_regulation_beginning", "simple_problem_solving"), ("kinesthetic",), ("spor",),
+     "Yerdeki çizgide dengede yürümek", ["Yer bandı"], 5, "Çizgiden çıkmadan yürür"),
+    ("Bayram Ziyareti Canlandırma", "Kültürel Değer", ("3-4", "5-6"),
+     ("basic_empathy", "rule_understanding", "social_rules"), ("kinesthetic", "auditory"), (),
+     "El öpme ve misafir ağırlamayı oyunla öğrenmek", ["Oyuncak çay takımı"], 10, "Misafiri karşılama adımlarını uygular"),
+]
+
+ACTIVITIES: List[Dict[str, Any]] = [
+    {
+        "name": name, "type": category, "age_bands": bands, "milestones": frozenset(milestones),
+        "styles": frozenset(styles), "interests": frozenset(term for interest in interests for term in tokens(interest)),
+        "learning_goal": goal, "materials": materials, "minutes": minutes, "success_criteria": success,
+    }
+    for name, category, bands, milestones, styles, interests, goal, materials, minutes, success in _CATALOG
+]
+
+# Catalog indexes: activity positions per age band and per interest term
+_BY_BAND: Dict[str, List[int]] = {band: [i for i, a in enumerate(ACTIVITIES) if band in a["age_bands"]] for band in _ALL_BANDS}
+_BY_INTEREST: Dict[str, Set[int]] = {}
+for _i, _activity in enumerate(ACTIVITIES):
+    for _term in _activity["interests"]:
+        _BY_INTEREST.setdefault(_term, set()).add(_i)
+
+
+def normalize_style(style: Optional[str]) -> Optional[str]:
+    """Map a learning style spelling ("Görsel", "visual") to a LEARNING_STYLES entry"""
+    for term in tokens(style):
+        if term in _STYLE_ALIASES:
+            return _STYLE_ALIASES[term]
+    return None
+
+
+def interest_terms(interests: Optional[Iterable[str]]) -> Set[str]:
+    """Stemmed, folded terms of a child's interests"""
+    if isinstance(interests, str):
+        interests = [interests]
+    return {term for interest in interests or [] for term in tokens(interest)}
+
+
+def matching_terms(terms: Iterable[str], words: Iterable[str]) -> Set[str]:
+    """Terms found in `words` as a whole word or, from MIN_STEM letters on, a word prefix"""
+    words = set(words)
+    return {
+        term for term in terms
+        if term in words or (len(term) >= MIN_STEM and any(word.startswith(term) for word in words))
+    }
+
+
+def profile_fields(source: Dict[str, Any]) -> Tuple[Optional[int], Optional[str], Optional[str], List[str]]:
+    """(age, age band, learning style, interests) from an analysis or session dict"""
+    age = source.get("age", source.get("child_age"))
+    preferences = source.get("learning_preferences")
+    style = source.get("learning_style") or (
+        (preferences.get("style") or preferences.get("primary")) if isinstance(preferences, dict) else None
+    )
+    interests = source.get("interests") or []
+    try:
+        age = int(age) if age is not None else None
+    except (TypeError, ValueError):
+        age = None
+    band = source.get("age_band") if source.get("age_band") in _ALL_BANDS else None
+    return age, band, style, [interests] if isinstance(interests, str) else list(interests)
+
+
+def suggest_activities(stage_key: Optional[str], learning_style: Optional[str] = None,
+                       interests: Optional[Iterable[str]] = None, limit: int = 10) -> List[Dict[str, Any]]:
+    """Top catalog activities for an age band (None: any band), spread over the activity categories"""
+    expected = STAGE_MILESTONES[stage_key] if stage_key else frozenset()
+    style = normalize_style(learning_style)
+    terms = interest_terms(interests)
+    interest_hits: Dict[int, int] = {}
+    for term in terms:
+        # Activities with a catalog interest the term names, whole or as a prefix
+        for i in set().union(*(_BY_INTEREST[key] for key in _BY_INTEREST if matching_terms([term], [key]))):
+            interest_hits[i] = interest_hits.get(i, 0) + 1
+
+    scored = []
+    for i in (_BY_BAND.get(stage_key, []) if stage_key else range(len(ACTIVITIES))):
+        activity = ACTIVITIES[i]
+        score = (MILESTONE_WEIGHT * len(activity["milestones"] & expected)
+                 + (STYLE_WEIGHT if style in activity["styles"] else 0)
+                 + INTEREST_WEIGHT * interest_hits.get(i, 0))
+        scored.append((-score, i))
+    scored.sort()
+
+    # At most limit / len(CATEGORIES) (rounded up) per category first, then fill by score
+    per_category = -(-limit // len(CATEGORIES))
+    taken: Dict[str, int] = {}
+    chosen, rest = [], []
+    for negative_score, i in scored:
+        category = ACTIVITIES[i]["type"]
+        if taken.get(category, 0) < per_category and len(chosen) < limit:
+            taken[category] = taken.get(category, 0) + 1
+            chosen.append((negative_score, i))
+        else:
+            rest.append((negative_score, i))
+    chosen = sorted(chosen + rest[:limit - len(chosen)])
+    return [_activity_entry(ACTIVITIES[i], stage_key, -negative_score) for negative_score, i in chosen]
+
+
+def _activity_entry(activity: Dict[str, Any], stage_key: Optional[str], score: int) -> Dict[str, Any]:
+    return {
+        "name": activity["name"],
+        "type": activity["type"],
+        "age_appropriateness": f"{stage_key or ', '.join(activity['age_bands'])} yaş",
+        "learning_goal": activity["learning_goal"],
+        "materials": list(activity["materials"]),
+        "duration": f"{activity['minutes']} dk",
+        "success_criteria": activity["success_criteria"],
+        "score": score,
+    }
+
+
+def _option_text(option: Dict[str, Any]) -> str:
+    parts = []
+    for field in _OPTION_TEXT_FIELDS:
+        value = option.get(field)
+        if isinstance(value, str):
+            parts.append(value)
+        elif isinstance(value, (list, tuple)):
+            parts.extend(str(item) for item in value)
+    return " ".join(parts)
+
+
+def score_option(option: Dict[str, Any], stage_key: str, style: Optional[str], terms: Set[str]) -> Tuple[int, List[str]]:
+    """Score of one content option and the reasons behind it"""
+    words = set(tokens(_option_text(option)))
+    score, reasons = 0, []
+
+    overlap = sorted(matching_terms(terms, words))
+    if overlap:
+        score += INTEREST_WEIGHT * len(overlap)
+        reasons.append(f"İlgi alanı: {', '.join(overlap)}")
+
+    option_style = normalize_style(option.get("learning_style"))
+    if style and (option_style == style or (option_style is None and matching_terms(_STYLE_TOKENS[style], words))):
+        score += STYLE_WEIGHT
+        reasons.append(f"Öğrenme stili: {style}")
+
+    difficulty = option.get("difficulty_level", option.get("difficulty"))
+    if difficulty in DIFFICULTY_RANK:
+        gap = abs(DIFFICULTY_RANK[difficulty] - DIFFICULTY_RANK[STAGE_DIFFICULTY[stage_key]])
+        score -= gap
+        if not gap:
+            reasons.append("Zorluk seviyesi uygun")
+
+    bands = option.get("age_bands", option.get("age_band"))
+    if bands:
+        if stage_key in ([bands] if isinstance(bands, str) else bands):
+            score += 1
+        else:
+            score -= MILESTONE_WEIGHT
+    return score, reasons
+
+
+def option_label(option: Dict[str, Any]) -> str:
+    """Display name of a content option"""
+    for field in ("title", "name", "type"):
+        if isinstance(option.get(field), str) and option[field]:
+            return option[field]
+    return DEFAULT_RECOMMENDATION
+
+
+def rank_content(options: Sequence[Dict[str, Any]], stage_key: str, learning_style: Optional[str] = None,
+                 interests: Optional[Iterable[str]] = None) -> Dict[str, Any]:
+    """Content options ordered for a child, in the shape personalize_content returns
+
+    recommended_content, difficulty_level, themes and engagement_score keep the
+    types of the old LLM answer; recommended_option is the best option itself.
+    """
+    style = normalize_style(learning_style)
+    terms = interest_terms(interests)
+    scored = [(score_option(option, stage_key, style, terms), i) for i, option in enumerate(options)]
+    scored.sort(key=lambda item: (-item[0][0], item[1]))
+    ranked = [{**options[i], "score": score, "reasons": reasons} for (score, reasons), i in scored]
+    if ranked:
+        # Share of the interest and style points the best option collects
+        possible = INTEREST_WEIGHT * max(len(terms), 1) + STYLE_WEIGHT + 1
+        engagement = min(100, max(0, round(100 * ranked[0]["score"] / possible)))
+    else:
+        engagement = DEFAULT_ENGAGEMENT
+    return {
+        "recommended_content": option_label(ranked[0]) if ranked else DEFAULT_RECOMMENDATION,
+        "difficulty_level": STAGE_DIFFICULTY[stage_key],
+        "themes": list(interests or []) or list(DEFAULT_THEMES),
+        "engagement_score": engagement,
+        "recommended_option": ranked[0] if ranked else None,
+        "ranked_options": ranked,
+        "learning_style": style,
+    }
+
+
+def enrichment_prompt(analysis: Dict[str, Any], activities: List[Dict[str, Any]]) -> str:
+    """Enrichment prompt: detail the chosen activities without reordering them"""
+    return f"""
+    Bu analiz temelinde seçilmiş yaş ve gelişim uygun aktiviteleri zenginleştir:
+    {json.dumps(analysis, ensure_ascii=False)}
+    
+    Aktiviteler:
+    {json.dumps(activities, ensure_ascii=False)}
+    
+    Her aktivite için öğrenme hedefini, materyalleri ve başarı kriterlerini
+    çocuğa göre ayrıntılandır; aktivitelerin sırasını ve adlarını koru.
+    
+    JSON array formatında {len(activities)} aktivite döndür.
+    """
+
+
+def personalization_prompt(child_profile, result: Dict[str, Any]) -> str:
+    """Enrichment prompt: notes for the ranked options, keeping the order"""
+    return f"""
+    Bu çocuk profili için sıralanmış içerik seçeneklerine kişiselleştirme notları ekle:
+    
+    Çocuk: {child_profile.name}, {child_profile.age} yaş
+    İlgi Alanları: {child_profile.interests}
+    Öğrenme Stili: {child_profile.learning_style}
+    
+    Sıralanmış İçerik Seçenekleri:
+    {json.dumps(result["ranked_options"], ensure_ascii=False)}
+    
+    Sıralamayı değiştirme; her seçenek için motivasyon ve sunum önerisi ver.
+    
+    JSON formatında seçenek başlığına göre notlar döndür.
+    """
@@ -3,9 +3,13 @@ Child Psychology Agent - Developmental analysis and learning optimization
 """
 
 import json
+from functools import lru_cache
 from typing import Dict, List, Any
 import google.generativeai as genai
+from ..tracing import current_span, record_usage
 from ..models import Child, AIInsights
+from . import activity_catalog, developmental_stages
+from .activity_catalog import LLM_ENRICHMENT
 
 class ChildPsychologyAgent:
     """AI agent specialized in child psychology and developmental analysis"""
@@ -16,40 +20,14 @@ class ChildPsychologyAgent:
         genai.configure(api_key=os.getenv('GEMINI_API_KEY'))
         self.model = genai.GenerativeModel('gemini-2.5-pro')
         
-        # Developmental milestones database
-        self.developmental_stages = {
-            "3-4": {
-                "cognitive": ["symbolic_thinking", "basic_categorization", "simple_problem_solving"],
-                "social": ["parallel_play", "basic_empathy", "rule_understanding"],
-                "emotional": ["emotion_identification", "self_regulation_beginning", "attachment_security"],
-                "language": ["vocabulary_expansion", "sentence_formation", "story_comprehension"]
-            },
-            "5-6": {
-                "cognitive": ["logical_reasoning", "number_concepts", "cause_effect"],
-                "social": ["cooperative_play", "friendship_concepts", "social_rules"],
-                "emotional": ["emotion_regulation", "moral_development", "independence"],
-                "language": ["complex_sentences", "narrative_skills", "reading_readiness"]
-            },
-            "7-8": {
-                "cognitive": ["concrete_operations", "conservation", "classification"],
-                "social": ["peer_relationships", "team_work", "competition_understanding"],
-                "emotional": ["self_concept", "achievement_motivation", "stress_management"],
-                "language": ["reading_fluency", "writing_skills", "abstract_concepts"]
-            },
-            "9-12": {
-                "cognitive": ["abstract_thinking", "metacognition", "complex_problem_solving"],
-                "social": ["group_dynamics", "leadership", "cultural_identity"],
-                "emotional": ["identity_formation", "value_systems", "emotional_intelligence"],
-                "language": ["advanced_literacy", "critical_thinking", "communication_skills"]
-            }
-        }
+        # Shared read-only milestone table (see developmental_stages)
+        self.developmental_stages = developmental_stages.DEVELOPMENTAL_STAGES
     
     async def analyze_child_profile(self, child_profile: Child) -> Dict[str, Any]:
         """Comprehensive psychological and developmental analysis"""
         
         # Get age-appropriate developmental stage
         stage_key = self._get_stage_key(int(child_profile.age))
-        expected_milestones = self.developmental_stages.get(stage_key, {})
         
         prompt = f"""
         Bu çocuk profili için kapsamlı psikolojik ve gelişimsel analiz yap:
@@ -62,7 +40,7 @@ class ChildPsychologyAgent:
         - Kişilik Özellikleri: {child_profile.personality_traits}
         
         Bu yaş grubu için beklenen gelişim aşamaları:
-        {json.dumps(expected_milestones, ensure_ascii=False)}
+        {developmental_stages.MILESTONES_JSON[stage_key]}
         
         Analiz edilecek alanlar:
         1. Bilişsel Gelişim Düzeyi
@@ -91,6 +69,7 @@ class ChildPsychologyAgent:
         """
         
         response = await self.model.generate_content(prompt)
+        record_usage(current_span(), response)
         return json.loads(response.text)
     
     async def get_comprehensive_insights(self, child_profile: Child) -> AIInsights:
@@ -113,36 +92,26 @@ class ChildPsychologyAgent:
         """
         
         response = await self.model.generate_content(prompt)
+        record_usage(current_span(), response)
         insights_data = json.loads(response.text)
         
         return AIInsights(**insights_data)
     
-    async def suggest_activities(self, analysis: Dict[str, Any]) -> List[Dict[str, Any]]:
-        """Suggest age-appropriate activities based on analysis"""
-        
-        prompt = f"""
-        Bu analiz temelinde yaş ve gelişim uygun aktiviteler öner:
-        {json.dumps(analysis, ensure_ascii=False)}
-        
-        Aktivite kategorileri:
-        1. Bilişsel Gelişim Aktiviteleri
-        2. Sosyal-Duygusal Aktiviteler  
-        3. Yaratıcılık ve Hayal Gücü
-        4. Fiziksel Koordinasyon
-        5. Kültürel Değer Aktiviteleri
-        
-        Her aktivite için:
-        - Yaş uygunluğu
-        - Öğrenme hedefi
-        - Gerekli materyaller
-        - Süre
-        - Başarı kriterleri
-        
-        JSON array formatında 10 aktivite döndür.
-        """
-        
-        response = await self.model.generate_content(prompt)
-        return json.loads(response.text)
+    async def suggest_activities(self, analysis: Dict[str, Any], enrich: bool = LLM_ENRICHMENT) -> List[Dict[str, Any]]:
+        """Suggest age-appropriate activities from the activity catalog, optionally enriched by the LLM"""
+        
+        activities = self._catalog_activities(analysis)
+        if not enrich:
+            return activities
+        
+        try:
+            response = await self.model.generate_content(activity_catalog.enrichment_prompt(analysis, activities))
+            record_usage(current_span(), response)
+            enriched = json.loads(response.text)
+        except Exception as e:
+            print(f"Activity enrichment error: {e}")
+            return activities
+        return enriched if isinstance(enriched, list) and len(enriched) == len(activities) else activities
     
     async def assess_emotional_state(self, interaction_data: Dict[str, Any]) -> Dict[str, Any]:
         """Assess child's emotional state from interaction data"""
@@ -169,6 +138,7 @@ class ChildPsychologyAgent:
         """
         
         response = await self.model.generate_content(prompt)
+        record_usage(current_span(), response)
         return json.loads(response.text)
     
     async def track_learning_progress(self, child_id: str, session_history: List[Dict[str, Any]]) -> Dict[str, Any]:
@@ -201,42 +171,44 @@ class ChildPsychologyAgent:
         """
         
         response = await self.model.generate_content(prompt)
+        record_usage(current_span(), response)
         return json.loads(response.text)
     
-    async def personalize_content(self, child_profile: Child, content_options: List[Dict[str, Any]]) -> Dict[str, Any]:
-        """Personalize content based on psychological profile"""
-        
-        prompt = f"""
-        Bu çocuk profili için içerik seçeneklerini kişiselleştir:
-        
-        Çocuk: {child_profile.name}, {child_profile.age} yaş
-        İlgi Alanları: {child_profile.interests}
-        Öğrenme Stili: {child_profile.learning_style}
-        
-        İçerik Seçenekleri:
-        {json.dumps(content_options, ensure_ascii=False)}
-        
-        Kişiselleştirme kriterleri:
-        - Öğrenme stili uyumu
-        - İlgi alanı örtüşmesi
-        - Zorluk seviyesi uygunluğu
-        - Motivasyon faktörleri
-        
-        JSON formatında kişiselleştirilmiş öneri döndür.
+    async def personalize_content(self, child_profile: Child, content_options: List[Dict[str, Any]],
+                                  enrich: bool = LLM_ENRICHMENT) -> Dict[str, Any]:
+        """Rank content options by learning style, interests and difficulty, optionally annotated by the LLM
+
+        Keeps the keys of the old LLM answer (recommended_content is still the
+        title to show) and adds recommended_option and ranked_options; see
+        activity_catalog.rank_content.
         """
         
-        response = await self.model.generate_content(prompt)
-        return json.loads(response.text)
+        stage_key = self._get_stage_key(int(child_profile.age))
+        result = activity_catalog.rank_content(content_options, stage_key, child_profile.learning_style, child_profile.interests)
+        if not enrich:
+            return result
+        
+        try:
+            response = await self.model.generate_content(activity_catalog.personalization_prompt(child_profile, result))
+            record_usage(current_span(), response)
+            result["personalization_notes"] = json.loads(response.text)
+        except Exception as e:
+            print(f"Personalization enrichment error: {e}")
+        return result
     
     def _get_stage_key(self, age: int) -> str:
         """Get developmental stage key based on age"""
-        if 3 <= age <= 4:
-            return "3-4"
-        elif 5 <= age <= 6:
-            return "5-6"
-        elif 7 <= age <= 8:
-            return "7-8"
-        elif 9 <= age <= 12:
-            return "9-12"
-        else:
-            return "9-12"  # Default to oldest category
\ No newline at end of file
+        return developmental_stages.stage_key(age)
+
+    def _catalog_activities(self, analysis: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """Deterministic activity suggestions for the profile fields found in `analysis`"""
+        age, band, style, interests = activity_catalog.profile_fields(analysis)
+        # No age (e.g. session data without it): any band, rather than stage_key(0) == "9-12"
+        stage_key = band or (self._get_stage_key(age) if age is not None else None)
+        return activity_catalog.suggest_activities(stage_key, style, interests)
+
+
+@lru_cache(maxsize=1)
+def shared_agent() -> ChildPsychologyAgent:
+    """Process-wide agent, built on first use so genai.configure and the model are set up once"""
+    return ChildPsychologyAgent()
@@ -0,0 +1,67 @@
+"""
+Developmental Stages - Milestone table shared by the psychology agents
+
+The table is built once at import and is read-only: stages map to
+MappingProxyType views of tuples. stage_key() indexes a precomputed
+age -> stage tuple instead of walking an if-chain, and each stage's
+milestones are serialized to JSON once for the analysis prompt.
+"""
+
+import json
+from types import MappingProxyType
+from typing import FrozenSet, Mapping, Tuple
+
+DEFAULT_STAGE = "9-12"  # ages outside 3-12 use the oldest category
+
+DEVELOPMENTAL_STAGES: Mapping[str, Mapping[str, Tuple[str, ...]]] = MappingProxyType({
+    stage: MappingProxyType({area: tuple(milestones) for area, milestones in areas.items()})
+    for stage, areas in {
+        "3-4": {
+            "cognitive": ["symbolic_thinking", "basic_categorization", "simple_problem_solving"],
+            "social": ["parallel_play", "basic_empathy", "rule_understanding"],
+            "emotional": ["emotion_identification", "self_regulation_beginning", "attachment_security"],
+            "language": ["vocabulary_expansion", "sentence_formation", "story_comprehension"]
+        },
+        "5-6": {
+            "cognitive": ["logical_reasoning", "number_concepts", "cause_effect"],
+            "social": ["cooperative_play", "friendship_concepts", "social_rules"],
+            "emotional": ["emotion_regulation", "moral_development", "independence"],
+            "language": ["complex_sentences", "narrative_skills", "reading_readiness"]
+        },
+        "7-8": {
+            "cognitive": ["concrete_operations", "conservation", "classification"],
+            "social": ["peer_relationships", "team_work", "competition_understanding"],
+            "emotional": ["self_concept", "achievement_motivation", "stress_management"],
+            "language": ["reading_fluency", "writing_skills", "abstract_concepts"]
+        },
+        "9-12": {
+            "cognitive": ["abstract_thinking", "metacognition", "complex_problem_solving"],
+            "social": ["group_dynamics", "leadership", "cultural_identity"],
+            "emotional": ["identity_formation", "value_systems", "emotional_intelligence"],
+            "language": ["advanced_literacy", "critical_thinking", "communication_skills"]
+        }
+    }.items()
+})
+
+# Index = age in years, 0-12
+STAGE_BY_AGE: Tuple[str, ...] = tuple(
+    "3-4" if 3 <= age <= 4 else "5-6" if 5 <= age <= 6 else "7-8" if 7 <= age <= 8 else DEFAULT_STAGE
+    for age in range(13)
+)
+
+# All milestones of a stage, for set lookups
+STAGE_MILESTONES: Mapping[str, FrozenSet[str]] = MappingProxyType({
+    stage: frozenset(m for milestones in areas.values() for m in milestones)
+    for stage, areas in DEVELOPMENTAL_STAGES.items()
+})
+
+# Prompt fragment: the stage's milestones as JSON, same text json.dumps gave per call
+MILESTONES_JSON: Mapping[str, str] = MappingProxyType({
+    stage: json.dumps({area: list(milestones) for area, milestones in areas.items()}, ensure_ascii=False)
+    for stage, areas in DEVELOPMENTAL_STAGES.items()
+})
+
+
+def stage_key(age: int) -> str:
+    """Developmental stage key for an age in years"""
+    return STAGE_BY_AGE[age] if 0 <= age < len(STAGE_BY_AGE) else DEFAULT_STAGE
@@ -5,6 +5,7 @@ Guardian Agent - Content safety and appropriateness validation
 import json
 from typing import Dict, List, Any, Tuple
 import google.generativeai as genai
+from ..tracing import current_span, record_usage
 from ..models import Child
 
 class GuardianAgent:
@@ -72,6 +73,7 @@ class GuardianAgent:
         """
         
         response = await self.model.generate_content(prompt)
+        record_usage(current_span(), response)
         return json.loads(response.text)
     
     async def ensure_age_appropriate_content(self, analysis: Dict[str, Any]) -> Dict[str, Any]:
@@ -90,6 +92,7 @@ class GuardianAgent:
         """
         
         response = await self.model.generate_content(prompt)
+        record_usage(current_span(), response)
         return json.loads(response.text)
     
     async def check_cultural_sensitivity(self, content: str, cultural_context: str) -> Dict[str, Any]:
@@ -118,6 +121,7 @@ class GuardianAgent:
         """
         
         response = await self.model.generate_content(prompt)
+        record_usage(current_span(), response)
         return json.loads(response.text)
     
     async def validate_educational_content(self, content: Dict[str, Any]) -> Dict[str, Any]:
@@ -146,6 +150,7 @@ class GuardianAgent:
         """
         
         response = await self.model.generate_content(prompt)
+        record_usage(current_span(), response)
         return json.loads(response.text)
     
     async def content_moderation(self, user_input: str) -> Dict[str, Any]:
@@ -176,6 +181,7 @@ class GuardianAgent:
         """
         
         response = await self.model.generate_content(prompt)
+        record_usage(current_span(), response)
         return json.loads(response.text)
     
     async def real_time_safety_monitor(self, interaction_data: Dict[str, Any]) -> Dict[str, Any]:
@@ -197,4 +203,5 @@ class GuardianAgent:
         """
         
         response = await self.model.generate_content(prompt)
+        record_usage(current_span(), response)
         return json.loads(response.text)
\ No newline at end of file
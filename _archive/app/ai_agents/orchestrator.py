@@ -8,13 +8,17 @@ from typing import Dict, List, Any, Optional
 import google.generativeai as genai
 import openai
 import os
-from datetime import datetime
 
 from .storyteller_agent import StorytellerAgent
 from .guardian_agent import GuardianAgent  
-from .child_psychology_agent import ChildPsychologyAgent
+from .child_psychology_agent import shared_agent as shared_psychology_agent
 from .voice_agent import VoiceAgent
 from ..models import Child, VoiceAnalysis, AIInsights
+from ..tracing import span, current_span, age_band, record_usage
+from ..ids import new_id
+
+GEMINI_MODEL = 'gemini-2.5-pro'
+TTS_MODEL = 'tts-1'
 
 class AIOrchestrator:
     """Central orchestrator for AtaMind's multi-agent AI system"""
@@ -27,50 +31,59 @@ class AIOrchestrator:
         # Initialize specialized agents
         self.storyteller = StorytellerAgent()
         self.guardian = GuardianAgent()
-        self.psychology = ChildPsychologyAgent()
+        self.psychology = shared_psychology_agent()
         self.voice = VoiceAgent()
         
         # Core Gemini model
-        self.model = genai.GenerativeModel('gemini-2.5-pro')
+        self.model = genai.GenerativeModel(GEMINI_MODEL)
         
     async def generate_story(self, child_profile: Child, parent_message: str, user_id: str) -> Dict[str, Any]:
         """Generate comprehensive story using multi-agent system"""
         
-        # Step 1: Analyze child psychology and development
-        child_analysis = await self.psychology.analyze_child_profile(child_profile)
-        
-        # Step 2: Extract values and emotions from parent message
-        voice_analysis = await self.voice.analyze_parent_message(parent_message)
-        
-        # Step 3: Generate story content
-        story_content = await self.storyteller.create_story(
-            child_profile=child_profile,
-            child_analysis=child_analysis,
-            parent_message=parent_message,
-            voice_analysis=voice_analysis
-        )
-        
-        # Step 4: Safety validation
-        safety_check = await self.guardian.validate_content(story_content, child_profile)
-        
-        if not safety_check["is_safe"]:
-            # Regenerate story with safety recommendations
-            story_content = await self.storyteller.create_story(
-                child_profile=child_profile,
-                child_analysis=child_analysis,
-                parent_message=parent_message,
-                voice_analysis=voice_analysis,
-                safety_guidelines=safety_check["recommendations"]
-            )
-        
-        # Step 5: Generate audio narration
-        audio_url = await self._generate_audio(story_content["content"])
-        
-        # Step 6: Create story image
-        image_url = await self._generate_image(story_content["title"], story_content["cultural_elements"])
+        band = age_band(child_profile.age)
+        with span("orchestrator.generate_story", user_id=user_id, child_age_band=band) as root:
+            # Step 1: Analyze child psychology and development
+            with span("agent.psychology.analyze_child_profile", agent="psychology", model=GEMINI_MODEL, child_age_band=band):
+                child_analysis = await self.psychology.analyze_child_profile(child_profile)
+            
+            # Step 2: Extract values and emotions from parent message
+            with span("agent.voice.analyze_parent_message", agent="voice", model=GEMINI_MODEL):
+                voice_analysis = await self.voice.analyze_parent_message(parent_message)
+            
+            # Step 3: Generate story content
+            with span("agent.storyteller.create_story", agent="storyteller", model=GEMINI_MODEL, child_age_band=band):
+                story_content = await self.storyteller.create_story(
+                    child_profile=child_profile,
+                    child_analysis=child_analysis,
+                    parent_message=parent_message,
+                    voice_analysis=voice_analysis
+                )
+            
+            # Step 4: Safety validation
+            with span("agent.guardian.validate_content", agent="guardian", model=GEMINI_MODEL, child_age_band=band) as check:
+                safety_check = await self.guardian.validate_content(story_content, child_profile)
+                check.set_attributes(is_safe=safety_check["is_safe"], safety_score=safety_check.get("safety_score"))
+            
+            if not safety_check["is_safe"]:
+                # Regenerate story with safety recommendations
+                with span("agent.storyteller.create_story", agent="storyteller", model=GEMINI_MODEL, child_age_band=band, regeneration=True):
+                    story_content = await self.storyteller.create_story(
+                        child_profile=child_profile,
+                        child_analysis=child_analysis,
+                        parent_message=parent_message,
+                        voice_analysis=voice_analysis,
+                        safety_guidelines=safety_check["recommendations"]
+                    )
+            root.set_attribute("regenerated", not safety_check["is_safe"])
+            
+            # Step 5: Generate audio narration
+            audio_url = await self._generate_audio(story_content["content"])
+            
+            # Step 6: Create story image
+            image_url = await self._generate_image(story_content["title"], story_content["cultural_elements"])
         
         return {
-            "id": f"story_{datetime.now().timestamp()}",
+            "id": new_id(),
             "title": story_content["title"],
             "content": story_content["content"],
             "values_taught": story_content["values_taught"],
@@ -98,18 +111,20 @@ class AIOrchestrator:
     async def _generate_audio(self, text: str) -> str:
         """Generate audio narration using OpenAI TTS"""
         try:
-            response = await openai.Audio.acreate(
-                model="tts-1",
-                voice="nova",  # Child-friendly voice
-                input=text
-            )
+            with span("tts.generate_audio", model=TTS_MODEL, characters=len(text)):
+                response = await openai.Audio.acreate(
+                    model=TTS_MODEL,
+                    voice="nova",  # Child-friendly voice
+                    input=text
+                )
             
             # Save audio file
-            audio_filename = f"story_audio_{datetime.now().timestamp()}.mp3"
+            audio_filename = f"story_audio_{new_id()}.mp3"
             audio_path = f"uploads/{audio_filename}"
             
-            with open(audio_path, "wb") as f:
-                f.write(response.content)
+            with span("file.write", path=audio_path, bytes=len(response.content)):
+                with open(audio_path, "wb") as f:
+                    f.write(response.content)
             
             return f"/uploads/{audio_filename}"
             
@@ -126,21 +141,24 @@ class AIOrchestrator:
             Style: Colorful, warm, family-friendly, Turkish cultural themes.
             """
             
-            response = await self.model.generate_content([
-                {"role": "user", "parts": [{"text": prompt}]},
-            ], config={
-                "response_modalities": ["TEXT", "IMAGE"],
-            })
+            with span("agent.image.generate", model=GEMINI_MODEL) as image_span:
+                response = await self.model.generate_content([
+                    {"role": "user", "parts": [{"text": prompt}]},
+                ], config={
+                    "response_modalities": ["TEXT", "IMAGE"],
+                })
+                record_usage(image_span, response)
             
             # Save generated image
             if response.candidates and response.candidates[0].content.parts:
                 for part in response.candidates[0].content.parts:
                     if hasattr(part, 'inline_data') and part.inline_data:
-                        image_filename = f"story_image_{datetime.now().timestamp()}.png"
+                        image_filename = f"story_image_{new_id()}.png"
                         image_path = f"uploads/{image_filename}"
                         
-                        with open(image_path, "wb") as f:
-                            f.write(part.inline_data.data)
+                        with span("file.write", path=image_path, bytes=len(part.inline_data.data)):
+                            with open(image_path, "wb") as f:
+                                f.write(part.inline_data.data)
                         
                         return f"/uploads/{image_filename}"
             
@@ -153,17 +171,20 @@ class AIOrchestrator:
     async def orchestrate_learning_session(self, child_id: str, session_data: Dict[str, Any]) -> Dict[str, Any]:
         """Orchestrate a complete learning session"""
         
-        # Analyze session requirements
-        session_analysis = await self._analyze_session_needs(session_data)
-        
-        # Generate personalized content
-        content_recommendations = await self._generate_session_content(session_analysis)
-        
-        # Real-time adaptation based on engagement
-        adaptive_responses = await self._create_adaptive_responses(session_analysis)
+        with span("orchestrator.learning_session", child_id=child_id):
+            # Analyze session requirements
+            with span("orchestrator.analyze_session_needs", model=GEMINI_MODEL):
+                session_analysis = await self._analyze_session_needs(session_data)
+            
+            # Generate personalized content
+            with span("orchestrator.generate_session_content"):
+                content_recommendations = await self._generate_session_content(session_analysis, session_data)
+            
+            # Real-time adaptation based on engagement
+            adaptive_responses = await self._create_adaptive_responses(session_analysis)
         
         return {
-            "session_id": f"session_{datetime.now().timestamp()}",
+            "session_id": new_id(),
             "content_recommendations": content_recommendations,
             "adaptive_responses": adaptive_responses,
             "expected_outcomes": session_analysis["learning_outcomes"],
@@ -188,16 +209,18 @@ class AIOrchestrator:
         """
         
         response = await self.model.generate_content(prompt)
+        record_usage(current_span(), response)
         return json.loads(response.text)
     
-    async def _generate_session_content(self, analysis: Dict[str, Any]) -> List[Dict[str, Any]]:
+    async def _generate_session_content(self, analysis: Dict[str, Any], session_data: Dict[str, Any]) -> List[Dict[str, Any]]:
         """Generate personalized session content"""
         
-        # Use multiple agents to create diverse content
+        # Use multiple agents to create diverse content; activities come from the
+        # local catalog (age, learning style and interests in session_data), no LLM call
         tasks = [
-            self.storyteller.create_micro_story(analysis),
-            self.psychology.suggest_activities(analysis),
-            self.guardian.ensure_age_appropriate_content(analysis)
+            self._traced_agent_call("storyteller", "create_micro_story", self.storyteller.create_micro_story(analysis)),
+            self._traced_agent_call("psychology", "suggest_activities", self.psychology.suggest_activities({**analysis, **session_data})),
+            self._traced_agent_call("guardian", "ensure_age_appropriate_content", self.guardian.ensure_age_appropriate_content(analysis))
         ]
         
         results = await asyncio.gather(*tasks)
@@ -208,6 +231,11 @@ class AIOrchestrator:
             "safety_guidelines": results[2]
         }
     
+    async def _traced_agent_call(self, agent: str, method: str, call):
+        """Await an agent coroutine inside its own span so parallel calls are timed separately"""
+        with span(f"agent.{agent}.{method}", agent=agent, model=GEMINI_MODEL):
+            return await call
+    
     async def _create_adaptive_responses(self, analysis: Dict[str, Any]) -> Dict[str, List[str]]:
         """Create adaptive responses for different engagement levels"""
         
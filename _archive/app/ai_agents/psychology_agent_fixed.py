@@ -3,9 +3,12 @@ Child Psychology Agent - Developmental analysis and learning optimization
 """
 
 import json
+from functools import lru_cache
 from typing import Dict, List, Any
 import google.generativeai as genai
 from ..models import Child, AIInsights
+from . import activity_catalog, developmental_stages
+from .activity_catalog import LLM_ENRICHMENT
 
 class ChildPsychologyAgent:
     """AI agent specialized in child psychology and developmental analysis"""
@@ -16,40 +19,14 @@ class ChildPsychologyAgent:
         genai.configure(api_key=os.getenv('GEMINI_API_KEY'))
         self.model = genai.GenerativeModel('gemini-2.5-pro')
         
-        # Developmental milestones database
-        self.developmental_stages = {
-            "3-4": {
-                "cognitive": ["symbolic_thinking", "basic_categorization", "simple_problem_solving"],
-                "social": ["parallel_play", "basic_empathy", "rule_understanding"],
-                "emotional": ["emotion_identification", "self_regulation_beginning", "attachment_security"],
-                "language": ["vocabulary_expansion", "sentence_formation", "story_comprehension"]
-            },
-            "5-6": {
-                "cognitive": ["logical_reasoning", "number_concepts", "cause_effect"],
-                "social": ["cooperative_play", "friendship_concepts", "social_rules"],
-                "emotional": ["emotion_regulation", "moral_development", "independence"],
-                "language": ["complex_sentences", "narrative_skills", "reading_readiness"]
-            },
-            "7-8": {
-                "cognitive": ["concrete_operations", "conservation", "classification"],
-                "social": ["peer_relationships", "team_work", "competition_understanding"],
-                "emotional": ["self_concept", "achievement_motivation", "stress_management"],
-                "language": ["reading_fluency", "writing_skills", "abstract_concepts"]
-            },
-            "9-12": {
-                "cognitive": ["abstract_thinking", "metacognition", "complex_problem_solving"],
-                "social": ["group_dynamics", "leadership", "cultural_identity"],
-                "emotional": ["identity_formation", "value_systems", "emotional_intelligence"],
-                "language": ["advanced_literacy", "critical_thinking", "communication_skills"]
-            }
-        }
+        # Shared read-only milestone table (see developmental_stages)
+        self.developmental_stages = developmental_stages.DEVELOPMENTAL_STAGES
     
     def analyze_child_profile(self, child_profile: Child) -> Dict[str, Any]:
         """Comprehensive psychological and developmental analysis"""
         
         # Get age-appropriate developmental stage
         stage_key = self._get_stage_key(int(child_profile.age))
-        expected_milestones = self.developmental_stages.get(stage_key, {})
         
         prompt = f"""
         Bu çocuk profili için kapsamlı psikolojik ve gelişimsel analiz yap:
@@ -62,7 +39,7 @@ class ChildPsychologyAgent:
         - Kişilik Özellikleri: {child_profile.personality_traits}
         
         Bu yaş grubu için beklenen gelişim aşamaları:
-        {json.dumps(expected_milestones, ensure_ascii=False)}
+        {developmental_stages.MILESTONES_JSON[stage_key]}
         
         Analiz edilecek alanlar:
         1. Bilişsel Gelişim Düzeyi
@@ -124,36 +101,20 @@ class ChildPsychologyAgent:
             print(f"Error generating insights: {e}")
             return self._get_fallback_insights(child_profile)
     
-    def suggest_activities(self, analysis: Dict[str, Any]) -> List[Dict[str, Any]]:
-        """Suggest age-appropriate activities based on analysis"""
-        
-        prompt = f"""
-        Bu analiz temelinde yaş ve gelişim uygun aktiviteler öner:
-        {json.dumps(analysis, ensure_ascii=False)}
+    def suggest_activities(self, analysis: Dict[str, Any], enrich: bool = LLM_ENRICHMENT) -> List[Dict[str, Any]]:
+        """Suggest age-appropriate activities from the activity catalog, optionally enriched by the LLM"""
         
-        Aktivite kategorileri:
-        1. Bilişsel Gelişim Aktiviteleri
-        2. Sosyal-Duygusal Aktiviteler  
-        3. Yaratıcılık ve Hayal Gücü
-        4. Fiziksel Koordinasyon
-        5. Kültürel Değer Aktiviteleri
-        
-        Her aktivite için:
-        - Yaş uygunluğu
-        - Öğrenme hedefi
-        - Gerekli materyaller
-        - Süre
-        - Başarı kriterleri
-        
-        JSON array formatında 10 aktivite döndür.
-        """
+        activities = self._catalog_activities(analysis)
+        if not enrich:
+            return activities
         
         try:
-            response = self.model.generate_content(prompt)
-            return json.loads(response.text)
+            response = self.model.generate_content(activity_catalog.enrichment_prompt(analysis, activities))
+            enriched = json.loads(response.text)
         except Exception as e:
-            print(f"Error suggesting activities: {e}")
-            return self._get_fallback_activities()
+            print(f"Error enriching activities: {e}")
+            return activities
+        return enriched if isinstance(enriched, list) and len(enriched) == len(activities) else activities
     
     def assess_emotional_state(self, interaction_data: Dict[str, Any]) -> Dict[str, Any]:
         """Assess child's emotional state from interaction data"""
@@ -222,47 +183,37 @@ class ChildPsychologyAgent:
             print(f"Error tracking progress: {e}")
             return self._get_fallback_progress()
     
-    def personalize_content(self, child_profile: Child, content_options: List[Dict[str, Any]]) -> Dict[str, Any]:
-        """Personalize content based on psychological profile"""
-        
-        prompt = f"""
-        Bu çocuk profili için içerik seçeneklerini kişiselleştir:
-        
-        Çocuk: {child_profile.name}, {child_profile.age} yaş
-        İlgi Alanları: {child_profile.interests}
-        Öğrenme Stili: {child_profile.learning_style}
-        
-        İçerik Seçenekleri:
-        {json.dumps(content_options, ensure_ascii=False)}
-        
-        Kişiselleştirme kriterleri:
-        - Öğrenme stili uyumu
-        - İlgi alanı örtüşmesi
-        - Zorluk seviyesi uygunluğu
-        - Motivasyon faktörleri
-        
-        JSON formatında kişiselleştirilmiş öneri döndür.
+    def personalize_content(self, child_profile: Child, content_options: List[Dict[str, Any]],
+                            enrich: bool = LLM_ENRICHMENT) -> Dict[str, Any]:
+        """Rank content options by learning style, interests and difficulty, optionally annotated by the LLM
+
+        Keeps the keys of the old LLM answer (recommended_content is still the
+        title to show) and adds recommended_option and ranked_options; see
+        activity_catalog.rank_content.
         """
         
+        stage_key = self._get_stage_key(int(child_profile.age))
+        result = activity_catalog.rank_content(content_options, stage_key, child_profile.learning_style, child_profile.interests)
+        if not enrich:
+            return result
+        
         try:
-            response = self.model.generate_content(prompt)
-            return json.loads(response.text)
+            response = self.model.generate_content(activity_catalog.personalization_prompt(child_profile, result))
+            result["personalization_notes"] = json.loads(response.text)
         except Exception as e:
             print(f"Error personalizing content: {e}")
-            return self._get_fallback_personalization(child_profile)
+        return result
     
     def _get_stage_key(self, age: int) -> str:
         """Get developmental stage key based on age"""
-        if 3 <= age <= 4:
-            return "3-4"
-        elif 5 <= age <= 6:
-            return "5-6"
-        elif 7 <= age <= 8:
-            return "7-8"
-        elif 9 <= age <= 12:
-            return "9-12"
-        else:
-            return "9-12"  # Default to oldest category
+        return developmental_stages.stage_key(age)
+    
+    def _catalog_activities(self, analysis: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """Deterministic activity suggestions for the profile fields found in `analysis`"""
+        age, band, style, interests = activity_catalog.profile_fields(analysis)
+        # No age (e.g. session data without it): any band, rather than stage_key(0) == "9-12"
+        stage_key = band or (self._get_stage_key(age) if age is not None else None)
+        return activity_catalog.suggest_activities(stage_key, style, interests)
     
     def _get_fallback_analysis(self, child_profile: Child) -> Dict[str, Any]:
         """Fallback analysis when AI fails"""
@@ -291,14 +242,6 @@ class ChildPsychologyAgent:
             cultural_recommendations=["Türk masalları", "Geleneksel oyunlar"]
         )
     
-    def _get_fallback_activities(self) -> List[Dict[str, Any]]:
-        """Fallback activities when AI fails"""
-        return [
-            {"name": "Hikaye Tamamlama", "type": "Yaratıcılık", "duration": "10 dk"},
-            {"name": "Renk Tanıma", "type": "Bilişsel", "duration": "5 dk"},
-            {"name": "Müzik Dinleme", "type": "Duygusal", "duration": "15 dk"},
-        ]
-    
     def _get_fallback_emotional_state(self) -> Dict[str, Any]:
         """Fallback emotional state when AI fails"""
         return {
@@ -322,12 +265,9 @@ class ChildPsychologyAgent:
             "next_goals": ["Problem çözme"],
             "parent_recommendations": ["Teşvik edin"]
         }
-    
-    def _get_fallback_personalization(self, child_profile: Child) -> Dict[str, Any]:
-        """Fallback personalization when AI fails"""
-        return {
-            "recommended_content": "Hikaye temelli aktiviteler",
-            "difficulty_level": "Uygun",
-            "themes": child_profile.interests or ["Hayvanlar", "Doğa"],
-            "engagement_score": 85
-        }
\ No newline at end of file
+
+
+@lru_cache(maxsize=1)
+def shared_agent() -> ChildPsychologyAgent:
+    """Process-wide agent, built on first use so genai.configure and the model are set up once"""
+    return ChildPsychologyAgent()
@@ -5,6 +5,7 @@ Storyteller Agent - Specialized in creating Turkish cultural stories
 import json
 from typing import Dict, List, Any, Optional
 import google.generativeai as genai
+from ..tracing import current_span, record_usage
 from ..models import Child
 
 class StorytellerAgent:
@@ -68,6 +69,7 @@ class StorytellerAgent:
         """
         
         response = await self.model.generate_content(prompt)
+        record_usage(current_span(), response)
         return json.loads(response.text)
     
     async def create_micro_story(self, analysis: Dict[str, Any]) -> List[Dict[str, Any]]:
@@ -83,6 +85,7 @@ class StorytellerAgent:
         """
         
         response = await self.model.generate_content(prompt)
+        record_usage(current_span(), response)
         return json.loads(response.text)
     
     async def adapt_story_difficulty(self, story: Dict[str, Any], target_difficulty: str) -> Dict[str, Any]:
@@ -101,6 +104,7 @@ class StorytellerAgent:
         """
         
         response = await self.model.generate_content(prompt)
+        record_usage(current_span(), response)
         return json.loads(response.text)
     
     async def generate_story_variations(self, base_story: Dict[str, Any], count: int = 3) -> List[Dict[str, Any]]:
@@ -119,6 +123,7 @@ class StorytellerAgent:
         """
         
         response = await self.model.generate_content(prompt)
+        record_usage(current_span(), response)
         return json.loads(response.text)
     
     async def create_interactive_story(self, child_profile: Child, interaction_points: List[str]) -> Dict[str, Any]:
@@ -158,4 +163,5 @@ class StorytellerAgent:
         """
         
         response = await self.model.generate_content(prompt)
+        record_usage(current_span(), response)
         return json.loads(response.text)
\ No newline at end of file
@@ -6,6 +6,7 @@ import json
 import os
 from typing import Dict, List, Any
 import google.generativeai as genai
+from ..tracing import span, current_span, record_usage
 from ..models import VoiceAnalysis
 
 class VoiceAgent:
@@ -20,20 +21,26 @@ class VoiceAgent:
         # For now, we'll simulate voice analysis since librosa had installation issues
         # In production, you would use speech recognition and audio analysis libraries
         
-        # Simulate transcript extraction
-        transcript = await self._extract_transcript(file_path)
-        
-        # Analyze emotional content
-        emotion_analysis = await self._analyze_emotions(transcript)
-        
-        # Extract values and messages
-        values_extracted = await self._extract_values(transcript)
-        
-        # Determine parenting style
-        parenting_style = await self._analyze_parenting_style(transcript, emotion_analysis)
-        
-        # Generate recommendations
-        recommendations = await self._generate_recommendations(transcript, emotion_analysis, values_extracted)
+        with span("agent.voice.analyze_voice_file", agent="voice", model="gemini-2.5-pro"):
+            # Simulate transcript extraction
+            with span("voice.extract_transcript"):
+                transcript = await self._extract_transcript(file_path)
+            
+            # Analyze emotional content
+            with span("voice.analyze_emotions"):
+                emotion_analysis = await self._analyze_emotions(transcript)
+            
+            # Extract values and messages
+            with span("voice.extract_values"):
+                values_extracted = await self._extract_values(transcript)
+            
+            # Determine parenting style
+            with span("voice.parenting_style"):
+                parenting_style = await self._analyze_parenting_style(transcript, emotion_analysis)
+            
+            # Generate recommendations
+            with span("voice.recommendations"):
+                recommendations = await self._generate_recommendations(transcript, emotion_analysis, values_extracted)
         
         return VoiceAnalysis(
             transcript=transcript,
@@ -71,6 +78,7 @@ class VoiceAgent:
         """
         
         response = await self.model.generate_content(prompt)
+        record_usage(current_span(), response)
         return json.loads(response.text)
     
     async def _extract_transcript(self, file_path: str) -> str:
@@ -100,6 +108,7 @@ class VoiceAgent:
         """
         
         response = await self.model.generate_content(prompt)
+        record_usage(current_span(), response)
         return json.loads(response.text)
     
     async def _extract_values(self, transcript: str) -> List[str]:
@@ -123,6 +132,7 @@ class VoiceAgent:
         """
         
         response = await self.model.generate_content(prompt)
+        record_usage(current_span(), response)
         return json.loads(response.text)
     
     async def _analyze_parenting_style(self, transcript: str, emotions: Dict[str, float]) -> str:
@@ -146,6 +156,7 @@ class VoiceAgent:
         """
         
         response = await self.model.generate_content(prompt)
+        record_usage(current_span(), response)
         return response.text.strip().strip('"')
     
     async def _generate_recommendations(self, transcript: str, emotions: Dict[str, float], values: List[str]) -> List[str]:
@@ -169,6 +180,7 @@ class VoiceAgent:
         """
         
         response = await self.model.generate_content(prompt)
+        record_usage(current_span(), response)
         return json.loads(response.text)
     
     async def process_real_time_audio(self, audio_stream: bytes) -> Dict[str, Any]:
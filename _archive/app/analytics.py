@@ -2,17 +2,73 @@
 Analytics and Reporting System for AtaMind
 """
 
+import asyncio
+import hashlib
 import json
+import os
 from datetime import datetime, timedelta
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Tuple
 from sqlalchemy.orm import Session
-from sqlalchemy import func, and_
+from sqlalchemy import func, and_, case, select, update, literal, bindparam, DateTime, Integer
 
+import pandas as pd
+
+from . import analytics_columnar as columnar
+from .parquet_export import archive
+from .tracing import span, current_span, age_band, record_usage
+from .ids import new_id
+from .session_registry import registry
 from .models import (
     Child, ActivityRating, UsageSession, BiweeklyReport, 
     VoiceRecording, Story, ListeningHistory
 )
 
+SESSION_IDLE_MINUTES = float(os.getenv("SESSION_IDLE_MINUTES", "120"))
+SESSION_RECONCILE_INTERVAL = float(os.getenv("SESSION_RECONCILE_INTERVAL", "300"))
+REPORT_DAYS = 14
+
+# (child_id, parent_id, window start) -> future resolved with the built report's id (None if it failed)
+_pending_reports: Dict[Tuple[str, str, datetime], asyncio.Future] = {}
+
+
+def minutes_between(dialect: str, start, end):
+    """SQL expression for the minutes from `start` to `end`"""
+    if dialect == "postgresql":
+        return func.extract("epoch", end - start) / 60
+    # SQLite and others store DATETIME as text; julianday works on it
+    return (func.julianday(end) - func.julianday(start)) * 1440
+
+
+def report_window(now: Optional[datetime] = None) -> Tuple[datetime, datetime]:
+    """REPORT_DAYS window ending at the next midnight, so reports within a day share it"""
+    now = now or datetime.now()
+    end = now.replace(hour=0, minute=0, second=0, microsecond=0) + timedelta(days=1)
+    return end - timedelta(days=REPORT_DAYS), end
+
+
+def session_close_values(dialect: str, ended_at, activities) -> Dict[str, Any]:
+    """SET clause closing a usage session at `ended_at`
+
+    The average only covers ratings inside [session_start, ended_at], so
+    ratings from the child's later sessions are not counted.
+    """
+    sessions = UsageSession.__table__
+    ratings = ActivityRating.__table__
+    average = (
+        select(func.avg(ratings.c.rating))
+        .where(ratings.c.child_id == sessions.c.child_id,
+               ratings.c.rated_at >= sessions.c.session_start,
+               ratings.c.rated_at <= ended_at)
+        .scalar_subquery()
+    )
+    return {
+        "session_end": ended_at,
+        "duration_minutes": minutes_between(dialect, sessions.c.session_start, ended_at),
+        "activities_completed": activities,
+        "average_rating": func.coalesce(average, 0),
+    }
+
+
 class AnalyticsEngine:
     """Analytics engine for tracking child usage and generating insights"""
     
@@ -30,7 +86,7 @@ class AnalyticsEngine:
         """Record child's rating for an activity"""
         
         rating_record = ActivityRating(
-            id=f"rating_{datetime.now().timestamp()}",
+            id=new_id(),
             child_id=child_id,
             activity_type=activity_type,
             activity_id=activity_id,
@@ -50,7 +106,7 @@ class AnalyticsEngine:
     async def start_usage_session(self, child_id: str, parent_id: str) -> str:
         """Start a new usage session"""
         
-        session_id = f"session_{child_id}_{datetime.now().timestamp()}"
+        session_id = new_id()
         
         session = UsageSession(
             id=session_id,
@@ -61,33 +117,89 @@ class AnalyticsEngine:
         
         self.db.add(session)
         self.db.commit()
+        registry.opened(child_id, session_id)
         
         return session_id
     
-    async def end_usage_session(self, session_id: str, activities_completed: int = 0):
-        """End a usage session and calculate statistics"""
-        
-        session = self.db.query(UsageSession).filter(
-            UsageSession.id == session_id
-        ).first()
-        
-        if session:
-            session.session_end = datetime.now()
-            session.duration_minutes = (
-                session.session_end - session.session_start
-            ).total_seconds() / 60
-            session.activities_completed = activities_completed
-            
-            # Calculate average rating for this session
-            avg_rating = self.db.query(func.avg(ActivityRating.rating)).filter(
-                and_(
-                    ActivityRating.child_id == session.child_id,
-                    ActivityRating.rated_at >= session.session_start
-                )
-            ).scalar()
-            
-            session.average_rating = avg_rating or 0
-            self.db.commit()
+    async def end_usage_session(self, session_id: str, activities_completed: int = 0) -> Optional[Dict[str, Any]]:
+        """End a usage session in one UPDATE ... RETURNING; None if it was unknown or already closed"""
+        
+        sessions = UsageSession.__table__
+        # Ratings counted in memory during the session are written now; the
+        # registry forgets the session only once the UPDATE has committed
+        counted = registry.count(session_id)
+        if counted is not None:
+            activities = literal(max(activities_completed, counted), Integer)
+        else:
+            activities = case(
+                (func.coalesce(sessions.c.activities_completed, 0) > activities_completed, sessions.c.activities_completed),
+                else_=activities_completed,
+            )
+        
+        closed = self.db.execute(
+            update(sessions)
+            .where(sessions.c.id == session_id, sessions.c.session_end.is_(None))
+            .values(**session_close_values(self.db.get_bind().dialect.name, literal(datetime.now(), DateTime), activities))
+            .returning(sessions.c.id, sessions.c.child_id, sessions.c.duration_minutes,
+                       sessions.c.activities_completed, sessions.c.average_rating)
+        ).mappings().first()
+        self.db.commit()
+        registry.closed(session_id)
+        
+        return dict(closed) if closed else None
+    
+    def close_abandoned_sessions(self, idle_minutes: float = SESSION_IDLE_MINUTES) -> int:
+        """Close sessions left open without an end call
+
+        A session is abandoned when its last activity (latest rating before the
+        child's next session, or its start) is older than `idle_minutes`; it is
+        closed at that last activity.
+        """
+        
+        sessions = UsageSession.__table__
+        ratings = ActivityRating.__table__
+        later = sessions.alias("later")
+        next_start = (
+            select(func.min(later.c.session_start))
+            .where(later.c.child_id == sessions.c.child_id, later.c.session_start > sessions.c.session_start)
+            .scalar_subquery()
+        )
+        in_session = (
+            ratings.c.child_id == sessions.c.child_id,
+            ratings.c.rated_at >= sessions.c.session_start,
+            ratings.c.rated_at < func.coalesce(next_start, datetime.max),
+        )
+        last_rating = select(func.max(ratings.c.rated_at)).where(*in_session).scalar_subquery()
+        rating_count = select(func.count()).where(*in_session).scalar_subquery()
+        last_activity = func.coalesce(last_rating, sessions.c.session_start)
+        cutoff = datetime.now() - timedelta(minutes=idle_minutes)
+        
+        stale = self.db.execute(
+            select(sessions.c.id, last_activity.label("last_activity"), rating_count.label("ratings"))
+            .where(sessions.c.session_end.is_(None), sessions.c.session_start < cutoff, last_activity < cutoff)
+        ).all()
+        if not stale:
+            return 0
+        
+        rows = []
+        for session_id, ended_at, rated in stale:
+            # The in-memory counter is gone after a restart; ratings are the lower bound
+            counted = max(registry.count(session_id) or 0, rated)
+            rows.append({"b_id": session_id, "b_end": ended_at, "b_activities": counted})
+        self.db.connection().execute(
+            update(sessions)
+            .where(sessions.c.id == bindparam("b_id"), sessions.c.session_end.is_(None))
+            .values(**session_close_values(
+                self.db.get_bind().dialect.name,
+                bindparam("b_end", type_=DateTime),
+                func.coalesce(bindparam("b_activities", type_=Integer), sessions.c.activities_completed),
+            )),
+            rows,
+        )
+        self.db.commit()
+        for row in rows:
+            registry.closed(row["b_id"])
+        return len(rows)
     
     def get_usage_statistics(self, child_id: str) -> Dict[str, Any]:
         """Get comprehensive usage statistics for a child"""
@@ -144,112 +256,160 @@ class AnalyticsEngine:
             ]
         }
     
-    async def generate_biweekly_report(self, child_id: str, parent_id: str) -> BiweeklyReport:
-        """Generate comprehensive biweekly report"""
-        
-        end_date = datetime.now()
-        start_date = end_date - timedelta(days=14)
-        
-        # Get child profile
-        child = self.db.query(Child).filter(Child.id == child_id).first()
+    def report_fingerprint(self, child_id: str, start_date: datetime, end_date: datetime) -> str:
+        """Hash of the child's profile and session/rating rollups in the window"""
+        sessions = UsageSession.__table__
+        ratings = ActivityRating.__table__
+        children = Child.__table__
+        conn = self.db.connection()
+        profile = conn.execute(select(children.c.age, children.c.updated_at).where(children.c.id == child_id)).first()
+        session_rollup = conn.execute(
+            select(func.count(), func.count(sessions.c.session_end),
+                   func.sum(sessions.c.duration_minutes), func.sum(sessions.c.activities_completed))
+            .where(sessions.c.child_id == child_id,
+                   sessions.c.session_start >= start_date, sessions.c.session_start < end_date)
+        ).one()
+        # Ids are UUIDv7, so max(id) changes whenever a rating is added
+        rating_rollup = conn.execute(
+            select(func.count(), func.sum(ratings.c.rating), func.max(ratings.c.id))
+            .where(ratings.c.child_id == child_id,
+                   ratings.c.rated_at >= start_date, ratings.c.rated_at < end_date)
+        ).one()
+        rollups = (tuple(profile or ()), tuple(session_rollup), tuple(rating_rollup))
+        return hashlib.sha256(repr(rollups).encode()).hexdigest()
+    
+    async def generate_biweekly_report(self, child_id: str, parent_id: str, force: bool = False) -> BiweeklyReport:
+        """Biweekly report for today's window; reuses the stored one while its rollups are unchanged"""
         
-        # Usage statistics
-        sessions = self.db.query(UsageSession).filter(
-            and_(
-                UsageSession.child_id == child_id,
-                UsageSession.session_start >= start_date
-            )
-        ).all()
+        with span("analytics.generate_biweekly_report", child_id=child_id) as root:
+            start_date, end_date = report_window()
+            key = (str(child_id), parent_id, start_date)
+            
+            built = None
+            pending = _pending_reports.get(key)
+            while pending is not None:
+                # Same report already being generated (double click, refresh): wait and reuse it
+                with span("report.wait_pending"):
+                    built = await asyncio.shield(pending)
+                pending = _pending_reports.get(key)
+            if force and built is not None:
+                # The report that just finished is as fresh as a forced one would be
+                report = self.db.get(BiweeklyReport, built)
+                root.set_attribute("reused", report is not None)
+                if report is not None:
+                    return report
+            
+            fingerprint = self.report_fingerprint(child_id, start_date, end_date)
+            if not force:
+                existing = self.db.query(BiweeklyReport).filter(
+                    BiweeklyReport.child_id == child_id,
+                    BiweeklyReport.parent_id == parent_id,
+                    BiweeklyReport.report_period_start == start_date,
+                    BiweeklyReport.report_period_end == end_date,
+                    BiweeklyReport.rollup_fingerprint == fingerprint
+                ).order_by(BiweeklyReport.created_at.desc()).first()
+                root.set_attribute("reused", existing is not None)
+                if existing is not None:
+                    return existing
+            
+            done = asyncio.get_running_loop().create_future()
+            _pending_reports[key] = done
+            report = None
+            try:
+                report = await self._build_biweekly_report(root, child_id, parent_id, start_date, end_date, fingerprint)
+                return report
+            finally:
+                if _pending_reports.get(key) is done:
+                    del _pending_reports[key]
+                done.set_result(report.id if report is not None else None)
+    
+    async def _build_biweekly_report(self, root, child_id: str, parent_id: str, start_date: datetime,
+                                     end_date: datetime, fingerprint: str) -> BiweeklyReport:
+        """Load the window's data, run the LLM steps and store the report"""
         
-        total_time = sum(s.duration_minutes or 0 for s in sessions)
-        total_activities = sum(s.activities_completed or 0 for s in sessions)
-        avg_session_length = total_time / len(sessions) if sessions else 0
+        with span("report.load_data"):
+            # Get child profile
+            child = self.db.query(Child).filter(Child.id == child_id).first()
+            
+            # Sessions and ratings as columns, without ORM hydration; older rows from the Parquet archive
+            conn = self.db.connection()
+            sessions = columnar.load_sessions(conn, child_id, start_date, archive)
+            ratings = columnar.load_ratings(conn, child_id, start_date, archive)
+        root.set_attributes(
+            child_age_band=age_band(child.age) if child else None,
+            sessions=len(sessions),
+            ratings=len(ratings)
+        )
         
-        # Activity ratings analysis
-        ratings = self.db.query(ActivityRating).filter(
-            and_(
-                ActivityRating.child_id == child_id,
-                ActivityRating.rated_at >= start_date
-            )
-        ).all()
+        totals = columnar.session_totals(sessions)
         
         # Content type analysis
-        content_types = {}
-        for rating in ratings:
-            content_type = rating.activity_type
-            if content_type not in content_types:
-                content_types[content_type] = {
-                    "count": 0, 
-                    "avg_rating": 0, 
-                    "total_rating": 0
-                }
-            content_types[content_type]["count"] += 1
-            content_types[content_type]["total_rating"] += rating.rating
-        
-        # Calculate averages
-        for content_type in content_types:
-            data = content_types[content_type]
-            data["avg_rating"] = data["total_rating"] / data["count"]
+        content_types = columnar.content_types(ratings)
         
         # Voice message specific analysis
-        voice_ratings = [r for r in ratings if r.activity_type == "voice_message"]
+        voice_ratings = ratings[ratings["activity_type"] == "voice_message"]
+        with span("report.voice_suggestions", model="gemini-2.5-pro"):
+            voice_suggestions = await self._generate_voice_improvement_suggestions(voice_ratings)
         voice_analysis = {
             "total_voice_ratings": len(voice_ratings),
-            "average_voice_rating": sum(r.rating for r in voice_ratings) / len(voice_ratings) if voice_ratings else 0,
-            "voice_feedback": [r.feedback_text for r in voice_ratings if r.feedback_text],
-            "improvement_suggestions": await self._generate_voice_improvement_suggestions(voice_ratings)
+            "average_voice_rating": float(voice_ratings["rating"].mean()) if len(voice_ratings) else 0,
+            "voice_feedback": voice_ratings["feedback_text"].dropna().loc[lambda f: f != ""].tolist(),
+            "improvement_suggestions": voice_suggestions
         }
         
         # AI-powered insights
-        ai_insights = await self._generate_ai_insights(child, sessions, ratings)
+        with span("report.ai_insights", model="gemini-2.5-pro"):
+            ai_insights = await self._generate_ai_insights(child, sessions, ratings)
+        
+        with span("report.engagement_patterns"):
+            engagement_patterns = columnar.engagement_patterns(sessions, ratings)
+        
+        with span("report.recommendations", model="gemini-2.5-pro"):
+            recommended_activities = await self._generate_activity_recommendations(child, ratings)
         
         # Create report
         report = BiweeklyReport(
-            id=f"report_{child_id}_{datetime.now().timestamp()}",
+            id=new_id(),
             child_id=child_id,
             parent_id=parent_id,
             report_period_start=start_date,
             report_period_end=end_date,
-            total_time_spent=total_time,
-            activities_completed=total_activities,
-            average_session_length=avg_session_length,
+            total_time_spent=totals["total_time"],
+            activities_completed=totals["total_activities"],
+            average_session_length=totals["average_session_length"],
             favorite_content_types=content_types,
-            most_rated_activities=self._get_most_rated_activities(ratings),
+            most_rated_activities=columnar.most_rated_activities(ratings),
             voice_message_ratings=voice_analysis,
+            voice_rating_avg=voice_analysis["average_voice_rating"],
             child_development_insights=ai_insights,
-            engagement_patterns=self._analyze_engagement_patterns(sessions, ratings),
-            recommended_activities=await self._generate_activity_recommendations(child, ratings)
+            engagement_patterns=engagement_patterns,
+            recommended_activities=recommended_activities,
+            rollup_fingerprint=fingerprint
         )
         
-        self.db.add(report)
-        self.db.commit()
-        self.db.refresh(report)
+        with span("report.save"):
+            self.db.add(report)
+            self.db.commit()
+            self.db.refresh(report)
         
         return report
     
     async def _update_session_stats(self, child_id: str, rating: int):
-        """Update current session statistics"""
+        """Count the rating on the child's open session (in memory, written at session end)"""
         
-        # Get latest session
-        latest_session = self.db.query(UsageSession).filter(
-            and_(
-                UsageSession.child_id == child_id,
-                UsageSession.session_end.is_(None)
-            )
-        ).order_by(UsageSession.session_start.desc()).first()
-        
-        if latest_session:
-            latest_session.activities_completed += 1
-            self.db.commit()
+        if registry.increment(child_id) is None:
+            # Session opened before this process started tracking it
+            registry.load_open_sessions(self.db.connection(), [child_id])
+            registry.increment(child_id)
     
-    async def _generate_voice_improvement_suggestions(self, voice_ratings: List[ActivityRating]) -> List[str]:
+    async def _generate_voice_improvement_suggestions(self, voice_ratings: pd.DataFrame) -> List[str]:
         """Generate suggestions for improving parent voice messages"""
         
-        if not voice_ratings:
+        if not len(voice_ratings):
             return ["Henüz sesli mesaj puanlaması yok."]
         
-        avg_rating = sum(r.rating for r in voice_ratings) / len(voice_ratings)
-        feedback_texts = [r.feedback_text for r in voice_ratings if r.feedback_text]
+        avg_rating = float(voice_ratings["rating"].mean())
+        feedback_texts = voice_ratings["feedback_text"].dropna().loc[lambda f: f != ""].tolist()
         
         prompt = f"""
         Ebeveyn sesli mesajları için iyileştirme önerileri oluştur:
@@ -265,6 +425,7 @@ class AnalyticsEngine:
             import google.generativeai as genai
             model = genai.GenerativeModel('gemini-2.5-pro')
             response = await model.generate_content(prompt)
+            record_usage(current_span(), response)
             suggestions = response.text.split('\n')
             return [s.strip() for s in suggestions if s.strip()]
         except:
@@ -274,7 +435,7 @@ class AnalyticsEngine:
                 "Hikayelerde daha fazla etkileşim ekleyin"
             ]
     
-    async def _generate_ai_insights(self, child: Child, sessions: List[UsageSession], ratings: List[ActivityRating]) -> Dict[str, Any]:
+    async def _generate_ai_insights(self, child: Child, sessions: pd.DataFrame, ratings: pd.DataFrame) -> Dict[str, Any]:
         """Generate AI-powered insights about child's development and engagement"""
         
         prompt = f"""
@@ -286,7 +447,7 @@ class AnalyticsEngine:
         2 Haftalık Veriler:
         - Toplam Oturum: {len(sessions)}
         - Toplam Aktivite Puanı: {len(ratings)}
-        - Ortalama Puan: {sum(r.rating for r in ratings) / len(ratings) if ratings else 0}
+        - Ortalama Puan: {float(ratings["rating"].mean()) if len(ratings) else 0}
         
         JSON formatında analiz döndür:
         {{
@@ -302,6 +463,7 @@ class AnalyticsEngine:
             import google.generativeai as genai
             model = genai.GenerativeModel('gemini-2.5-pro')
             response = await model.generate_content(prompt)
+            record_usage(current_span(), response)
             return json.loads(response.text)
         except:
             return {
@@ -312,106 +474,17 @@ class AnalyticsEngine:
                 "ebeveyn_rehberliği": ["Günlük rutinlere entegrasyon"]
             }
     
-    def _analyze_engagement_patterns(self, sessions: List[UsageSession], ratings: List[ActivityRating]) -> Dict[str, Any]:
-        """Analyze child's engagement patterns"""
-        
-        # Time-based patterns
-        session_times = [s.session_start.hour for s in sessions]
-        peak_hours = {}
-        for hour in session_times:
-            peak_hours[hour] = peak_hours.get(hour, 0) + 1
-        
-        # Rating patterns
-        rating_trends = []
-        for rating in sorted(ratings, key=lambda x: x.rated_at):
-            rating_trends.append({
-                "date": rating.rated_at.date().isoformat(),
-                "rating": rating.rating,
-                "activity_type": rating.activity_type
-            })
-        
-        return {
-            "peak_usage_hours": peak_hours,
-            "rating_trends": rating_trends,
-            "favorite_activities": self._get_favorite_activities(ratings),
-            "engagement_score": self._calculate_engagement_score(sessions, ratings)
-        }
-    
-    def _get_favorite_activities(self, ratings: List[ActivityRating]) -> List[Dict[str, Any]]:
-        """Get child's favorite activities based on ratings"""
-        
-        activity_scores = {}
-        for rating in ratings:
-            if rating.activity_type not in activity_scores:
-                activity_scores[rating.activity_type] = []
-            activity_scores[rating.activity_type].append(rating.rating)
-        
-        favorites = []
-        for activity, scores in activity_scores.items():
-            avg_score = sum(scores) / len(scores)
-            favorites.append({
-                "activity_type": activity,
-                "average_rating": round(avg_score, 1),
-                "total_ratings": len(scores)
-            })
-        
-        return sorted(favorites, key=lambda x: x["average_rating"], reverse=True)
-    
-    def _calculate_engagement_score(self, sessions: List[UsageSession], ratings: List[ActivityRating]) -> float:
-        """Calculate overall engagement score"""
-        
-        if not sessions and not ratings:
-            return 0
-        
-        # Factors: session frequency, duration, rating consistency
-        session_score = len(sessions) / 14 * 100  # Sessions per day * 100
-        
-        if ratings:
-            rating_score = sum(r.rating for r in ratings) / len(ratings) / 5 * 100
-        else:
-            rating_score = 0
-        
-        avg_duration = sum(s.duration_minutes or 0 for s in sessions) / len(sessions) if sessions else 0
-        duration_score = min(avg_duration / 30 * 100, 100)  # Optimal ~30 min sessions
-        
-        return round((session_score + rating_score + duration_score) / 3, 1)
-    
-    def _get_most_rated_activities(self, ratings: List[ActivityRating]) -> List[Dict[str, Any]]:
-        """Get most rated activities"""
-        
-        activity_counts = {}
-        for rating in ratings:
-            key = f"{rating.activity_type}_{rating.activity_id or 'general'}"
-            if key not in activity_counts:
-                activity_counts[key] = {
-                    "activity_type": rating.activity_type,
-                    "activity_id": rating.activity_id,
-                    "count": 0,
-                    "avg_rating": 0,
-                    "total_rating": 0
-                }
-            activity_counts[key]["count"] += 1
-            activity_counts[key]["total_rating"] += rating.rating
-        
-        # Calculate averages and sort
-        most_rated = []
-        for data in activity_counts.values():
-            data["avg_rating"] = data["total_rating"] / data["count"]
-            most_rated.append(data)
-        
-        return sorted(most_rated, key=lambda x: x["count"], reverse=True)[:10]
-    
-    async def _generate_activity_recommendations(self, child: Child, ratings: List[ActivityRating]) -> List[str]:
+    async def _generate_activity_recommendations(self, child: Child, ratings: pd.DataFrame) -> List[str]:
         """Generate personalized activity recommendations"""
         
-        high_rated_activities = [r for r in ratings if r.rating >= 4]
-        low_rated_activities = [r for r in ratings if r.rating <= 2]
+        high_rated_activities = ratings.loc[ratings["rating"] >= 4, "activity_type"].tolist()
+        low_rated_activities = ratings.loc[ratings["rating"] <= 2, "activity_type"].tolist()
         
         prompt = f"""
         {child.name} ({child.age} yaş) için aktivite önerileri oluştur:
         
-        Beğendiği Aktiviteler: {[r.activity_type for r in high_rated_activities]}
-        Beğenmediği Aktiviteler: {[r.activity_type for r in low_rated_activities]}
+        Beğendiği Aktiviteler: {high_rated_activities}
+        Beğenmediği Aktiviteler: {low_rated_activities}
         İlgi Alanları: {child.interests}
         
         5 kişiselleştirilmiş aktivite önerisi ver (Türkçe):
@@ -421,6 +494,7 @@ class AnalyticsEngine:
             import google.generativeai as genai
             model = genai.GenerativeModel('gemini-2.5-pro')
             response = await model.generate_content(prompt)
+            record_usage(current_span(), response)
             return response.text.split('\n')[:5]
         except:
             return [
@@ -429,4 +503,21 @@ class AnalyticsEngine:
                 "Yaratıcı hikaye tamamlama",
                 "Kültürel değer oyunları",
                 "Müzikli eğitim aktiviteleri"
-            ]
\ No newline at end of file
+            ]
+
+
+def _reconcile_sessions(session_factory) -> int:
+    with session_factory() as db:
+        return AnalyticsEngine(db).close_abandoned_sessions()
+
+
+async def run_session_reconciler(session_factory, interval: float = SESSION_RECONCILE_INTERVAL):
+    """Background task: periodically close abandoned sessions"""
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            with span("sessions.reconcile") as current:
+                # Correlated scan over all open sessions: run it in a worker thread, off the event loop
+                current.set_attribute("closed", await asyncio.to_thread(_reconcile_sessions, session_factory))
+        except Exception as e:
+            print(f"Session reconcile error: {e}")
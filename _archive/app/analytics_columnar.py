@@ -0,0 +1,152 @@
+"""
+Columnar analytics - Vectorized engagement metrics over session and rating columns
+
+Report queries select plain columns into pandas frames (no ORM objects), and
+every metric is a NumPy/pandas reduction or group-by over those columns. The
+output shapes match what the biweekly report stores in its JSON columns.
+
+With a Parquet archive (app.parquet_export), rows below its high-water mark
+are read from the archive and only newer rows from the database.
+"""
+
+from datetime import datetime
+from typing import Dict, List, Any, Optional
+
+import numpy as np
+import pandas as pd
+from sqlalchemy import select, or_
+
+from .models import UsageSession, ActivityRating
+
+SESSION_COLUMNS = ["session_start", "duration_minutes", "activities_completed"]
+RATING_COLUMNS = ["rated_at", "activity_type", "activity_id", "rating", "feedback_text"]
+
+
+def _frame(result, columns: List[str], archived: Optional[pd.DataFrame] = None) -> pd.DataFrame:
+    frame = pd.DataFrame.from_records(result.all(), columns=columns)
+    if archived is not None and len(archived):
+        frame = pd.concat([archived, frame], ignore_index=True) if len(frame) else archived
+    return frame
+
+
+def load_sessions(conn, child_id: str, since: datetime, archive=None) -> pd.DataFrame:
+    sessions = UsageSession.__table__
+    query = (
+        select(*(sessions.c[name] for name in SESSION_COLUMNS))
+        .where(sessions.c.child_id == child_id, sessions.c.session_start >= since)
+    )
+    archived = None
+    watermark = archive.watermark("usage_sessions") if archive is not None else None
+    if watermark is not None:
+        # Sessions closed before the mark are archived; open and later-closed ones are not
+        archived = archive.read("usage_sessions", since, time_column="session_start",
+                                child_id=child_id, columns=SESSION_COLUMNS, watermark=watermark)
+        query = query.where(or_(sessions.c.session_end.is_(None), sessions.c.session_end >= watermark))
+    frame = _frame(conn.execute(query), SESSION_COLUMNS, archived)
+    frame["session_start"] = pd.to_datetime(frame["session_start"])
+    frame["duration_minutes"] = frame["duration_minutes"].astype(float).fillna(0.0)
+    frame["activities_completed"] = frame["activities_completed"].fillna(0).astype(np.int64)
+    return frame.sort_values("session_start", kind="stable", ignore_index=True)
+
+
+def load_ratings(conn, child_id: str, since: datetime, archive=None) -> pd.DataFrame:
+    ratings = ActivityRating.__table__
+    query = (
+        select(*(ratings.c[name] for name in RATING_COLUMNS))
+        .where(ratings.c.child_id == child_id, ratings.c.rated_at >= since)
+    )
+    archived = None
+    watermark = archive.watermark("activity_ratings") if archive is not None else None
+    if watermark is not None and watermark > since:
+        archived = archive.read("activity_ratings", since, watermark, child_id=child_id, columns=RATING_COLUMNS)
+        query = query.where(ratings.c.rated_at >= watermark)
+    frame = _frame(conn.execute(query), RATING_COLUMNS, archived)
+    frame["rated_at"] = pd.to_datetime(frame["rated_at"])
+    frame["rating"] = frame["rating"].astype(np.int64)
+    # Chronological order, whichever source the rows came from (ties in most_rated_activities keep it)
+    return frame.sort_values("rated_at", kind="stable", ignore_index=True)
+
+
+# Metrics
+
+def session_totals(sessions: pd.DataFrame) -> Dict[str, float]:
+    total_time = float(sessions["duration_minutes"].sum())
+    return {
+        "total_time": total_time,
+        "total_activities": int(sessions["activities_completed"].sum()),
+        "average_session_length": total_time / len(sessions) if len(sessions) else 0,
+    }
+
+
+def peak_usage_hours(sessions: pd.DataFrame) -> Dict[int, int]:
+    """Session starts per hour of day, hours without sessions omitted"""
+    counts = np.bincount(sessions["session_start"].dt.hour.to_numpy(), minlength=24)
+    hours = np.flatnonzero(counts)
+    return dict(zip(hours.tolist(), counts[hours].tolist()))
+
+
+def rating_trends(ratings: pd.DataFrame) -> List[Dict[str, Any]]:
+    order = np.argsort(ratings["rated_at"].to_numpy(), kind="stable")
+    dates = ratings["rated_at"].to_numpy()[order].astype("datetime64[D]").astype(str)
+    return [
+        {"date": date, "rating": rating, "activity_type": activity_type}
+        for date, rating, activity_type in zip(
+            dates.tolist(),
+            ratings["rating"].to_numpy()[order].tolist(),
+            ratings["activity_type"].to_numpy()[order].tolist(),
+        )
+    ]
+
+
+def content_types(ratings: pd.DataFrame) -> Dict[str, Dict[str, float]]:
+    """count / avg_rating / total_rating per activity type"""
+    grouped = ratings.groupby("activity_type", sort=False)["rating"].agg(["count", "sum"])
+    return {
+        activity_type: {"count": int(row["count"]), "avg_rating": float(row["sum"] / row["count"]), "total_rating": int(row["sum"])}
+        for activity_type, row in grouped.iterrows()
+    }
+
+
+def favorite_activities(ratings: pd.DataFrame) -> List[Dict[str, Any]]:
+    grouped = ratings.groupby("activity_type", sort=False)["rating"].agg(["mean", "count"])
+    grouped["mean"] = [round(float(mean), 1) for mean in grouped["mean"]]  # one value per activity type
+    grouped = grouped.sort_values("mean", ascending=False, kind="stable")
+    return [
+        {"activity_type": activity_type, "average_rating": float(row["mean"]), "total_ratings": int(row["count"])}
+        for activity_type, row in grouped.iterrows()
+    ]
+
+
+def most_rated_activities(ratings: pd.DataFrame, limit: int = 10) -> List[Dict[str, Any]]:
+    grouped = ratings.groupby(["activity_type", "activity_id"], sort=False, dropna=False)["rating"].agg(["count", "sum"])
+    grouped = grouped.sort_values("count", ascending=False, kind="stable").head(limit)
+    return [
+        {
+            "activity_type": activity_type,
+            "activity_id": None if pd.isna(activity_id) else activity_id,
+            "count": int(row["count"]),
+            "avg_rating": float(row["sum"] / row["count"]),
+            "total_rating": int(row["sum"]),
+        }
+        for (activity_type, activity_id), row in grouped.iterrows()
+    ]
+
+
+def engagement_score(sessions: pd.DataFrame, ratings: pd.DataFrame, days: int = 14) -> float:
+    """Mean of session frequency, rating level and duration scores (0-100 each)"""
+    if not len(sessions) and not len(ratings):
+        return 0
+    session_score = len(sessions) / days * 100
+    rating_score = ratings["rating"].mean() / 5 * 100 if len(ratings) else 0
+    avg_duration = sessions["duration_minutes"].mean() if len(sessions) else 0
+    duration_score = min(avg_duration / 30 * 100, 100)  # Optimal ~30 min sessions
+    return round(float((session_score + rating_score + duration_score) / 3), 1)
+
+
+def engagement_patterns(sessions: pd.DataFrame, ratings: pd.DataFrame) -> Dict[str, Any]:
+    return {
+        "peak_usage_hours": peak_usage_hours(sessions),
+        "rating_trends": rating_trends(ratings),
+        "favorite_activities": favorite_activities(ratings),
+        "engagement_score": engagement_score(sessions, ratings),
+    }
@@ -18,6 +18,9 @@ SECRET_KEY = os.getenv("SECRET_KEY", "your-secret-key-here")
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 30
 
+# Comma-separated user ids allowed to use operator endpoints (cross-family analytics)
+ADMIN_USER_IDS = frozenset(u.strip() for u in os.getenv("ADMIN_USER_IDS", "").split(",") if u.strip())
+
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 security = HTTPBearer()
 
@@ -77,4 +80,10 @@ async def mock_get_current_user():
         "id": "46033718",
         "email": "hankoc81@gmail.com",
         "name": "Test User"
-    }
\ No newline at end of file
+    }
+
+async def require_admin(current_user: dict = Depends(mock_get_current_user)):
+    """Current user, if listed in ADMIN_USER_IDS"""
+    if current_user["id"] not in ADMIN_USER_IDS:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Admin access required")
+    return current_user
@@ -0,0 +1,215 @@
+"""
+Cohort analytics - Population-level aggregates across all children
+
+Three views for content planning:
+
+- ratings by activity type per age band
+- engagement (session starts and ratings) by hour of day
+- value popularity: stories teaching each value, listens and completion
+
+Each view is a GROUP BY that runs in the database, never a per-child loop.
+Results are kept as additive accumulators (counts and sums) and refreshed
+incrementally: ids are UUIDv7 (app.ids), so id order is insertion order and a
+refresh only aggregates rows with ids in [last watermark, now - settle). The
+settle window covers events that were accepted but not yet flushed by the
+ingestor. The first refresh in a process covers the whole history.
+
+Rows are folded once, so later edits (a child's age, a story's values) only
+show up after `refresh(full=True)`.
+"""
+
+import os
+import threading
+from collections import defaultdict
+from datetime import datetime, timedelta
+from typing import Dict, List, Any, Optional
+
+from sqlalchemy import select, func, case, cast, true, Integer
+
+from .ai_agents.developmental_stages import DEFAULT_STAGE, STAGE_BY_AGE
+from .ids import uuid7_at
+from .json_queries import json_elements
+from .models import Child, Story, ActivityRating, UsageSession, ListeningHistory
+from .tracing import span
+
+COHORT_REFRESH_INTERVAL = float(os.getenv("COHORT_REFRESH_INTERVAL", "300"))
+COHORT_SETTLE_SECONDS = float(os.getenv("COHORT_SETTLE_SECONDS", "60"))
+AGE_BANDS = ["3-4", "5-6", "7-8", "9-12"]
+TABLES = ["activity_ratings", "usage_sessions", "stories", "listening_history"]
+
+
+def age_band_expr(age):
+    """SQL form of developmental_stages.stage_key (and so of tracing.age_band)"""
+    banded = {years: band for years, band in enumerate(STAGE_BY_AGE) if band != DEFAULT_STAGE}
+    return case(banded, value=age, else_=DEFAULT_STAGE)
+
+
+def hour_of(dialect: str, column):
+    """SQL expression for the hour of day of a DATETIME column"""
+    if dialect == "postgresql":
+        return cast(func.extract("hour", column), Integer)
+    return cast(func.strftime("%H", column), Integer)
+
+
+class CohortAnalytics:
+    """Cached cohort aggregates with incremental refresh"""
+
+    def __init__(self, refresh_interval: float = COHORT_REFRESH_INTERVAL, settle_seconds: float = COHORT_SETTLE_SECONDS):
+        self.refresh_interval = refresh_interval
+        self.settle_seconds = settle_seconds
+        self._lock = threading.Lock()
+        self._reset()
+
+    def _reset(self):
+        self._watermark: Optional[str] = None  # exclusive upper id bound of the last refresh
+        self._ratings = defaultdict(lambda: [0, 0])  # (age_band, activity_type) -> [count, rating sum]
+        self._hours = defaultdict(lambda: [0, 0])  # hour -> [session starts, ratings]
+        self._values = defaultdict(lambda: [0, 0, 0.0, 0])  # value -> [stories, listens, completion sum, completion count]
+        self._rows = dict.fromkeys(TABLES, 0)
+        self.refreshed_at: Optional[datetime] = None
+
+    def _window(self, table, upper: str):
+        conditions = [table.c.id < upper]
+        if self._watermark is not None:
+            conditions.append(table.c.id >= self._watermark)
+        return conditions
+
+    def refresh(self, conn, full: bool = False) -> Dict[str, int]:
+        """Fold rows inserted since the last refresh; returns rows folded per table"""
+        with self._lock:
+            if full:
+                self._reset()
+            now = datetime.now()
+            upper = str(uuid7_at(now - timedelta(seconds=self.settle_seconds), 0))
+            dialect = conn.dialect.name
+            with span("cohort.refresh", full=full or self.refreshed_at is None) as current:
+                folded = {
+                    "activity_ratings": self._fold_ratings(conn, dialect, upper),
+                    "usage_sessions": self._fold_sessions(conn, dialect, upper),
+                    "stories": self._fold_stories(conn, dialect, upper),
+                    "listening_history": self._fold_listens(conn, dialect, upper),
+                }
+                current.set_attributes(**{f"rows.{name}": n for name, n in folded.items()})
+            for name, n in folded.items():
+                self._rows[name] += n
+            self._watermark = upper
+            self.refreshed_at = now
+            return folded
+
+    def _fold_ratings(self, conn, dialect: str, upper: str) -> int:
+        ratings = ActivityRating.__table__
+        children = Child.__table__
+        window = self._window(ratings, upper)
+        band = age_band_expr(children.c.age).label("age_band")
+        rows = conn.execute(
+            select(band, ratings.c.activity_type, func.count(), func.sum(ratings.c.rating))
+            .select_from(ratings.join(children, children.c.id == ratings.c.child_id))
+            .where(*window)
+            .group_by(band, ratings.c.activity_type)
+        )
+        total = 0
+        for age_band, activity_type, count, rating_sum in rows:
+            entry = self._ratings[(age_band, activity_type)]
+            entry[0] += count
+            entry[1] += rating_sum or 0
+            total += count
+
+        hour = hour_of(dialect, ratings.c.rated_at).label("hour")
+        for hour_value, count in conn.execute(select(hour, func.count()).where(*window).group_by(hour)):
+            if hour_value is not None:
+                self._hours[hour_value][1] += count
+        return total
+
+    def _fold_sessions(self, conn, dialect: str, upper: str) -> int:
+        sessions = UsageSession.__table__
+        hour = hour_of(dialect, sessions.c.session_start).label("hour")
+        rows = conn.execute(
+            select(hour, func.count())
+            .where(*self._window(sessions, upper))
+            .group_by(hour)
+        )
+        total = 0
+        for hour_value, count in rows:
+            if hour_value is not None:
+                self._hours[hour_value][0] += count
+            total += count
+        return total
+
+    def _fold_stories(self, conn, dialect: str, upper: str) -> int:
+        stories = Story.__table__
+        window = self._window(stories, upper)
+        element = json_elements(dialect, stories.c.values_taught)
+        rows = conn.execute(
+            select(element.c.value, func.count())
+            .select_from(stories.join(element, true()))
+            .where(*window)
+            .group_by(element.c.value)
+        )
+        for value, count in rows:
+            self._values[value][0] += count
+        return conn.execute(select(func.count()).select_from(stories).where(*window)).scalar()
+
+    def _fold_listens(self, conn, dialect: str, upper: str) -> int:
+        listens = ListeningHistory.__table__
+        stories = Story.__table__
+        window = self._window(listens, upper)
+        element = json_elements(dialect, stories.c.values_taught)
+        rows = conn.execute(
+            select(element.c.value, func.count(), func.sum(listens.c.completion_rate), func.count(listens.c.completion_rate))
+            .select_from(listens.join(stories, stories.c.id == listens.c.story_id).join(element, true()))
+            .where(*window)
+            .group_by(element.c.value)
+        )
+        for value, count, completion_sum, completion_count in rows:
+            entry = self._values[value]
+            entry[1] += count
+            entry[2] += completion_sum or 0.0
+            entry[3] += completion_count
+        return conn.execute(select(func.count()).select_from(listens).where(*window)).scalar()
+
+    # Views
+
+    def ratings_by_age_band(self) -> Dict[str, Dict[str, Dict[str, float]]]:
+        result: Dict[str, Dict[str, Dict[str, float]]] = {band: {} for band in AGE_BANDS}
+        for (age_band, activity_type), (count, rating_sum) in sorted(self._ratings.items()):
+            result.setdefault(age_band, {})[activity_type] = {
+                "count": count,
+                "avg_rating": round(rating_sum / count, 2) if count else 0,
+            }
+        return result
+
+    def engagement_by_hour(self) -> List[Dict[str, int]]:
+        counts = {hour: self._hours.get(hour, (0, 0)) for hour in range(24)}
+        return [{"hour": hour, "sessions": sessions, "ratings": ratings} for hour, (sessions, ratings) in counts.items()]
+
+    def value_popularity(self) -> List[Dict[str, Any]]:
+        popularity = [
+            {
+                "value": value,
+                "stories": stories,
+                "listens": listens,
+                "avg_completion": round(completion_sum / completion_count, 1) if completion_count else None,
+            }
+            for value, (stories, listens, completion_sum, completion_count) in self._values.items()
+        ]
+        return sorted(popularity, key=lambda x: (x["listens"], x["stories"]), reverse=True)
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "ratings_by_age_band": self.ratings_by_age_band(),
+                "engagement_by_hour": self.engagement_by_hour(),
+                "value_popularity": self.value_popularity(),
+                "rows": dict(self._rows),
+                "refreshed_at": self.refreshed_at.isoformat() if self.refreshed_at else None,
+            }
+
+    def get(self, conn, max_age: Optional[float] = None) -> Dict[str, Any]:
+        """Cached snapshot, refreshed first if older than `max_age` seconds"""
+        max_age = self.refresh_interval if max_age is None else max_age
+        if self.refreshed_at is None or (datetime.now() - self.refreshed_at).total_seconds() >= max_age:
+            self.refresh(conn)
+        return self.snapshot()
+
+
+cohorts = CohortAnalytics()
@@ -8,6 +8,8 @@ from sqlalchemy.pool import StaticPool
 import os
 from dotenv import load_dotenv
 
+from .tracing import instrument_engine
+
 load_dotenv()
 
 # Database URL from environment
@@ -21,9 +23,29 @@ engine = create_engine(
     echo=False  # Set to True for SQL debugging
 )
 
+# Time every query as a span of the current trace
+instrument_engine(engine)
+
 # Session maker
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Writes made off the event loop (event ingest flushes) get their own pooled
+# connections: the StaticPool connection above is shared by every request
+# handler, so a commit or rollback in a worker thread would end their
+# transactions too. An in-memory SQLite database only exists on that one
+# connection and keeps using it.
+if DATABASE_URL.startswith("sqlite") and (":memory:" in DATABASE_URL or DATABASE_URL.rstrip("/") in ("sqlite:", "sqlite")):
+    background_engine = engine
+else:
+    background_engine = create_engine(
+        DATABASE_URL,
+        pool_size=2,
+        connect_args={"check_same_thread": False} if "sqlite" in DATABASE_URL else {},
+        echo=False
+    )
+    instrument_engine(background_engine)
+BackgroundSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=background_engine)
+
 def get_db():
     """Dependency to get database session"""
     db = SessionLocal()
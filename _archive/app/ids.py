@@ -0,0 +1,71 @@
+"""
+ID generation - Time-ordered UUIDv7 identifiers
+
+Layout (RFC 9562): 48-bit Unix milliseconds, version 7, a 12-bit counter that
+keeps ids generated within the same millisecond increasing, variant bits, then
+62 random bits. New rows therefore land at the right edge of the primary-key
+B-tree instead of at random pages, and ids never collide across processes.
+
+Columns store them with sqlalchemy.Uuid: native UUID on PostgreSQL, CHAR(32)
+elsewhere. Databases holding older ids ("rating_<timestamp>", uuid4, ...) are
+converted with app.migrate_ids, which derives each new id from the row's
+timestamp so id order stays insertion order.
+"""
+
+import os
+import threading
+import time
+import uuid
+from datetime import datetime
+from typing import Optional
+
+_lock = threading.Lock()
+_last_ms = 0
+_counter = 0
+
+
+def _build(unix_ms: int, counter: int, random_bits: int) -> uuid.UUID:
+    value = (unix_ms & 0xFFFF_FFFF_FFFF) << 80
+    value |= 0x7 << 76
+    value |= (counter & 0xFFF) << 64
+    value |= 0b10 << 62
+    value |= random_bits & 0x3FFF_FFFF_FFFF_FFFF
+    return uuid.UUID(int=value)
+
+
+def uuid7() -> uuid.UUID:
+    """Monotonic UUIDv7 for the current time"""
+    global _last_ms, _counter
+    with _lock:
+        now = time.time_ns() // 1_000_000
+        if now > _last_ms:
+            _last_ms, _counter = now, int.from_bytes(os.urandom(2), "big") & 0x7FF
+        else:
+            _counter += 1
+            if _counter > 0xFFF:
+                # Counter exhausted within one millisecond: borrow the next one
+                _last_ms, _counter = _last_ms + 1, 0
+        unix_ms, counter = _last_ms, _counter
+    return _build(unix_ms, counter, int.from_bytes(os.urandom(8), "big"))
+
+
+def uuid7_at(at: datetime, random_bits: int) -> uuid.UUID:
+    """UUIDv7 for a given time with caller-supplied randomness, for reproducible data sets"""
+    unix_ms = int(at.timestamp() * 1000)
+    return _build(unix_ms, random_bits >> 62, random_bits)
+
+
+def new_id() -> str:
+    """String form used by the models (Uuid(as_uuid=False) columns)"""
+    return str(uuid7())
+
+
+def id_timestamp(value: str) -> Optional[datetime]:
+    """Creation time embedded in a UUIDv7 id, or None for other ids"""
+    try:
+        parsed = uuid.UUID(value)
+    except (ValueError, TypeError):
+        return None
+    if parsed.version != 7:
+        return None
+    return datetime.fromtimestamp((parsed.int >> 80) / 1000)
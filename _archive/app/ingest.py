@@ -0,0 +1,316 @@
+"""
+Event ingest - Buffered, batched writes for activity ratings and session events
+
+Game screens emit ratings in bursts. Instead of two commits per star tap,
+events are buffered in memory and flushed when the buffer reaches
+INGEST_MAX_BATCH events or INGEST_FLUSH_INTERVAL seconds have passed,
+whichever comes first. Each flush is one transaction:
+
+1. one multi-row INSERT for started sessions
+2. one multi-row INSERT for ratings
+3. one executemany UPDATE closing ended sessions (see analytics.session_close_values)
+
+Ratings also count as completed activities of the child's open session; those
+counters are kept in app.session_registry and written when the session ends.
+The registry is only updated once the flush has committed.
+
+Endpoints check that referenced children and sessions exist before accepting
+an event (unknown_references). If a batch still fails, it is retried one event
+per transaction so a single bad row does not take the others with it; events
+that fail on their own are kept in `dead_letters` with the error.
+
+Client-supplied rated_at / session end times older than the Parquet archive's
+high-water mark (app.parquet_export) are raised to the mark when flushed:
+below it, the export has already passed them and the report queries read
+only the archive, so the row would be counted nowhere.
+
+Flushes run in a worker thread on database.BackgroundSessionLocal, so a large
+batch does not block the event loop; a full buffer (INGEST_MAX_PENDING) wakes
+the flush task rather than writing inline. Events accepted but not yet flushed are
+lost if the process dies, so the exposure is bounded by the flush interval.
+"""
+
+import asyncio
+import os
+import threading
+from collections import Counter, deque
+from datetime import datetime
+from typing import Dict, List, Any, Iterable, Optional, Set, Tuple
+
+from sqlalchemy import select, insert, update, func, bindparam, DateTime, Integer
+
+from .analytics import session_close_values
+from .database import BackgroundSessionLocal
+from .ids import new_id
+from .session_registry import registry
+from .models import ActivityRating, Child, UsageSession
+from .parquet_export import archive as parquet_archive
+from .tracing import span
+
+FLUSH_INTERVAL = float(os.getenv("INGEST_FLUSH_INTERVAL", "0.5"))
+MAX_BATCH = int(os.getenv("INGEST_MAX_BATCH", "500"))
+MAX_PENDING = int(os.getenv("INGEST_MAX_PENDING", "20000"))
+DEAD_LETTER_SIZE = int(os.getenv("INGEST_DEAD_LETTER_SIZE", "1000"))
+
+
+def _not_before(events: List[Dict[str, Any]], key: str, floor: Optional[datetime]) -> List[Dict[str, Any]]:
+    """Events with `key` raised to `floor` where it is earlier"""
+    if floor is None:
+        return events
+    # Stored as naive wall-clock time, so an offset in client timestamps is not compared
+    return [dict(e, **{key: floor}) if e[key].replace(tzinfo=None) < floor else e for e in events]
+
+
+def _resolve(waiter: asyncio.Future, count: int, error: Optional[Exception]):
+    if waiter.done():
+        return
+    if error:
+        waiter.set_exception(error)
+    else:
+        waiter.set_result(count)
+
+
+class EventIngestor:
+    """In-memory event buffer with a background flush task"""
+
+    def __init__(self, session_factory=BackgroundSessionLocal, flush_interval: float = FLUSH_INTERVAL,
+                 max_batch: int = MAX_BATCH, max_pending: int = MAX_PENDING, archive=parquet_archive):
+        self.session_factory = session_factory
+        self.archive = archive
+        self.flush_interval = flush_interval
+        self.max_batch = max_batch
+        self.max_pending = max_pending
+        self._buffer_lock = threading.Lock()  # appends on the loop vs. the swap in flush()
+        self._flush_lock = threading.Lock()  # one flush at a time, so registry updates stay ordered
+        self._ratings: List[Dict[str, Any]] = []
+        self._starts: List[Dict[str, Any]] = []
+        self._ends: List[Dict[str, Any]] = []
+        self._waiters: List[asyncio.Future] = []  # resolved by the flush that takes the buffer
+        self._in_flight: Optional[List[asyncio.Future]] = None  # waiters on the flush writing right now
+        self._wake: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+        self.dead_letters: deque = deque(maxlen=DEAD_LETTER_SIZE)  # (kind, event, error)
+        self.stats = {"flushes": 0, "events": 0, "failed_flushes": 0, "retried_events": 0, "dropped_events": 0}
+
+    @property
+    def pending(self) -> int:
+        return len(self._ratings) + len(self._starts) + len(self._ends)
+
+    # Validation
+
+    def unknown_references(self, conn, child_ids: Iterable[str] = (),
+                           session_ids: Iterable[str] = ()) -> Tuple[Set[str], Set[str]]:
+        """Child and session ids that are neither in the database nor buffered"""
+        children = Child.__table__
+        sessions = UsageSession.__table__
+        child_ids = set(child_ids)
+        with self._buffer_lock:
+            buffered = {start["id"] for start in self._starts}
+        session_ids = {s for s in session_ids if s not in buffered and registry.count(s) is None}
+        if child_ids:
+            found = conn.execute(select(children.c.id).where(children.c.id.in_(child_ids))).scalars()
+            child_ids -= set(found)
+        if session_ids:
+            found = conn.execute(select(sessions.c.id).where(sessions.c.id.in_(session_ids))).scalars()
+            session_ids -= set(found)
+        return child_ids, session_ids
+
+    # Buffering
+
+    def add_rating(self, child_id: str, activity_type: str, rating: int, activity_id: Optional[str] = None,
+                   feedback_text: Optional[str] = None, rated_at: Optional[datetime] = None) -> str:
+        rating_id = new_id()
+        with self._buffer_lock:
+            self._ratings.append({
+                "id": rating_id,
+                "child_id": child_id,
+                "activity_type": activity_type,
+                "activity_id": activity_id,
+                "rating": max(1, min(5, rating)),  # Ensure 1-5 range
+                "feedback_text": feedback_text,
+                "rated_at": rated_at or datetime.now(),
+            })
+        self._on_added()
+        return rating_id
+
+    def start_session(self, child_id: str, parent_id: str, started_at: Optional[datetime] = None,
+                      session_id: Optional[str] = None) -> str:
+        session_id = session_id or new_id()
+        with self._buffer_lock:
+            self._starts.append({
+                "id": session_id,
+                "child_id": child_id,
+                "parent_id": parent_id,
+                "session_start": started_at or datetime.now(),
+                "activities_completed": 0,
+            })
+        self._on_added()
+        return session_id
+
+    def end_session(self, session_id: str, activities_completed: Optional[int] = None, ended_at: Optional[datetime] = None):
+        with self._buffer_lock:
+            self._ends.append({
+                "b_id": session_id,
+                "b_end": ended_at or datetime.now(),
+                "b_activities": activities_completed,
+            })
+        self._on_added()
+
+    def _on_added(self):
+        if self._wake is None:
+            if self.pending >= self.max_pending:
+                # No flush task (scripts, tests): nothing else would drain the buffer
+                self.flush()
+        elif self.pending >= self.max_batch:
+            # Also when over max_pending: the write happens off the loop, in the flush task
+            self._wake.set()
+
+    async def wait_flushed(self):
+        """Resolve once everything buffered so far has been written and committed"""
+        future = asyncio.get_running_loop().create_future()
+        with self._buffer_lock:
+            buffered = bool(self.pending)
+            if buffered:
+                self._waiters.append(future)
+            elif self._in_flight is not None:
+                # The buffer was taken by a flush that has not committed yet; wait for that one
+                self._in_flight.append(future)
+            else:
+                return
+        if buffered:
+            if self._wake is not None:
+                self._wake.set()
+            else:
+                await asyncio.to_thread(self.flush)
+        await future
+
+    # Flushing
+
+    def flush(self) -> int:
+        """Write all buffered events; returns the number written"""
+        with self._flush_lock:
+            with self._buffer_lock:
+                ratings, starts, ends, waiters = self._ratings, self._starts, self._ends, self._waiters
+                self._ratings, self._starts, self._ends, self._waiters = [], [], [], []
+                self._in_flight = waiters
+            count = len(ratings) + len(starts) + len(ends)
+            written, error = count, None
+            if count:
+                with span("ingest.flush", ratings=len(ratings), session_starts=len(starts), session_ends=len(ends)):
+                    try:
+                        self._write(ratings, starts, ends)
+                        self.stats["flushes"] += 1
+                    except Exception as e:
+                        print(f"Event ingest flush error: {e}")
+                        self.stats["failed_flushes"] += 1
+                        self.stats["retried_events"] += count
+                        written, error = self._write_each(ratings, starts, ends)
+                self.stats["events"] += written
+            with self._buffer_lock:
+                self._in_flight = None
+        # Waiters may belong to a loop running in another thread
+        for waiter in waiters:
+            waiter.get_loop().call_soon_threadsafe(_resolve, waiter, written, error)
+        return written
+
+    def _write_each(self, ratings: List[Dict[str, Any]], starts: List[Dict[str, Any]],
+                    ends: List[Dict[str, Any]]) -> Tuple[int, Optional[Exception]]:
+        """Retry a failed batch one event per transaction; failing events go to dead_letters"""
+        written, error = 0, None
+        events = [("start", e) for e in starts] + [("rating", e) for e in ratings] + [("end", e) for e in ends]
+        for kind, event in events:
+            try:
+                self._write([event] if kind == "rating" else [], [event] if kind == "start" else [],
+                            [event] if kind == "end" else [])
+                written += 1
+            except Exception as e:
+                print(f"Event ingest dropped {kind} event: {e}")
+                self.dead_letters.append((kind, event, repr(e)))
+                self.stats["dropped_events"] += 1
+                error = e
+        return written, error
+
+    def _write(self, ratings: List[Dict[str, Any]], starts: List[Dict[str, Any]], ends: List[Dict[str, Any]]):
+        sessions = UsageSession.__table__
+        ratings_table = ActivityRating.__table__
+        ratings = _not_before(ratings, "rated_at", self.archive.watermark("activity_ratings"))
+        ends = _not_before(ends, "b_end", self.archive.watermark("usage_sessions"))
+        with self.session_factory() as db:
+            conn = db.connection()
+            if starts:
+                conn.execute(insert(sessions).values(starts))
+            if ratings:
+                conn.execute(insert(ratings_table).values(ratings))
+
+            # Each rating counts as a completed activity of the child's open session. The
+            # counters live in the session registry, which only changes after the commit
+            # below; until then this batch's share is worked out here.
+            started = {start["id"] for start in starts}
+            opened = {start["child_id"]: start["id"] for start in starts}
+            per_child = Counter(r["child_id"] for r in ratings)
+            untracked = [child_id for child_id in per_child if child_id not in opened]
+            if untracked:
+                # Tracks committed sessions only: this batch's starts are excluded above
+                registry.load_open_sessions(conn, untracked)
+            added: Counter = Counter()
+            for child_id, n in per_child.items():
+                session_id = opened.get(child_id) or registry.lookup(child_id)
+                if session_id is not None:
+                    added[session_id] += n
+
+            if ends:
+                closing = []
+                for event in ends:
+                    counted = 0 if event["b_id"] in started else registry.count(event["b_id"])
+                    if counted is not None:
+                        counted += added[event["b_id"]]
+                        event = dict(event, b_activities=max(event["b_activities"] or 0, counted))
+                    closing.append(event)
+                conn.execute(
+                    update(sessions)
+                    .where(sessions.c.id == bindparam("b_id"), sessions.c.session_end.is_(None))
+                    .values(**session_close_values(
+                        conn.dialect.name,
+                        bindparam("b_end", type_=DateTime),
+                        func.coalesce(bindparam("b_activities", type_=Integer), sessions.c.activities_completed),
+                    )),
+                    closing,
+                )
+            db.commit()
+
+        for start in starts:
+            registry.opened(start["child_id"], start["id"])
+        for child_id, n in per_child.items():
+            registry.increment(child_id, n)
+        for event in ends:
+            registry.closed(event["b_id"])
+
+    # Lifecycle
+
+    async def _run(self):
+        while True:
+            try:
+                await asyncio.wait_for(self._wake.wait(), timeout=self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wake.clear()
+            if self.pending or self._waiters:
+                await asyncio.to_thread(self.flush)
+
+    def start(self):
+        if self._task is None:
+            self._wake = asyncio.Event()
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task, self._wake = None, None
+        await asyncio.to_thread(self.flush)
+
+
+ingestor = EventIngestor()
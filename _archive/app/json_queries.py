@@ -0,0 +1,58 @@
+"""
+JSON queries - Containment filters over JSON array columns
+
+On PostgreSQL the columns are JSONB (models.JSONDocument) and containment
+is `column @> '["Saygı"]'`, answered from the GIN index. SQLite keeps plain
+JSON and expands the array with json_each inside EXISTS, so the filter
+still runs in SQL rather than in Python.
+"""
+
+from typing import Iterable, Optional, Union
+
+from sqlalchemy import and_, exists, func, select, type_coerce
+from sqlalchemy.dialects.postgresql import JSONB
+
+from .models import Child, Story
+
+
+def _as_list(values: Union[str, Iterable[str]]):
+    return [values] if isinstance(values, str) else list(values)
+
+
+def json_elements(dialect: str, column):
+    """Table-valued expansion of a JSON array column, one `value` row per element"""
+    if dialect == "postgresql":
+        return func.jsonb_array_elements_text(column).table_valued("value").alias("element")
+    return func.json_each(column).table_valued("value").alias("element")
+
+
+def json_contains(dialect: str, column, values: Union[str, Iterable[str]]):
+    """True where the JSON array in `column` contains every one of `values`"""
+    values = _as_list(values)
+    if dialect == "postgresql":
+        # The column type is a JSON/JSONB variant; coerce to get the JSONB @> operator
+        return type_coerce(column, JSONB).contains(values)
+    conditions = []
+    for value in values:
+        element = func.json_each(column).table_valued("value").alias()
+        conditions.append(exists(select(1).select_from(element).where(element.c.value == value)))
+    return and_(*conditions)
+
+
+def stories_teaching(db, values: Union[str, Iterable[str]], user_id: Optional[str] = None,
+                     child_id: Optional[str] = None):
+    """Story query filtered to stories whose values_taught include all `values`"""
+    query = db.query(Story).filter(json_contains(db.get_bind().dialect.name, Story.values_taught, values))
+    if user_id is not None:
+        query = query.filter(Story.user_id == user_id)
+    if child_id is not None:
+        query = query.filter(Story.child_id == child_id)
+    return query
+
+
+def children_with_interest(db, interests: Union[str, Iterable[str]], parent_id: Optional[str] = None):
+    """Child query filtered to children whose interests include all `interests`"""
+    query = db.query(Child).filter(json_contains(db.get_bind().dialect.name, Child.interests, interests))
+    if parent_id is not None:
+        query = query.filter(Child.parent_id == parent_id)
+    return query
@@ -0,0 +1,150 @@
+"""
+ID migration - Rewrite legacy row ids as UUIDv7
+
+Rows written before app.ids carry ids like "rating_1718000000.123",
+"session_<child>_<hex>" or random uuid4 strings. The Uuid columns cannot read
+the former, and none of them sort by creation time, which the incremental
+refreshes rely on (cohort_analytics, recommendations and the report
+fingerprint all treat id order as insertion order).
+
+Each legacy id is replaced by a UUIDv7 built from the row's own timestamp
+(created_at, rated_at, listened_at or session_start), so migrated rows sort
+before everything written since, and every foreign key pointing at it is
+rewritten in the same transaction. On PostgreSQL the VARCHAR id columns are
+then converted to native UUID, with the foreign key constraints dropped and
+recreated around the change.
+
+Run it with the app stopped (in-memory watermarks would skip the rewritten
+rows) and before the first start on the new schema:
+
+    python -m app.migrate_ids [--dry-run]
+"""
+
+import argparse
+import os
+import time
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from sqlalchemy import String, Uuid, bindparam, cast, inspect, select, text, update
+from sqlalchemy.schema import AddConstraint
+
+from .ids import id_timestamp, uuid7_at
+from .models import Base
+
+# Table -> column holding the row's creation time
+TIMESTAMP_COLUMNS = {
+    "children": "created_at",
+    "stories": "created_at",
+    "voice_recordings": "created_at",
+    "listening_history": "listened_at",
+    "activity_ratings": "rated_at",
+    "usage_sessions": "session_start",
+    "biweekly_reports": "created_at",
+}
+FALLBACK_TIME = datetime(2024, 1, 1)  # rows without a timestamp sort first
+
+
+def is_current(raw: Optional[str], dialect: str) -> bool:
+    """Whether a stored id is already a UUIDv7 in the column's storage format"""
+    if raw is None or id_timestamp(str(raw)) is None:
+        return False
+    # Uuid columns store 32 hex digits outside PostgreSQL; dashed text is legacy
+    return dialect == "postgresql" or len(str(raw)) == 32
+
+
+def plan(conn) -> Dict[str, Dict[str, str]]:
+    """Legacy id -> new UUIDv7 per table"""
+    dialect = conn.dialect.name
+    mapping: Dict[str, Dict[str, str]] = {}
+    for name, time_column in TIMESTAMP_COLUMNS.items():
+        table = Base.metadata.tables[name]
+        rows = conn.execute(select(cast(table.c.id, String), table.c[time_column])).all()
+        mapping[name] = {
+            raw: str(uuid7_at(created or FALLBACK_TIME, int.from_bytes(os.urandom(8), "big")))
+            for raw, created in rows if not is_current(raw, dialect)
+        }
+    return mapping
+
+
+def _references(name: str) -> List:
+    """Columns in other tables holding ids of `name`"""
+    return [
+        fk.parent for table in Base.metadata.sorted_tables for fk in table.foreign_keys
+        if fk.column.table.name == name
+    ]
+
+
+def _rewrite(conn, column, mapping: Dict[str, str]):
+    table = column.table
+    conn.execute(
+        update(table)
+        .where(cast(column, String) == bindparam("b_old", type_=String))
+        .values({column.name: bindparam("b_new", type_=Uuid(as_uuid=False))}),
+        [{"b_old": old, "b_new": new} for old, new in mapping.items()],
+    )
+
+
+def _foreign_keys(conn):
+    """(table, constraint name) of every foreign key in the schema"""
+    inspector = inspect(conn)
+    return [
+        (name, fk["name"]) for name in Base.metadata.tables
+        if inspector.has_table(name) for fk in inspector.get_foreign_keys(name) if fk["name"]
+    ]
+
+
+def migrate(engine, dry_run: bool = False) -> Dict[str, int]:
+    """Rewrite legacy ids in one transaction; returns rewritten rows per table"""
+    with engine.begin() as conn:
+        postgres = conn.dialect.name == "postgresql"
+        mapping = plan(conn)
+        counts = {name: len(ids) for name, ids in mapping.items()}
+        if dry_run:
+            return counts
+
+        if postgres:
+            # Keys change underneath their references; constraints come back at the end
+            for table, constraint in _foreign_keys(conn):
+                conn.execute(text(f'ALTER TABLE "{table}" DROP CONSTRAINT "{constraint}"'))
+        elif conn.dialect.name == "sqlite":
+            # Checked at commit, when keys and references agree again
+            conn.execute(text("PRAGMA defer_foreign_keys = ON"))
+        for name, ids in mapping.items():
+            if not ids:
+                continue
+            for column in _references(name):
+                _rewrite(conn, column, ids)
+            _rewrite(conn, Base.metadata.tables[name].c.id, ids)
+
+        if postgres:
+            inspector = inspect(conn)
+            for table in Base.metadata.sorted_tables:
+                types = {c["name"]: c["type"] for c in inspector.get_columns(table.name)}
+                for column in table.columns:
+                    if isinstance(column.type, Uuid) and not isinstance(types.get(column.name), Uuid):
+                        conn.execute(text(
+                            f'ALTER TABLE "{table.name}" ALTER COLUMN "{column.name}" '
+                            f'TYPE uuid USING "{column.name}"::uuid'
+                        ))
+            for table in Base.metadata.sorted_tables:
+                for constraint in table.foreign_key_constraints:
+                    conn.execute(AddConstraint(constraint))
+        return counts
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Rewrite legacy row ids as UUIDv7")
+    parser.add_argument("--dry-run", action="store_true", help="only count the ids that would change")
+    args = parser.parse_args(argv)
+
+    from .database import engine
+    started = time.perf_counter()
+    counts = migrate(engine, dry_run=args.dry_run)
+    for table, rows in counts.items():
+        print(f"{table}: {rows} ids {'to rewrite' if args.dry_run else 'rewritten'}")
+    print(f"done in {time.perf_counter() - started:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
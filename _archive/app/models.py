@@ -2,21 +2,30 @@
 Database models for AtaMind
 """
 
-from sqlalchemy import Column, Integer, String, Text, DateTime, Boolean, ForeignKey, Float, JSON
+from sqlalchemy import Column, Integer, String, Text, DateTime, Boolean, ForeignKey, Float, JSON, Uuid, Index, DDL, event, literal_column
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import relationship
+from sqlalchemy.orm.attributes import get_history
 from sqlalchemy.sql import func
 from pydantic import BaseModel
 from typing import Optional, List, Dict, Any
 from datetime import datetime
+from uuid import UUID
+
+from .ids import new_id
+from .turkish_text import search_document as build_search_document
 
 Base = declarative_base()
 
+# JSONB on PostgreSQL (indexable, containment operators), plain JSON elsewhere
+JSONDocument = JSON().with_variant(JSONB(), "postgresql")
+
 # SQLAlchemy Models
 class User(Base):
     __tablename__ = "users"
     
-    id = Column(String, primary_key=True)
+    id = Column(String, primary_key=True)  # External auth id
     email = Column(String, unique=True, nullable=False)
     first_name = Column(String)
     last_name = Column(String)
@@ -32,13 +41,13 @@ class User(Base):
 class Child(Base):
     __tablename__ = "children"
     
-    id = Column(String, primary_key=True)
+    id = Column(Uuid(as_uuid=False), primary_key=True, default=new_id)
     parent_id = Column(String, ForeignKey("users.id"), nullable=False)
     name = Column(String, nullable=False)
     age = Column(Integer, nullable=False)
-    interests = Column(JSON)  # List of interests
+    interests = Column(JSONDocument)  # List of interests
     learning_style = Column(String)  # visual, auditory, kinesthetic
-    personality_traits = Column(JSON)  # Personality analysis
+    personality_traits = Column(JSONDocument)  # Personality analysis
     cultural_background = Column(String, default="Turkish")
     created_at = Column(DateTime, default=func.now())
     updated_at = Column(DateTime, default=func.now(), onupdate=func.now())
@@ -47,33 +56,85 @@ class Child(Base):
     parent = relationship("User", back_populates="children")
     stories = relationship("Story", back_populates="child")
     listening_history = relationship("ListeningHistory", back_populates="child")
+    
+    # GIN indexes for containment filters (app.json_queries); PostgreSQL only
+    __table_args__ = (
+        Index("ix_children_interests", "interests", postgresql_using="gin",
+              postgresql_ops={"interests": "jsonb_path_ops"}).ddl_if(dialect="postgresql"),
+    )
+
+def _story_search_document(context) -> str:
+    """Column default: search terms from the row being inserted"""
+    params = context.get_current_parameters()
+    return build_search_document(params.get("title"), params.get("content"),
+                                 params.get("values_taught"), params.get("cultural_elements"))
 
 class Story(Base):
     __tablename__ = "stories"
     
-    id = Column(String, primary_key=True)
+    id = Column(Uuid(as_uuid=False), primary_key=True, default=new_id)
     user_id = Column(String, ForeignKey("users.id"), nullable=False)
-    child_id = Column(String, ForeignKey("children.id"), nullable=False)
+    child_id = Column(Uuid(as_uuid=False), ForeignKey("children.id"), nullable=False)
     title = Column(String, nullable=False)
     content = Column(Text, nullable=False)
-    values_taught = Column(JSON)  # List of values/morals
+    values_taught = Column(JSONDocument)  # List of values/morals
     audio_url = Column(String)
     image_url = Column(String)
     duration = Column(Float)  # Story duration in minutes
     difficulty_level = Column(String)  # easy, medium, hard
-    cultural_elements = Column(JSON)  # Turkish cultural references
-    ai_analysis = Column(JSON)  # AI-generated insights
+    cultural_elements = Column(JSONDocument)  # Turkish cultural references
+    ai_analysis = Column(JSONDocument)  # AI-generated insights
+    search_document = Column(Text, default=_story_search_document)  # Folded, stemmed terms (app.story_search); refreshed on edit below
     created_at = Column(DateTime, default=func.now())
     
     # Relationships
     user = relationship("User", back_populates="stories")
     child = relationship("Child", back_populates="stories")
     listening_history = relationship("ListeningHistory", back_populates="story")
+    
+    __table_args__ = (
+        Index("ix_stories_values_taught", "values_taught", postgresql_using="gin",
+              postgresql_ops={"values_taught": "jsonb_path_ops"}).ddl_if(dialect="postgresql"),
+        Index("ix_stories_cultural_elements", "cultural_elements", postgresql_using="gin",
+              postgresql_ops={"cultural_elements": "jsonb_path_ops"}).ddl_if(dialect="postgresql"),
+        Index("ix_stories_search_document", func.to_tsvector(literal_column("'simple'"), search_document),
+              postgresql_using="gin").ddl_if(dialect="postgresql"),
+    )
+
+
+# SQLite full-text index over stories.search_document, kept in sync by triggers
+STORY_FTS_DDL = [
+    "CREATE VIRTUAL TABLE IF NOT EXISTS stories_fts USING fts5("
+    "search_document, content='stories', content_rowid='rowid')",
+    "CREATE TRIGGER IF NOT EXISTS stories_fts_insert AFTER INSERT ON stories BEGIN "
+    "INSERT INTO stories_fts (rowid, search_document) VALUES (new.rowid, new.search_document); END",
+    "CREATE TRIGGER IF NOT EXISTS stories_fts_delete AFTER DELETE ON stories BEGIN "
+    "INSERT INTO stories_fts (stories_fts, rowid, search_document) VALUES ('delete', old.rowid, old.search_document); END",
+    "CREATE TRIGGER IF NOT EXISTS stories_fts_update AFTER UPDATE OF search_document ON stories BEGIN "
+    "INSERT INTO stories_fts (stories_fts, rowid, search_document) VALUES ('delete', old.rowid, old.search_document); "
+    "INSERT INTO stories_fts (rowid, search_document) VALUES (new.rowid, new.search_document); END",
+]
+for statement in STORY_FTS_DDL:
+    event.listen(Story.__table__, "after_create", DDL(statement).execute_if(dialect="sqlite"))
+
+SEARCH_SOURCE_COLUMNS = ("title", "content", "values_taught", "cultural_elements")
+
+@event.listens_for(Story, "before_update")
+def _refresh_search_document(mapper, connection, story):
+    """Recompute search terms when an edit touches their source columns
+
+    Only ORM flushes pass through here; Core UPDATEs of these columns have to
+    set search_document themselves (see story_search.reindex_stories). The
+    SQLite FTS trigger then picks up the new document.
+    """
+    if any(get_history(story, name).has_changes() for name in SEARCH_SOURCE_COLUMNS):
+        story.search_document = build_search_document(story.title, story.content,
+                                                      story.values_taught, story.cultural_elements)
 
 class VoiceRecording(Base):
     __tablename__ = "voice_recordings"
     
-    id = Column(String, primary_key=True)
+    id = Column(Uuid(as_uuid=False), primary_key=True, default=new_id)
     user_id = Column(String, ForeignKey("users.id"), nullable=False)
     file_path = Column(String, nullable=False)
     transcript = Column(Text)
@@ -88,9 +149,9 @@ class VoiceRecording(Base):
 class ListeningHistory(Base):
     __tablename__ = "listening_history"
     
-    id = Column(String, primary_key=True)
-    child_id = Column(String, ForeignKey("children.id"), nullable=False)
-    story_id = Column(String, ForeignKey("stories.id"), nullable=False)
+    id = Column(Uuid(as_uuid=False), primary_key=True, default=new_id)
+    child_id = Column(Uuid(as_uuid=False), ForeignKey("children.id"), nullable=False)
+    story_id = Column(Uuid(as_uuid=False), ForeignKey("stories.id"), nullable=False)
     duration_listened = Column(Float)  # Minutes listened
     completion_rate = Column(Float)  # Percentage completed
     engagement_score = Column(Float)  # AI-calculated engagement
@@ -103,8 +164,8 @@ class ListeningHistory(Base):
 class ActivityRating(Base):
     __tablename__ = "activity_ratings"
     
-    id = Column(String, primary_key=True)
-    child_id = Column(String, ForeignKey("children.id"), nullable=False)
+    id = Column(Uuid(as_uuid=False), primary_key=True, default=new_id)
+    child_id = Column(Uuid(as_uuid=False), ForeignKey("children.id"), nullable=False)
     activity_type = Column(String, nullable=False)  # story, voice_message, game, etc.
     activity_id = Column(String)  # Reference to specific content
     rating = Column(Integer, nullable=False)  # 1-5 stars
@@ -117,8 +178,8 @@ class ActivityRating(Base):
 class UsageSession(Base):
     __tablename__ = "usage_sessions"
     
-    id = Column(String, primary_key=True)
-    child_id = Column(String, ForeignKey("children.id"), nullable=False)
+    id = Column(Uuid(as_uuid=False), primary_key=True, default=new_id)
+    child_id = Column(Uuid(as_uuid=False), ForeignKey("children.id"), nullable=False)
     parent_id = Column(String, ForeignKey("users.id"), nullable=False)
     session_start = Column(DateTime, default=func.now())
     session_end = Column(DateTime)
@@ -133,8 +194,8 @@ class UsageSession(Base):
 class BiweeklyReport(Base):
     __tablename__ = "biweekly_reports"
     
-    id = Column(String, primary_key=True)
-    child_id = Column(String, ForeignKey("children.id"), nullable=False)
+    id = Column(Uuid(as_uuid=False), primary_key=True, default=new_id)
+    child_id = Column(Uuid(as_uuid=False), ForeignKey("children.id"), nullable=False)
     parent_id = Column(String, ForeignKey("users.id"), nullable=False)
     report_period_start = Column(DateTime, nullable=False)
     report_period_end = Column(DateTime, nullable=False)
@@ -145,20 +206,22 @@ class BiweeklyReport(Base):
     average_session_length = Column(Float)
     
     # Content Analytics
-    favorite_content_types = Column(JSON)
-    most_rated_activities = Column(JSON)
-    learning_progress = Column(JSON)
+    favorite_content_types = Column(JSONDocument)
+    most_rated_activities = Column(JSONDocument)
+    learning_progress = Column(JSONDocument)
     
     # Voice Message Analytics
-    voice_message_ratings = Column(JSON)
-    parent_voice_feedback = Column(JSON)
-    recommended_improvements = Column(JSON)
+    voice_message_ratings = Column(JSONDocument)
+    voice_rating_avg = Column(Float)  # Scalar copy of voice_message_ratings["average_voice_rating"] for listings
+    parent_voice_feedback = Column(JSONDocument)
+    recommended_improvements = Column(JSONDocument)
     
     # AI Insights
-    child_development_insights = Column(JSON)
-    engagement_patterns = Column(JSON)
-    recommended_activities = Column(JSON)
+    child_development_insights = Column(JSONDocument)
+    engagement_patterns = Column(JSONDocument)
+    recommended_activities = Column(JSONDocument)
     
+    rollup_fingerprint = Column(String)  # Hash of the window's session/rating rollups, see AnalyticsEngine.report_fingerprint
     created_at = Column(DateTime, default=func.now())
     
     # Relationships
@@ -243,6 +306,21 @@ class ActivityRatingCreate(BaseModel):
     rating: int  # 1-5
     feedback_text: Optional[str] = None
 
+class RatingEvent(ActivityRatingCreate):
+    child_id: UUID
+    rated_at: Optional[datetime] = None
+
+class SessionEvent(BaseModel):
+    type: str  # start, end
+    child_id: Optional[UUID] = None  # required for start
+    session_id: Optional[UUID] = None  # required for end, optional client id for start
+    activities_completed: Optional[int] = None
+    occurred_at: Optional[datetime] = None
+
+class EventBatch(BaseModel):
+    ratings: List[RatingEvent] = []
+    sessions: List[SessionEvent] = []
+
 class ActivityRatingResponse(BaseModel):
     id: str
     activity_type: str
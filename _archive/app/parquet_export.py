@@ -0,0 +1,262 @@
+"""
+Parquet export - Incremental columnar archive of analytics events
+
+Streams usage sessions, activity ratings and listening history out of the
+OLTP database into date-partitioned, zstd-compressed Parquet files:
+
+    <dir>/<table>/date=YYYY-MM-DD/part-<run>-<n>.parquet
+    <dir>/_state.json                  high-water mark and directory per table
+
+Each run exports rows whose timestamp lies in [previous mark, now - settle).
+The timestamp is the one after which a row no longer changes:
+
+- activity_ratings:  rated_at
+- listening_history: listened_at
+- usage_sessions:    session_end (open sessions are exported once closed)
+
+Sessions get a longer settle window because abandoned sessions are closed
+by the reconciler with session_end set to their last activity, up to
+SESSION_IDLE_MINUTES in the past. Rows written later with a timestamp below
+the mark would not be picked up; app.ingest raises backdated batch event
+times to the mark for that reason. `export(full=True)` rebuilds the archive. A rebuild writes each table into a fresh
+<table>@<run> directory and switches to it by rewriting _state.json, so
+readers never see a mark without its files; the old directory is removed
+afterwards.
+
+ParquetArchive.read() is the reader side; analytics_columnar combines it with
+the database for rows newer than the mark.
+
+Requires pyarrow. Run from _archive:
+
+    python -m app.parquet_export [--dir exports/analytics] [--full]
+"""
+
+import argparse
+import json
+import os
+import shutil
+import time
+import uuid
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Dict, List, Any, Optional
+
+import pandas as pd
+from sqlalchemy import select, DateTime, Float, Integer
+
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    import pyarrow.dataset as ds
+except ImportError:
+    pa = None
+
+from .models import UsageSession, ActivityRating, ListeningHistory
+from .tracing import span
+
+EXPORT_DIR = os.getenv("ANALYTICS_EXPORT_DIR", "exports/analytics")
+EXPORT_SETTLE_SECONDS = float(os.getenv("ANALYTICS_EXPORT_SETTLE_SECONDS", "60"))
+CHUNK_ROWS = 100_000
+
+# table -> (model, high-water mark column)
+TABLES = {
+    "usage_sessions": (UsageSession, "session_end"),
+    "activity_ratings": (ActivityRating, "rated_at"),
+    "listening_history": (ListeningHistory, "listened_at"),
+}
+
+
+def _require_pyarrow():
+    if pa is None:
+        raise RuntimeError("Parquet export requires pyarrow (pip install pyarrow)")
+
+
+def _arrow_type(column):
+    if isinstance(column.type, DateTime):
+        return pa.timestamp("us")
+    if isinstance(column.type, Integer):
+        return pa.int64()
+    if isinstance(column.type, Float):
+        return pa.float64()
+    return pa.string()
+
+
+def _settle(table: str, settle_seconds: float) -> timedelta:
+    if table == "usage_sessions":
+        from .analytics import SESSION_IDLE_MINUTES, SESSION_RECONCILE_INTERVAL
+        # An abandoned session may be closed up to one idle window plus a reconcile period late
+        return timedelta(seconds=settle_seconds + SESSION_IDLE_MINUTES * 60 + 2 * SESSION_RECONCILE_INTERVAL)
+    return timedelta(seconds=settle_seconds)
+
+
+class ParquetArchive:
+    """Date-partitioned Parquet files plus their high-water marks"""
+
+    def __init__(self, directory: str = EXPORT_DIR):
+        self.directory = Path(directory)
+        self._state: Dict[str, Dict[str, Any]] = {}
+        self._state_mtime: Optional[float] = None
+
+    @property
+    def state_path(self) -> Path:
+        return self.directory / "_state.json"
+
+    def state(self) -> Dict[str, Dict[str, Any]]:
+        try:
+            mtime = self.state_path.stat().st_mtime
+        except FileNotFoundError:
+            return {}
+        if mtime != self._state_mtime:
+            self._state = json.loads(self.state_path.read_text())
+            self._state_mtime = mtime
+        return self._state
+
+    def _save_state(self, state: Dict[str, Dict[str, Any]]):
+        tmp = self.state_path.with_suffix(".tmp")
+        tmp.write_text(json.dumps(state, indent=2))
+        os.replace(tmp, self.state_path)
+
+    def table_dir(self, table: str, state: Optional[Dict[str, Dict[str, Any]]] = None) -> Path:
+        """Directory holding the archived files of `table`"""
+        entry = (self.state() if state is None else state).get(table, {})
+        return self.directory / entry.get("dir", table)
+
+    def watermark(self, table: str) -> Optional[datetime]:
+        """Rows of `table` with a mark timestamp below this are in the archive"""
+        if pa is None:
+            return None
+        entry = self.state().get(table)
+        return datetime.fromisoformat(entry["watermark"]) if entry else None
+
+    # Export
+
+    def export(self, engine, full: bool = False, settle_seconds: float = EXPORT_SETTLE_SECONDS) -> Dict[str, int]:
+        """Export rows past each table's mark; returns rows written per table"""
+        _require_pyarrow()
+        self.directory.mkdir(parents=True, exist_ok=True)
+        state = dict(self.state())
+        now = datetime.now()
+        run = now.strftime("%Y%m%dT%H%M%S")
+        written = {}
+        for table in TABLES:
+            current_dir = self.table_dir(table, state)
+            if full:
+                # Rebuilt next to the live files; the state switch below makes it current
+                target, lower, previous = self.directory / f"{table}@{run}", None, {}
+                shutil.rmtree(target, ignore_errors=True)
+            else:
+                target, previous = current_dir, state.get(table, {})
+                lower = datetime.fromisoformat(previous["watermark"]) if previous else None
+            upper = now - _settle(table, settle_seconds)
+            if lower is not None and lower >= upper:
+                written[table] = 0
+                continue
+            with span("export.parquet", table=table, full=full) as current:
+                rows, files = self._export_table(engine, table, lower, upper, run, target)
+                current.set_attributes(rows=rows, files=files)
+            state[table] = {
+                "watermark": upper.isoformat(),
+                "dir": target.name,
+                "rows": previous.get("rows", 0) + rows,
+                "files": previous.get("files", 0) + files,
+                "exported_at": now.isoformat(),
+            }
+            # Marks advance (and a rebuild goes live) only after the table's files are in place
+            self._save_state(state)
+            if target != current_dir:
+                shutil.rmtree(current_dir, ignore_errors=True)
+            written[table] = rows
+        return written
+
+    def _export_table(self, engine, table: str, lower: Optional[datetime], upper: datetime, run: str, target: Path):
+        model, mark = TABLES[table]
+        sql_table = model.__table__
+        columns = list(sql_table.columns)
+        schema = pa.schema([(column.name, _arrow_type(column)) for column in columns])
+        mark_column = sql_table.c[mark]
+        query = select(*columns).where(mark_column < upper).order_by(mark_column)
+        if lower is not None:
+            query = query.where(mark_column >= lower)
+
+        staging = self.directory / "_staging" / run / table
+        shutil.rmtree(staging, ignore_errors=True)
+        partitioning = ds.partitioning(pa.schema([("date", pa.date32())]), flavor="hive")
+        options = ds.ParquetFileFormat().make_write_options(compression="zstd")
+        rows = 0
+        with engine.connect() as conn:
+            result = conn.execution_options(stream_results=True, yield_per=CHUNK_ROWS).execute(query)
+            for n, chunk in enumerate(result.partitions()):
+                batch = pa.table(
+                    [pa.array(values, type=field.type) for values, field in zip(zip(*chunk), schema)],
+                    schema=schema,
+                )
+                batch = batch.append_column("date", pc.cast(batch[mark], pa.date32()))
+                ds.write_dataset(
+                    batch, staging, format="parquet", partitioning=partitioning,
+                    basename_template=f"part-{run}-{n}-{{i}}.parquet", file_options=options,
+                    existing_data_behavior="overwrite_or_ignore",
+                )
+                rows += len(chunk)
+
+        files = 0
+        if staging.exists():
+            for path in staging.rglob("*.parquet"):
+                destination = target / path.relative_to(staging)
+                destination.parent.mkdir(parents=True, exist_ok=True)
+                os.replace(path, destination)
+                files += 1
+        shutil.rmtree(self.directory / "_staging" / run, ignore_errors=True)
+        return rows, files
+
+    # Read
+
+    def read(self, table: str, start: datetime, end: Optional[datetime] = None, time_column: Optional[str] = None,
+             child_id: Optional[str] = None, columns: Optional[List[str]] = None,
+             watermark: Optional[datetime] = None) -> pd.DataFrame:
+        """Archived rows of `table` with start <= time_column < end
+
+        time_column defaults to the table's mark column; it must not be later
+        than the mark (true for session_start), so date partitions before
+        `start` can be skipped. With `watermark`, only rows whose mark column
+        is below it are returned: an export moves its files in before it saves
+        the new mark, and until then the database still serves those rows.
+        """
+        _require_pyarrow()
+        mark = TABLES[table][1]
+        time_column = time_column or mark
+        path = self.table_dir(table)
+        if not path.exists():
+            return pd.DataFrame(columns=columns)
+        dataset = ds.dataset(path, format="parquet", partitioning=ds.partitioning(pa.schema([("date", pa.date32())]), flavor="hive"))
+        condition = (ds.field("date") >= start.date()) & (ds.field(time_column) >= start)
+        if end is not None:
+            condition &= ds.field(time_column) < end
+            if time_column == mark:
+                condition &= ds.field("date") <= end.date()
+        if watermark is not None:
+            condition &= ds.field(mark) < watermark
+        if child_id is not None:
+            condition &= ds.field("child_id") == str(uuid.UUID(str(child_id)))
+        return dataset.to_table(columns=columns, filter=condition).to_pandas()
+
+
+archive = ParquetArchive()
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Export analytics events to date-partitioned Parquet")
+    parser.add_argument("--dir", default=EXPORT_DIR)
+    parser.add_argument("--full", action="store_true", help="rebuild the archive from scratch")
+    parser.add_argument("--settle", type=float, default=EXPORT_SETTLE_SECONDS, help="seconds of recent rows to leave for the next run")
+    args = parser.parse_args(argv)
+
+    from .database import engine
+    started = time.perf_counter()
+    written = ParquetArchive(args.dir).export(engine, full=args.full, settle_seconds=args.settle)
+    for table, rows in written.items():
+        print(f"{table}: {rows} rows")
+    print(f"done in {time.perf_counter() - started:.1f}s -> {args.dir}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,232 @@
+"""
+Story recommendations - Local top-K story suggestions from listening history
+
+Each child's listens form a sparse row of a child x story interaction matrix
+(dict of story row -> weight). A listen weighs completion and engagement,
+centred so a story abandoned early pushes similar stories down:
+
+    weight = (completion_rate + engagement_score) / 200 - 0.5
+
+Stories are L2-normalized binary vectors over their values and cultural
+elements (folded with turkish_text.fold, so "Saygı" and "saygi" are one
+feature), which makes item-item cosine similarity a dot product. A child's
+score for story s is sum_j weight_j * sim(j, s) = F[s] . (sum_j weight_j F[j]),
+so ranking never materializes the item-item matrix.
+
+Candidates are the stories in the child's family library (stories carry the
+child's name, so other families' stories are never suggested) that the child
+has not listened to yet; with no listens they come newest first. Top-K lists
+are precomputed and served from memory, so a request costs no query and no
+LLM call. A child created after the last refresh gets a cold-start list (the
+family's newest unheard stories) straight from the database until it is
+folded in.
+
+Refresh works like cohort_analytics: ids are UUIDv7, and each refresh folds
+children, stories and listens with ids in [last watermark, now - settle) and
+re-ranks only the children those rows touch. Edited or deleted rows only show
+up after `refresh(full=True)`.
+"""
+
+import os
+import threading
+from collections import defaultdict
+from datetime import datetime, timedelta
+from typing import Dict, List, Any, Optional, Set, Tuple
+
+import numpy as np
+from sqlalchemy import select
+
+from .ids import uuid7_at
+from .models import Child, Story, ListeningHistory
+from .tracing import span
+from .turkish_text import fold
+
+RECOMMEND_REFRESH_INTERVAL = float(os.getenv("RECOMMEND_REFRESH_INTERVAL", "60"))
+RECOMMEND_SETTLE_SECONDS = float(os.getenv("RECOMMEND_SETTLE_SECONDS", "60"))
+RECOMMEND_TOP_K = int(os.getenv("RECOMMEND_TOP_K", "10"))
+TABLES = ["children", "stories", "listening_history"]
+
+
+def listen_weight(completion_rate: Optional[float], engagement_score: Optional[float]) -> float:
+    """Signed interaction weight of one listen; missing scores count as neutral"""
+    completion = 50.0 if completion_rate is None else completion_rate
+    engagement = completion if engagement_score is None else engagement_score
+    return (completion + engagement) / 200 - 0.5
+
+
+class StoryRecommender:
+    """Precomputed per-child story recommendations with incremental refresh"""
+
+    def __init__(self, top_k: int = RECOMMEND_TOP_K, refresh_interval: float = RECOMMEND_REFRESH_INTERVAL,
+                 settle_seconds: float = RECOMMEND_SETTLE_SECONDS):
+        self.top_k = top_k
+        self.refresh_interval = refresh_interval
+        self.settle_seconds = settle_seconds
+        self._lock = threading.Lock()
+        self._reset()
+
+    def _reset(self):
+        self._watermark: Optional[str] = None  # exclusive upper id bound of the last refresh
+        self._story_ids: List[str] = []  # row -> story id
+        self._story_rows: Dict[str, int] = {}  # story id -> row
+        self._vocabulary: Dict[str, int] = {}  # feature -> column
+        self._features = np.zeros((0, 0), dtype=np.float32)  # story x feature, rows L2-normalized
+        self._library: Dict[str, List[int]] = defaultdict(list)  # parent id -> story rows, oldest first
+        self._parents: Dict[str, str] = {}  # child id -> parent id
+        self._children: Dict[str, List[str]] = defaultdict(list)  # parent id -> child ids
+        self._interactions: Dict[str, Dict[int, float]] = defaultdict(dict)  # child id -> story row -> weight
+        self._pending: Dict[str, List[Tuple[str, float]]] = defaultdict(list)  # listens of not yet folded stories
+        self._top: Dict[str, List[Tuple[str, float]]] = {}  # child id -> [(story id, score)]
+        self._rows = dict.fromkeys(TABLES, 0)
+        self.refreshed_at: Optional[datetime] = None
+
+    def _window(self, table, upper: str):
+        conditions = [table.c.id < upper]
+        if self._watermark is not None:
+            conditions.append(table.c.id >= self._watermark)
+        return conditions
+
+    def refresh(self, conn, full: bool = False) -> Dict[str, int]:
+        """Fold rows inserted since the last refresh and re-rank affected children"""
+        with self._lock:
+            if full:
+                self._reset()
+            now = datetime.now()
+            upper = str(uuid7_at(now - timedelta(seconds=self.settle_seconds), 0))
+            with span("recommendations.refresh", full=full or self.refreshed_at is None) as current:
+                dirty: Set[str] = set()
+                folded = {
+                    "children": self._fold_children(conn, upper, dirty),
+                    "stories": self._fold_stories(conn, upper, dirty),
+                    "listening_history": self._fold_listens(conn, upper, dirty),
+                }
+                for child_id in dirty:
+                    self._top[child_id] = self._rank(child_id)
+                current.set_attributes(**{f"rows.{name}": n for name, n in folded.items()}, ranked=len(dirty))
+            for name, n in folded.items():
+                self._rows[name] += n
+            self._watermark = upper
+            self.refreshed_at = now
+            return folded
+
+    def _fold_children(self, conn, upper: str, dirty: Set[str]) -> int:
+        children = Child.__table__
+        rows = conn.execute(select(children.c.id, children.c.parent_id).where(*self._window(children, upper))).all()
+        for child_id, parent_id in rows:
+            self._parents[child_id] = parent_id
+            self._children[parent_id].append(child_id)
+            dirty.add(child_id)
+        return len(rows)
+
+    def _fold_stories(self, conn, upper: str, dirty: Set[str]) -> int:
+        stories = Story.__table__
+        rows = conn.execute(
+            select(stories.c.id, stories.c.user_id, stories.c.values_taught, stories.c.cultural_elements)
+            .where(*self._window(stories, upper))
+            .order_by(stories.c.id)
+        ).all()
+        if not rows:
+            return 0
+        columns = []
+        for _, _, values, elements in rows:
+            features = {f"value:{fold(v)}" for v in values or []} | {f"culture:{fold(e)}" for e in elements or []}
+            columns.append([self._vocabulary.setdefault(feature, len(self._vocabulary)) for feature in features])
+
+        start = len(self._story_ids)
+        block = np.zeros((len(rows), len(self._vocabulary)), dtype=np.float32)
+        for i, cols in enumerate(columns):
+            if cols:
+                block[i, cols] = 1.0 / np.sqrt(len(cols))
+        grown = np.zeros((start, len(self._vocabulary)), dtype=np.float32)
+        grown[:, :self._features.shape[1]] = self._features
+        self._features = np.vstack([grown, block])
+
+        for offset, (story_id, user_id, _, _) in enumerate(rows):
+            self._story_rows[story_id] = start + offset
+            self._story_ids.append(story_id)
+            self._library[user_id].append(start + offset)
+            dirty.update(self._children.get(user_id, ()))
+            for child_id, weight in self._pending.pop(story_id, ()):
+                self._interact(child_id, start + offset, weight)
+                dirty.add(child_id)
+        return len(rows)
+
+    def _fold_listens(self, conn, upper: str, dirty: Set[str]) -> int:
+        listens = ListeningHistory.__table__
+        rows = conn.execute(
+            select(listens.c.child_id, listens.c.story_id, listens.c.completion_rate, listens.c.engagement_score)
+            .where(*self._window(listens, upper))
+        ).all()
+        for child_id, story_id, completion_rate, engagement_score in rows:
+            weight = listen_weight(completion_rate, engagement_score)
+            row = self._story_rows.get(story_id)
+            if row is None:
+                self._pending[story_id].append((child_id, weight))
+                continue
+            self._interact(child_id, row, weight)
+            dirty.add(child_id)
+        return len(rows)
+
+    def _interact(self, child_id: str, row: int, weight: float):
+        interactions = self._interactions[child_id]
+        interactions[row] = interactions.get(row, 0.0) + weight
+
+    def _rank(self, child_id: str) -> List[Tuple[str, float]]:
+        interactions = self._interactions.get(child_id, {})
+        # Newest first, so the stable sort breaks ties (and a cold start) by recency
+        library = self._library.get(self._parents.get(child_id), [])[::-1]
+        candidates = np.array([row for row in library if row not in interactions], dtype=np.int64)
+        if not len(candidates):
+            return []
+        if interactions:
+            heard = np.fromiter(interactions.keys(), dtype=np.int64, count=len(interactions))
+            weights = np.fromiter(interactions.values(), dtype=np.float32, count=len(interactions))
+            profile = weights @ self._features[heard]
+            scores = self._features[candidates] @ profile
+        else:
+            scores = np.zeros(len(candidates), dtype=np.float32)
+        order = np.argsort(-scores, kind="stable")[:self.top_k]
+        return [(self._story_ids[candidates[i]], round(float(scores[i]), 4)) for i in order]
+
+    def recommend(self, child_id: str, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Precomputed recommendations for a child, best first"""
+        with self._lock:
+            top = self._top.get(child_id, [])
+        return [{"story_id": story_id, "score": score} for story_id, score in top[:limit or self.top_k]]
+
+    def cold_start(self, conn, child_id: str, parent_id: str, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Newest unheard family-library stories, for a child not folded in yet"""
+        stories = Story.__table__
+        listens = ListeningHistory.__table__
+        heard = select(listens.c.story_id).where(listens.c.child_id == child_id)
+        story_ids = conn.execute(
+            select(stories.c.id)
+            .where(stories.c.user_id == parent_id, stories.c.id.not_in(heard))
+            .order_by(stories.c.created_at.desc(), stories.c.id.desc())
+            .limit(limit or self.top_k)
+        ).scalars()
+        return [{"story_id": story_id, "score": 0.0} for story_id in story_ids]
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "stories": len(self._story_ids),
+                "features": len(self._vocabulary),
+                "children": len(self._parents),
+                "interactions": sum(len(row) for row in self._interactions.values()),
+                "rows": dict(self._rows),
+                "refreshed_at": self.refreshed_at.isoformat() if self.refreshed_at else None,
+            }
+
+    def get(self, conn, child_id: str, parent_id: str, limit: Optional[int] = None,
+            max_age: Optional[float] = None) -> List[Dict[str, Any]]:
+        """Recommendations for a child, refreshed first if older than `max_age` seconds"""
+        max_age = self.refresh_interval if max_age is None else max_age
+        if self.refreshed_at is None or (datetime.now() - self.refreshed_at).total_seconds() >= max_age:
+            self.refresh(conn)
+        if child_id not in self._parents:
+            return self.cold_start(conn, child_id, parent_id, limit)
+        return self.recommend(child_id, limit)
+
+
+recommender = StoryRecommender()
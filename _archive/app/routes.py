@@ -2,15 +2,18 @@
 API Routes for AtaMind
 """
 
-from fastapi import APIRouter, Depends, HTTPException, UploadFile, File
+from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Query
 from sqlalchemy.orm import Session
-from typing import List
-import uuid
+from typing import List, Optional
 from datetime import datetime
+from uuid import UUID
 
 from .database import get_db
 from .auth import mock_get_current_user
 from .models import *
+from .ids import new_id
+from .json_queries import stories_teaching, children_with_interest
+from . import story_search
 
 # Authentication routes
 auth_router = APIRouter()
@@ -37,7 +40,7 @@ async def create_child(
     db: Session = Depends(get_db)
 ):
     """Create a new child profile"""
-    child_id = str(uuid.uuid4())
+    child_id = new_id()
     
     db_child = Child(
         id=child_id,
@@ -66,11 +69,15 @@ async def create_child(
 
 @children_router.get("/", response_model=List[ChildResponse])
 async def get_children(
+    interest: Optional[List[str]] = Query(None),
     current_user: dict = Depends(mock_get_current_user),
     db: Session = Depends(get_db)
 ):
-    """Get all children for current user"""
-    children = db.query(Child).filter(Child.parent_id == current_user["id"]).all()
+    """Get all children for current user, optionally only those with all given interests"""
+    if interest:
+        children = children_with_interest(db, interest, parent_id=current_user["id"]).all()
+    else:
+        children = db.query(Child).filter(Child.parent_id == current_user["id"]).all()
     
     return [ChildResponse(
         id=child.id,
@@ -85,13 +92,13 @@ async def get_children(
 
 @children_router.get("/{child_id}", response_model=ChildResponse)
 async def get_child(
-    child_id: str,
+    child_id: UUID,
     current_user: dict = Depends(mock_get_current_user),
     db: Session = Depends(get_db)
 ):
     """Get specific child"""
     child = db.query(Child).filter(
-        Child.id == child_id,
+        Child.id == str(child_id),
         Child.parent_id == current_user["id"]
     ).first()
     
@@ -114,11 +121,20 @@ stories_router = APIRouter()
 
 @stories_router.get("/", response_model=List[StoryResponse])
 async def get_stories(
+    value: Optional[List[str]] = Query(None),
+    child_id: Optional[UUID] = None,
     current_user: dict = Depends(mock_get_current_user),
     db: Session = Depends(get_db)
 ):
-    """Get all stories for current user"""
-    stories = db.query(Story).filter(Story.user_id == current_user["id"]).all()
+    """Get all stories for current user, optionally only those teaching all given values"""
+    child_id = str(child_id) if child_id else None
+    if value:
+        stories = stories_teaching(db, value, user_id=current_user["id"], child_id=child_id).all()
+    else:
+        query = db.query(Story).filter(Story.user_id == current_user["id"])
+        if child_id:
+            query = query.filter(Story.child_id == child_id)
+        stories = query.all()
     
     return [StoryResponse(
         id=story.id,
@@ -133,15 +149,35 @@ async def get_stories(
         created_at=story.created_at
     ) for story in stories]
 
+@stories_router.get("/search")
+async def search_stories(
+    q: str,
+    child_id: Optional[UUID] = None,
+    page: int = Query(1, ge=1),
+    page_size: int = Query(10, ge=1, le=50),
+    current_user: dict = Depends(mock_get_current_user),
+    db: Session = Depends(get_db)
+):
+    """Ranked full-text search over the current user's stories"""
+    total, hits = story_search.search_stories(db, q, user_id=current_user["id"],
+                                              child_id=str(child_id) if child_id else None, page=page, page_size=page_size)
+    return {
+        "query": q,
+        "total": total,
+        "page": page,
+        "page_size": page_size,
+        "results": [story_search.story_hit(story, rank) for story, rank in hits],
+    }
+
 @stories_router.get("/{story_id}", response_model=StoryResponse)
 async def get_story(
-    story_id: str,
+    story_id: UUID,
     current_user: dict = Depends(mock_get_current_user),
     db: Session = Depends(get_db)
 ):
     """Get specific story"""
     story = db.query(Story).filter(
-        Story.id == story_id,
+        Story.id == str(story_id),
         Story.user_id == current_user["id"]
     ).first()
     
@@ -206,15 +242,14 @@ async def save_voice_recording(
     """Save voice recording to database"""
     
     # Save file
-    file_path = f"uploads/voice_{current_user['id']}_{datetime.now().timestamp()}_{file.filename}"
+    recording_id = new_id()
+    file_path = f"uploads/voice_{recording_id}_{file.filename}"
     
     with open(file_path, "wb") as buffer:
         content = await file.read()
         buffer.write(content)
     
     # Save to database
-    recording_id = str(uuid.uuid4())
-    
     db_recording = VoiceRecording(
         id=recording_id,
         user_id=current_user["id"],
@@ -0,0 +1,85 @@
+"""
+Session registry - In-process map of open usage sessions
+
+Holds child -> open session id and a per-session activities_completed counter,
+so counting a rating is a memory increment instead of a query and an UPDATE.
+Counters are written to the database when the session ends. Writers change
+the registry only after their transaction commits (count() to read a counter
+for the closing UPDATE, closed() once it is durable), so a rollback never
+leaves it ahead of the database.
+
+The map is per process: a child whose session was opened before a restart or
+by another worker is looked up in the database once and then tracked here.
+"""
+
+import threading
+from typing import Dict, Optional, Tuple
+
+from sqlalchemy import select
+
+
+class SessionRegistry:
+    """child_id -> open session, with in-memory activity counters"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._by_child: Dict[str, str] = {}
+        self._sessions: Dict[str, Tuple[str, int]] = {}  # session_id -> (child_id, activities)
+
+    def __len__(self) -> int:
+        return len(self._sessions)
+
+    def opened(self, child_id: str, session_id: str, activities: int = 0):
+        with self._lock:
+            # A newer session takes over the child; an older one keeps its counter until closed
+            self._by_child[child_id] = session_id
+            self._sessions[session_id] = (child_id, activities)
+
+    def lookup(self, child_id: str) -> Optional[str]:
+        return self._by_child.get(child_id)
+
+    def count(self, session_id: str) -> Optional[int]:
+        entry = self._sessions.get(session_id)
+        return entry[1] if entry else None
+
+    def increment(self, child_id: str, n: int = 1) -> Optional[str]:
+        """Add n activities to the child's open session; None if the child is not tracked"""
+        with self._lock:
+            session_id = self._by_child.get(child_id)
+            if session_id is None:
+                return None
+            _, activities = self._sessions[session_id]
+            self._sessions[session_id] = (child_id, activities + n)
+            return session_id
+
+    def closed(self, session_id: str) -> Optional[int]:
+        """Forget the session; returns its counter, or None if it was not tracked"""
+        with self._lock:
+            entry = self._sessions.pop(session_id, None)
+            if entry is None:
+                return None
+            child_id, activities = entry
+            if self._by_child.get(child_id) == session_id:
+                del self._by_child[child_id]
+            return activities
+
+    def load_open_sessions(self, conn, child_ids) -> Dict[str, str]:
+        """DB fallback: track the latest open session of each untracked child"""
+        from .models import UsageSession
+        sessions = UsageSession.__table__
+        missing = [c for c in set(child_ids) if c not in self._by_child]
+        found: Dict[str, Tuple[str, object, int]] = {}
+        if missing:
+            rows = conn.execute(
+                select(sessions.c.id, sessions.c.child_id, sessions.c.session_start, sessions.c.activities_completed)
+                .where(sessions.c.child_id.in_(missing), sessions.c.session_end.is_(None))
+            )
+            for session_id, child_id, started, activities in rows:
+                if child_id not in found or started > found[child_id][1]:
+                    found[child_id] = (session_id, started, activities or 0)
+            for child_id, (session_id, _, activities) in found.items():
+                self.opened(child_id, session_id, activities)
+        return {child_id: entry[0] for child_id, entry in found.items()}
+
+
+registry = SessionRegistry()
@@ -0,0 +1,104 @@
+"""
+Story search - Ranked full-text search over the story library
+
+Stories carry a `search_document` of folded, stemmed terms
+(app.turkish_text.search_document, filled by the column default). Queries go
+through the same tokenizer and every term must match as a prefix:
+
+- PostgreSQL: to_tsvector('simple', search_document) @@ to_tsquery, backed by
+  the ix_stories_search_document GIN index, ranked by ts_rank
+- SQLite: the stories_fts FTS5 table (models.STORY_FTS_DDL), ranked by bm25
+"""
+
+from typing import Dict, List, Any, Optional, Tuple
+
+from sqlalchemy import bindparam, column, func, literal_column, select, table, text, update
+
+from .models import Story
+from .tracing import span
+from .turkish_text import tokens, search_document
+
+SIMPLE = literal_column("'simple'")
+STORIES_FTS = table("stories_fts", column("rowid"))
+EXCERPT_CHARS = 240
+
+
+def _tsquery(terms: List[str]) -> str:
+    return " & ".join(f"{term}:*" for term in terms)
+
+
+def _fts_query(terms: List[str]) -> str:
+    return " AND ".join(f'"{term}"*' for term in terms)
+
+
+def search_stories(db, query: str, user_id: Optional[str] = None, child_id: Optional[str] = None,
+                   page: int = 1, page_size: int = 10) -> Tuple[int, List[Tuple[Story, float]]]:
+    """(total matches, one page of (story, rank)), best match first"""
+    terms = tokens(query)
+    if not terms:
+        return 0, []
+    dialect = db.get_bind().dialect.name
+    with span("stories.search", terms=len(terms), dialect=dialect) as current:
+        if dialect == "postgresql":
+            document = func.to_tsvector(SIMPLE, Story.search_document)
+            tsquery = func.to_tsquery(SIMPLE, _tsquery(terms))
+            rank = func.ts_rank(document, tsquery)
+            base = db.query(Story).filter(document.op("@@")(tsquery))
+            order = rank.desc()
+        else:
+            rank = literal_column("bm25(stories_fts)")
+            base = (
+                db.query(Story)
+                .join(STORIES_FTS, STORIES_FTS.c.rowid == literal_column("stories.rowid"))
+                .filter(text("stories_fts MATCH :match"))
+                .params(match=_fts_query(terms))
+            )
+            order = rank  # bm25: lower is better
+        if user_id is not None:
+            base = base.filter(Story.user_id == user_id)
+        if child_id is not None:
+            base = base.filter(Story.child_id == child_id)
+        total = base.count()
+        rows = (
+            base.add_columns(rank.label("rank"))
+            .order_by(order, Story.created_at.desc())
+            .limit(page_size)
+            .offset((page - 1) * page_size)
+            .all()
+        )
+        current.set_attribute("total", total)
+    return total, [(story, float(rank_value or 0)) for story, rank_value in rows]
+
+
+def story_hit(story: Story, rank: float) -> Dict[str, Any]:
+    """Search result entry: story summary with an excerpt instead of the full text"""
+    return {
+        "id": story.id,
+        "title": story.title,
+        "excerpt": (story.content or "").strip()[:EXCERPT_CHARS],
+        "values_taught": story.values_taught or [],
+        "cultural_elements": story.cultural_elements or [],
+        "difficulty_level": story.difficulty_level,
+        "created_at": story.created_at,
+        "rank": rank,
+    }
+
+
+def reindex_stories(db, only_missing: bool = True) -> int:
+    """Recompute search_document (e.g. for rows written before the column existed)"""
+    stories = Story.__table__
+    query = select(stories.c.id, stories.c.title, stories.c.content, stories.c.values_taught, stories.c.cultural_elements)
+    if only_missing:
+        query = query.where(stories.c.search_document.is_(None))
+    conn = db.connection()
+    rows = conn.execute(query).all()
+    if rows:
+        conn.execute(
+            update(stories)
+            .where(stories.c.id == bindparam("b_id", type_=stories.c.id.type))
+            .values(search_document=bindparam("b_document")),
+            [{"b_id": row.id, "b_document": search_document(row.title, row.content, row.values_taught, row.cultural_elements)}
+             for row in rows],
+        )
+    db.commit()
+    return len(rows)
@@ -0,0 +1,365 @@
+"""
+Tracing - Lightweight OpenTelemetry-style spans for AtaMind pipelines
+
+Spans nest through a context variable, so child spans created inside asyncio
+tasks (asyncio.gather) attach to the span that was current when the task was
+created. Finished spans go to the configured exporter:
+
+    TRACE_EXPORTER=none        spans are timed but not exported (default)
+    TRACE_EXPORTER=stdout      one JSON line per span
+    TRACE_EXPORTER=collector   batched OTLP/HTTP JSON to TRACE_COLLECTOR_URL
+
+Trace ids follow W3C Trace Context so they can be propagated with the
+`traceparent` header.
+"""
+
+import functools
+import inspect
+import json
+import os
+import queue
+import secrets
+import sys
+import threading
+import time
+import urllib.request
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, List, Any, Optional
+
+from .ai_agents.developmental_stages import stage_key
+
+SERVICE_NAME = os.getenv("TRACE_SERVICE_NAME", "atamind-api")
+DEFAULT_COLLECTOR_URL = "http://localhost:4318/v1/traces"
+
+_current_span: ContextVar[Optional["Span"]] = ContextVar("current_span", default=None)
+
+
+class Span:
+    """One timed operation within a trace"""
+
+    def __init__(self, name: str, trace_id: str, parent_id: Optional[str] = None, attributes: Optional[Dict[str, Any]] = None):
+        self.name = name
+        self.trace_id = trace_id
+        self.span_id = secrets.token_hex(8)
+        self.parent_id = parent_id
+        self.attributes: Dict[str, Any] = {}
+        self.set_attributes(**(attributes or {}))
+        self.status = "ok"
+        self.error: Optional[str] = None
+        self.start_ns = time.time_ns()
+        self.end_ns: Optional[int] = None
+
+    def set_attribute(self, key: str, value: Any):
+        if value is not None:
+            self.attributes[key] = value
+
+    def set_attributes(self, **attributes):
+        for key, value in attributes.items():
+            self.set_attribute(key, value)
+
+    def record_exception(self, error: BaseException):
+        self.status = "error"
+        self.error = f"{type(error).__name__}: {error}"
+
+    def end(self, end_ns: Optional[int] = None):
+        if self.end_ns is None:
+            self.end_ns = end_ns or time.time_ns()
+            _exporter.export(self)
+
+    @property
+    def duration_ms(self) -> Optional[float]:
+        return (self.end_ns - self.start_ns) / 1e6 if self.end_ns else None
+
+    @property
+    def traceparent(self) -> str:
+        return f"00-{self.trace_id}-{self.span_id}-01"
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "service": SERVICE_NAME,
+            "name": self.name,
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "start_ns": self.start_ns,
+            "end_ns": self.end_ns,
+            "duration_ms": self.duration_ms,
+            "status": self.status,
+            "error": self.error,
+            "attributes": self.attributes,
+        }
+
+
+# Exporters
+
+class NoopExporter:
+    def export(self, span: Span):
+        pass
+
+
+class StdoutExporter:
+    """Writes each finished span as one JSON line"""
+
+    def __init__(self, stream=None):
+        self.stream = stream or sys.stdout
+        self._lock = threading.Lock()
+
+    def export(self, span: Span):
+        line = json.dumps(span.to_dict(), ensure_ascii=False, default=str)
+        with self._lock:
+            self.stream.write(line + "\n")
+            self.stream.flush()
+
+
+class CollectorExporter:
+    """Batches spans and posts them to an OTLP/HTTP JSON collector endpoint"""
+
+    def __init__(self, url: str = DEFAULT_COLLECTOR_URL, batch_size: int = 100, flush_interval: float = 2.0):
+        self.url = url
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._queue: "queue.Queue[Span]" = queue.Queue(maxsize=10000)
+        self._thread = threading.Thread(target=self._run, name="trace-exporter", daemon=True)
+        self._thread.start()
+
+    def export(self, span: Span):
+        try:
+            self._queue.put_nowait(span)
+        except queue.Full:
+            pass  # Dropping spans is preferable to blocking requests
+
+    def _run(self):
+        while True:
+            batch = [self._queue.get()]
+            deadline = time.monotonic() + self.flush_interval
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(self._queue.get(timeout=max(deadline - time.monotonic(), 0)))
+                except queue.Empty:
+                    break
+            self._post(batch)
+
+    @staticmethod
+    def _otlp_value(value: Any) -> Dict[str, Any]:
+        if isinstance(value, bool):
+            return {"boolValue": value}
+        if isinstance(value, int):
+            return {"intValue": str(value)}
+        if isinstance(value, float):
+            return {"doubleValue": value}
+        return {"stringValue": str(value)}
+
+    def _payload(self, spans: List[Span]) -> Dict[str, Any]:
+        return {"resourceSpans": [{
+            "resource": {"attributes": [{"key": "service.name", "value": {"stringValue": SERVICE_NAME}}]},
+            "scopeSpans": [{
+                "scope": {"name": "app.tracing"},
+                "spans": [{
+                    "traceId": span.trace_id,
+                    "spanId": span.span_id,
+                    "parentSpanId": span.parent_id or "",
+                    "name": span.name,
+                    "kind": 1,
+                    "startTimeUnixNano": str(span.start_ns),
+                    "endTimeUnixNano": str(span.end_ns),
+                    "attributes": [{"key": k, "value": self._otlp_value(v)} for k, v in span.attributes.items()],
+                    "status": {"code": 2, "message": span.error} if span.status == "error" else {"code": 1},
+                } for span in spans],
+            }],
+        }]}
+
+    def _post(self, spans: List[Span]):
+        request = urllib.request.Request(
+            self.url,
+            data=json.dumps(self._payload(spans), default=str).encode("utf-8"),
+            headers={"Content-Type": "application/json"},
+            method="POST",
+        )
+        try:
+            urllib.request.urlopen(request, timeout=5).close()
+        except Exception as e:
+            print(f"Trace export error: {e}")
+
+
+def _exporter_from_env():
+    name = os.getenv("TRACE_EXPORTER", "none").lower()
+    if name == "collector":
+        return CollectorExporter(os.getenv("TRACE_COLLECTOR_URL", DEFAULT_COLLECTOR_URL))
+    if name == "stdout":
+        return StdoutExporter()
+    return NoopExporter()
+
+
+_exporter = _exporter_from_env()
+
+
+def set_exporter(exporter):
+    """Replace the exporter, e.g. to collect spans in benchmarks"""
+    global _exporter
+    _exporter = exporter
+
+
+# Span API
+
+def current_span() -> Optional[Span]:
+    return _current_span.get()
+
+
+def start_span(name: str, parent: Optional[Span] = None, trace_id: Optional[str] = None, parent_id: Optional[str] = None, **attributes) -> Span:
+    """Create a span without making it current; call end() when done"""
+    parent = parent or _current_span.get()
+    if parent is not None:
+        trace_id, parent_id = parent.trace_id, parent.span_id
+    return Span(name, trace_id or secrets.token_hex(16), parent_id, attributes)
+
+
+@contextmanager
+def span(name: str, **attributes):
+    """Run a block inside a child span of the current span"""
+    current = start_span(name, **attributes)
+    token = _current_span.set(current)
+    try:
+        yield current
+    except BaseException as e:
+        current.record_exception(e)
+        raise
+    finally:
+        _current_span.reset(token)
+        current.end()
+
+
+def traced(name: Optional[str] = None, **attributes):
+    """Decorator that wraps a sync or async function in a span"""
+    def decorator(func):
+        span_name = name or func.__qualname__
+
+        if inspect.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                with span(span_name, **attributes):
+                    return await func(*args, **kwargs)
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with span(span_name, **attributes):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def record_usage(target: Optional[Span], response) -> None:
+    """Copy token counts from a Gemini or OpenAI response onto a span"""
+    if target is None:
+        return
+    usage = getattr(response, "usage_metadata", None)
+    if usage is not None:
+        target.set_attributes(
+            prompt_tokens=getattr(usage, "prompt_token_count", None),
+            completion_tokens=getattr(usage, "candidates_token_count", None),
+        )
+        return
+    usage = getattr(response, "usage", None)
+    if usage is not None:
+        target.set_attributes(
+            prompt_tokens=getattr(usage, "prompt_tokens", None),
+            completion_tokens=getattr(usage, "completion_tokens", None),
+        )
+
+
+def age_band(age: Optional[int]) -> Optional[str]:
+    """Age band attribute: the psychology agents' developmental stage (stage_key)"""
+    return None if age is None else stage_key(int(age))
+
+
+# W3C trace context
+
+def parse_traceparent(header: Optional[str]):
+    """(trace_id, parent_span_id) from a traceparent header, or (None, None)"""
+    try:
+        version, trace_id, span_id, _flags = (header or "").strip().split("-")
+    except ValueError:
+        return None, None
+    if len(trace_id) != 32 or len(span_id) != 16 or trace_id == "0" * 32 or version == "ff":
+        return None, None
+    try:
+        int(trace_id, 16), int(span_id, 16)
+    except ValueError:
+        return None, None
+    return trace_id.lower(), span_id.lower()
+
+
+class TracingMiddleware:
+    """ASGI middleware: one server span per HTTP request, traceparent in and out"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        headers = {key.decode("latin-1"): value.decode("latin-1") for key, value in scope.get("headers", [])}
+        trace_id, parent_id = parse_traceparent(headers.get("traceparent"))
+        request_span = start_span(
+            f"{scope['method']} {scope['path']}",
+            trace_id=trace_id,
+            parent_id=parent_id,
+            **{"http.method": scope["method"], "http.target": scope["path"]},
+        )
+        token = _current_span.set(request_span)
+
+        async def send_with_trace(message):
+            if message["type"] == "http.response.start":
+                request_span.set_attribute("http.status_code", message["status"])
+                if message["status"] >= 500:
+                    request_span.status = "error"
+                message.setdefault("headers", [])
+                message["headers"] = list(message["headers"]) + [
+                    (b"traceparent", request_span.traceparent.encode("latin-1")),
+                ]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_trace)
+        except BaseException as e:
+            request_span.record_exception(e)
+            raise
+        finally:
+            _current_span.reset(token)
+            request_span.end()
+
+
+# SQLAlchemy
+
+def instrument_engine(engine) -> None:
+    """Emit a db.query span for every statement executed on the engine"""
+    from sqlalchemy import event
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _before(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("trace_query_start", []).append(time.time_ns())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _after(conn, cursor, statement, parameters, context, executemany):
+        started = conn.info["trace_query_start"].pop()
+        if _current_span.get() is None:
+            return  # Only trace queries that belong to a traced request or pipeline
+        query = start_span(
+            "db.query",
+            **{
+                "db.system": engine.dialect.name,
+                "db.statement": statement[:500],
+                "db.operation": statement.split(None, 1)[0].upper() if statement else None,
+                "db.rows": cursor.rowcount if cursor.rowcount >= 0 else None,
+            },
+        )
+        query.start_ns = started
+        query.end()
+
+    @event.listens_for(engine, "handle_error")
+    def _error(context):
+        stack = context.connection.info.get("trace_query_start") if context.connection is not None else None
+        if stack:
+            stack.pop()
@@ -0,0 +1,80 @@
+"""
+Turkish text - Folding and light stemming for the story search index
+
+fold() lowercases with Turkish rules (I -> ı, İ -> i), folds ç ğ ı ö ş ü to
+ASCII and turns punctuation into spaces, so "SAYGI", "Saygı" and "saygi"
+match. stem() strips common inflectional suffixes and devoices the final
+consonant, so "saygıyı", "kitabı" and "rengi" index as "sayk", "kitap" and
+"renk"; suffixes after an apostrophe ("Keloğlan'ın") are dropped. Documents
+and queries go through the same functions, which is what makes matches line
+up; the stems need not be real words.
+
+The Streamlit app indexes its local story store with kokogretim.search. The
+backend keeps its own copy rather than importing across deployables; both
+are tested against the cases in tests/search_terms.json, so they produce the
+same terms for the same text.
+"""
+
+import re
+import unicodedata
+from typing import Iterable, List, Optional
+
+# Applied with str.replace, which beats a str.translate table on story-length text
+_LOWER = (("I", "ı"), ("İ", "i"))
+_FOLD = (("ç", "c"), ("ğ", "g"), ("ı", "i"), ("ö", "o"), ("ş", "s"), ("ü", "u"), ("â", "a"), ("î", "i"), ("û", "u"))
+_NON_WORD = re.compile(r"[^a-z0-9]+")
+_APOSTROPHE_SUFFIX = re.compile(r"['’]\w+")
+
+# Longest first; written in folded form
+_SUFFIXES = sorted({
+    "lerinden", "larindan", "lerinde", "larinda", "lerine", "larina", "lerini", "larini",
+    "lerin", "larin", "leri", "lari", "ler", "lar",
+    "ndan", "nden", "dan", "den", "tan", "ten", "nda", "nde", "da", "de", "ta", "te",
+    "nin", "nun", "yla", "yle", "ya", "ye", "yi", "yu", "in", "un",
+    "si", "su", "na", "ne", "ni", "nu", "i", "u", "a", "e",
+}, key=len, reverse=True)
+_DEVOICE = {"b": "p", "d": "t", "g": "k"}
+MIN_STEM = 3
+
+STOPWORDS = frozenset({
+    "ve", "ile", "bir", "bu", "su", "o", "da", "de", "ki", "mi", "mu", "icin", "gibi",
+    "cok", "ama", "ya", "ne", "en", "daha", "her", "olan", "diye",
+})
+
+
+def fold(text: Optional[str]) -> str:
+    """Turkish lowercase, ASCII-folded, punctuation replaced by single spaces"""
+    text = _APOSTROPHE_SUFFIX.sub("", text or "")
+    if not text.isascii():
+        text = unicodedata.normalize("NFC", text)
+    for upper, lower in _LOWER:
+        text = text.replace(upper, lower)
+    text = text.lower()
+    if not text.isascii():
+        for letter, ascii_letter in _FOLD:
+            text = text.replace(letter, ascii_letter)
+    return " ".join(_NON_WORD.sub(" ", text).split())
+
+
+def stem(word: str) -> str:
+    """Strip up to three suffixes (keeping MIN_STEM letters) and devoice the last consonant"""
+    for _ in range(3):
+        for suffix in _SUFFIXES:
+            if word.endswith(suffix) and len(word) - len(suffix) >= MIN_STEM:
+                word = word[:-len(suffix)]
+                break
+        else:
+            break
+    return word[:-1] + _DEVOICE[word[-1]] if word[-1] in _DEVOICE else word
+
+
+def tokens(text: Optional[str]) -> List[str]:
+    """Stemmed search terms of a text, stopwords and single letters dropped"""
+    return [stem(word) for word in fold(text).split() if len(word) > 1 and word not in STOPWORDS]
+
+
+def search_document(title: Optional[str], content: Optional[str], values: Optional[Iterable[str]] = None,
+                    cultural_elements: Optional[Iterable[str]] = None) -> str:
+    """Indexed text of a story: title, values, cultural elements, then content"""
+    parts = [title, " ".join(values or []), " ".join(cultural_elements or []), content]
+    return " ".join(term for part in parts for term in tokens(part))
@@ -0,0 +1,3 @@
+"""
+Benchmarks for the AtaMind pipelines, driven by a deterministic stub LLM
+"""
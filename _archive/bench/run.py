@@ -0,0 +1,274 @@
+"""
+Benchmark runner for the AtaMind story, voice and report pipelines
+
+Run from the _archive directory:
+
+    python -m bench.run --requests 50 --concurrency 10 --output bench.json
+    python -m bench.run --route-latency story=lognormal:2500,0.4 --error-rate 0.02
+    python -m bench.run --baseline bench.json     # adds a comparison section
+
+All LLM and TTS calls go to the seeded stub in bench.stub_llm, so two runs with
+the same arguments drive the same latencies and failures. Per-stage numbers
+come from the spans emitted by app.tracing.
+"""
+
+import argparse
+import asyncio
+import contextlib
+import json
+import os
+import platform
+import shutil
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Dict, List, Any, Optional
+
+import numpy as np
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app import tracing
+from app.ids import new_id, uuid7_at
+from app.models import Base, User, Child, UsageSession, ActivityRating
+from .stub_llm import StubLLM, patched_llms
+
+SCENARIOS = ("story", "voice", "report")
+BENCH_EPOCH = datetime(2025, 1, 1)
+PARENT_MESSAGE = (
+    "Çocuğumun büyüklerine saygı göstermesini ve her zaman dürüst olmasını istiyorum. "
+    "Ailemizin değerlerini öğrenmesi çok önemli."
+)
+
+
+class CollectingExporter:
+    """Keeps finished spans in memory for the stage breakdown"""
+
+    def __init__(self):
+        self.spans: List[tracing.Span] = []
+
+    def export(self, span: tracing.Span):
+        self.spans.append(span)
+
+
+def percentiles(values: List[float]) -> Dict[str, Optional[float]]:
+    if not values:
+        return {"p50": None, "p95": None, "p99": None, "mean": None}
+    p50, p95, p99 = np.percentile(values, [50, 95, 99])
+    return {"p50": round(float(p50), 2), "p95": round(float(p95), 2), "p99": round(float(p99), 2), "mean": round(float(np.mean(values)), 2)}
+
+
+def stage_breakdown(spans: List[tracing.Span], root: str) -> Dict[str, Any]:
+    """Latency per span name below the scenario root, with share of root time"""
+    root_total = sum(s.duration_ms for s in spans if s.name == root) or 1
+    stages: Dict[str, List[float]] = {}
+    for span in spans:
+        if span.name != root:
+            stages.setdefault(span.name, []).append(span.duration_ms)
+    return {
+        name: {
+            "count": len(durations),
+            **percentiles(durations),
+            "share": round(sum(durations) / root_total, 4),
+        }
+        for name, durations in sorted(stages.items(), key=lambda item: -sum(item[1]))
+    }
+
+
+# Fixtures
+
+def seed_database(db_url: str, children: int, days: int = 14, sessions_per_day: int = 2, ratings_per_session: int = 3):
+    """Create the schema and a parent with `children` children and two weeks of activity"""
+    engine = create_engine(db_url)
+    tracing.instrument_engine(engine)
+    Base.metadata.create_all(bind=engine)
+    Session = sessionmaker(bind=engine, autoflush=False)
+
+    now = datetime.now()
+    with Session() as db:
+        db.add(User(id="bench_parent", email="bench@example.com", first_name="Bench"))
+        for c in range(children):
+            child_id = bench_child_id(c)
+            db.add(Child(id=child_id, parent_id="bench_parent", name="Ayşe", age=3 + c % 10,
+                         interests=["hayvanlar", "müzik"], learning_style="visual",
+                         personality_traits={"meraklı": True}))
+            for d in range(days):
+                for s in range(sessions_per_day):
+                    start = now - timedelta(days=d, hours=3 * s + 1)
+                    db.add(UsageSession(id=new_id(), child_id=child_id, parent_id="bench_parent",
+                                        session_start=start, session_end=start + timedelta(minutes=20),
+                                        duration_minutes=20, activities_completed=ratings_per_session, average_rating=4))
+                    for r in range(ratings_per_session):
+                        db.add(ActivityRating(id=new_id(), child_id=child_id,
+                                              activity_type=("story", "voice_message", "game")[r % 3],
+                                              activity_id=f"activity_{r}", rating=1 + (d + s + r) % 5,
+                                              rated_at=start + timedelta(minutes=5 * r)))
+        db.commit()
+    return Session
+
+
+def bench_child_id(index: int) -> str:
+    """Same id for the same index in every run"""
+    return str(uuid7_at(BENCH_EPOCH + timedelta(milliseconds=index), index))
+
+
+def bench_child(index: int) -> Child:
+    return Child(id=bench_child_id(index), parent_id="bench_parent", name="Ayşe", age=3 + index % 10,
+                 interests=["hayvanlar", "müzik"], learning_style="visual",
+                 personality_traits={"meraklı": True}, cultural_background="Turkish")
+
+
+# Scenarios
+
+async def run_scenario(name: str, requests: int, concurrency: int, make_call) -> Dict[str, Any]:
+    """Drive `make_call(i)` coroutines with bounded concurrency"""
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies: List[float] = []
+    errors: Dict[str, int] = {}
+
+    async def one(i: int):
+        async with semaphore:
+            started = time.perf_counter()
+            try:
+                await make_call(i)
+            except Exception as e:
+                key = type(e).__name__
+                errors[key] = errors.get(key, 0) + 1
+                return
+            latencies.append((time.perf_counter() - started) * 1000)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(one(i) for i in range(requests)))
+    wall = time.perf_counter() - started
+    return {
+        "requests": requests,
+        "concurrency": concurrency,
+        "succeeded": len(latencies),
+        "errors": errors,
+        "wall_seconds": round(wall, 3),
+        "throughput_rps": round(len(latencies) / wall, 3) if wall else None,
+        "latency_ms": percentiles(latencies),
+    }
+
+
+def scenario_factories(session_factory, workdir: Path, children: int):
+    from app.ai_agents.orchestrator import AIOrchestrator
+    from app.ai_agents.voice_agent import VoiceAgent
+    from app.analytics import AnalyticsEngine
+
+    orchestrator = AIOrchestrator()
+    voice = VoiceAgent()
+    voice_file = workdir / "uploads" / "bench_voice.webm"
+    voice_file.write_bytes(b"\x00" * 4096)
+
+    async def story(i: int):
+        with tracing.span("bench.story"):
+            await orchestrator.generate_story(bench_child(i % children), PARENT_MESSAGE, "bench_parent")
+
+    async def voice_analysis(i: int):
+        with tracing.span("bench.voice"):
+            await voice.analyze_voice_file(str(voice_file))
+
+    async def report(i: int):
+        with tracing.span("bench.report"):
+            with session_factory() as db:
+                # force: measure the full pipeline rather than report reuse
+                await AnalyticsEngine(db).generate_biweekly_report(bench_child_id(i % children), "bench_parent", force=True)
+
+    return {"story": story, "voice": voice_analysis, "report": report}
+
+
+def compare(current: Dict[str, Any], baseline: Dict[str, Any]) -> Dict[str, Any]:
+    """Relative change of throughput and latency percentiles against a baseline run"""
+    def change(new, old):
+        return round((new - old) / old, 4) if new is not None and old else None
+
+    result = {}
+    for name, scenario in current["scenarios"].items():
+        before = baseline.get("scenarios", {}).get(name)
+        if not before:
+            continue
+        result[name] = {
+            "throughput_rps": change(scenario["throughput_rps"], before["throughput_rps"]),
+            **{f"latency_{p}": change(scenario["latency_ms"][p], before["latency_ms"][p]) for p in ("p50", "p95", "p99")},
+        }
+    return result
+
+
+async def run(args) -> Dict[str, Any]:
+    route_latency = dict(item.split("=", 1) for item in args.route_latency)
+    stub = StubLLM(args.latency, route_latency, args.error_rate, args.unsafe_rate, args.seed)
+    exporter = CollectingExporter()
+    tracing.set_exporter(exporter)
+
+    workdir = Path(tempfile.mkdtemp(prefix="atamind-bench-"))
+    (workdir / "uploads").mkdir()
+    session_factory = seed_database(f"sqlite:///{workdir / 'bench.db'}", args.children)
+
+    results = {}
+    cwd = os.getcwd()
+    os.chdir(workdir)  # the orchestrator writes audio and images to ./uploads
+    try:
+        with patched_llms(stub):
+            factories = scenario_factories(session_factory, workdir, args.children)
+            for name in args.scenarios:
+                exporter.spans.clear()
+                results[name] = await run_scenario(name, args.requests, args.concurrency, factories[name])
+                results[name]["stages"] = stage_breakdown(exporter.spans, f"bench.{name}")
+    finally:
+        os.chdir(cwd)
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    return {
+        "generated_at": datetime.now().isoformat(),
+        "environment": {"python": sys.version.split()[0], "platform": platform.platform()},
+        "config": {
+            "requests": args.requests,
+            "concurrency": args.concurrency,
+            "latency": args.latency,
+            "route_latency": route_latency,
+            "error_rate": args.error_rate,
+            "unsafe_rate": args.unsafe_rate,
+            "seed": args.seed,
+            "children": args.children,
+        },
+        "stub_calls": stub.calls,
+        "scenarios": results,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the AtaMind pipelines against a stub LLM")
+    parser.add_argument("--scenarios", default=",".join(SCENARIOS),
+                        type=lambda value: [s for s in value.split(",") if s in SCENARIOS])
+    parser.add_argument("--requests", type=int, default=20)
+    parser.add_argument("--concurrency", type=int, default=5)
+    parser.add_argument("--latency", default="lognormal:800,0.5", help="default stub latency, e.g. fixed:100")
+    parser.add_argument("--route-latency", action="append", default=[], metavar="ROUTE=SPEC",
+                        help="per-route latency, routes: story safety psychology voice image tts emotions values ...")
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--unsafe-rate", type=float, default=0.0, help="share of Guardian verdicts that force a rewrite")
+    parser.add_argument("--children", type=int, default=10)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", help="write JSON here instead of stdout")
+    parser.add_argument("--baseline", help="earlier JSON result to compare against")
+    args = parser.parse_args()
+
+    # Pipelines print their own fallbacks; keep stdout clean for the JSON result
+    with contextlib.redirect_stdout(sys.stderr):
+        result = asyncio.run(run(args))
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            result["comparison"] = compare(result, json.load(f))
+
+    output = json.dumps(result, ensure_ascii=False, indent=2)
+    if args.output:
+        Path(args.output).write_text(output, encoding="utf-8")
+    else:
+        print(output)
+
+
+if __name__ == "__main__":
+    main()
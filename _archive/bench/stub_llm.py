@@ -0,0 +1,271 @@
+"""
+Deterministic local stand-ins for Gemini and OpenAI used by the benchmarks
+
+The stub answers every agent prompt with a canned payload of the shape the
+agent parses, after a latency drawn from a seeded distribution, and fails a
+configurable share of calls. Calls are routed by prompt markers so each
+pipeline stage can get its own latency profile.
+"""
+
+import asyncio
+import json
+import math
+import random
+import threading
+import time
+from contextlib import contextmanager
+from types import SimpleNamespace
+from typing import Dict, List, Any, Optional, Tuple
+
+
+class StubLLMError(Exception):
+    """Injected failure, worded like a provider rate-limit error"""
+
+
+class Distribution:
+    """Latency distribution in milliseconds, parsed from `kind:args`
+
+    fixed:120            always 120 ms
+    uniform:50,150       uniform between 50 and 150 ms
+    lognormal:800,0.5    median 800 ms, sigma 0.5 (long right tail)
+    """
+
+    def __init__(self, spec: str):
+        self.spec = spec
+        kind, _, args = spec.partition(":")
+        self.kind = kind
+        self.args = [float(a) for a in args.split(",") if a]
+        if kind not in ("fixed", "uniform", "lognormal"):
+            raise ValueError(f"Unknown latency distribution: {spec}")
+
+    def sample(self, rng: random.Random) -> float:
+        if self.kind == "fixed":
+            return self.args[0]
+        if self.kind == "uniform":
+            return rng.uniform(self.args[0], self.args[1])
+        median, sigma = self.args
+        return rng.lognormvariate(math.log(median), sigma)
+
+
+# (route, prompt markers) in match order; the first route whose markers all
+# appear in the prompt answers it
+ROUTES: List[Tuple[str, Tuple[str, ...]]] = [
+    ("story", ("uzman bir hikaye anlatıcısısın",)),
+    ("safety", ("çocuk güvenliği", "değerlendir")),
+    ("psychology", ("psikolojik ve gelişimsel analiz",)),
+    ("voice", ("ebeveyn mesajını analiz et",)),
+    ("image", ("illustration",)),
+    ("emotions", ("duyguları analiz et",)),
+    ("values", ("ahlaki mesajları belirle",)),
+    ("parenting_style", ("ebeveynlik stilini belirle",)),
+    ("voice_recommendations", ("ebeveyn için öneriler oluştur",)),
+    ("report_suggestions", ("iyileştirme önerileri oluştur",)),
+    ("report_insights", ("gelişim analizi yap",)),
+    ("report_recommendations", ("aktivite önerileri oluştur",)),
+]
+
+STORY_TEXT = (
+    "Bir varmış bir yokmuş, küçük bir köyde Ayşe adında meraklı bir kız yaşarmış. "
+    "Bayram sabahı dedesinin elini öpüp büyüklerine saygı göstermiş, "
+    "komşularıyla şekerlerini paylaşmış ve herkesi çok mutlu etmiş. "
+) * 6
+
+# Tiny valid PNG so image writes have realistic bytes to flush
+PNG_BYTES = bytes.fromhex(
+    "89504e470d0a1a0a0000000d4948445200000001000000010806000000"
+    "1f15c4890000000d49444154789c6360000002000154a24f5d0000000049454e44ae426082"
+)
+
+
+def _payload(route: str, unsafe: bool) -> Any:
+    if route == "story":
+        return {
+            "title": "Ayşe ve Bayram Sabahı",
+            "content": STORY_TEXT,
+            "values_taught": ["Saygı", "Paylaşım"],
+            "cultural_elements": ["Bayram", "el öpme"],
+            "estimated_duration": 4.0,
+            "engagement_factors": ["curiosity", "value_reinforcement"],
+        }
+    if route == "safety":
+        return {
+            "is_safe": not unsafe,
+            "safety_score": 60 if unsafe else 96,
+            "identified_risks": ["yaş üstü kavram"] if unsafe else [],
+            "recommendations": ["Daha basit bir dil kullan"] if unsafe else [],
+            "approval_status": "needs_review" if unsafe else "approved",
+        }
+    if route == "psychology":
+        return {
+            "developmental_stage": "Okul öncesi",
+            "recommended_difficulty": "easy",
+            "learning_preferences": {"style": "visual"},
+            "engagement_strategies": ["soru sorma"],
+        }
+    if route == "voice":
+        return {
+            "emotional_tone": "sevecen",
+            "emotion_intensity": 70,
+            "values_mentioned": ["saygı", "dürüstlük"],
+            "recommended_story_themes": ["aile"],
+        }
+    if route == "emotions":
+        return {"sevgi": 0.8, "umut": 0.6, "sabır": 0.5}
+    if route == "values":
+        return ["Saygı", "Dürüstlük", "Aile bağları"]
+    if route == "parenting_style":
+        return "Destekleyici"
+    if route == "voice_recommendations":
+        return ["Aile temalı hikayeler seçin", "Birlikte okuma rutini oluşturun"]
+    if route == "report_suggestions":
+        return "Daha sıcak bir ton kullanın\nMesajları kısa tutun\nÇocuğun adını sık kullanın"
+    if route == "report_insights":
+        return {
+            "gelişim_alanları": ["Yaratıcılık"],
+            "güçlü_yönler": ["Hikaye dinleme"],
+            "dikkat_edilmesi_gerekenler": [],
+            "önerilen_aktiviteler": ["Sesli hikaye"],
+            "ebeveyn_rehberliği": ["Günlük rutin"],
+        }
+    if route == "report_recommendations":
+        return "Türk masalları\nBilmeceler\nHikaye tamamlama\nDeğer oyunları\nMüzikli etkinlikler"
+    return {}
+
+
+class _Awaitable:
+    """Response wrapper that async agents can await; sleeping happens on await
+
+    Agents that call generate_content synchronously from async code read
+    attributes directly instead, which blocks like the real client would.
+    """
+
+    def __init__(self, response, delay: float, error: Optional[Exception]):
+        self._response = response
+        self._delay = delay
+        self._error = error
+        self._resolved = False
+
+    def __await__(self):
+        yield from asyncio.sleep(self._delay).__await__()
+        if self._error:
+            raise self._error
+        return self._response
+
+    def __getattr__(self, name):
+        if not self._resolved:
+            self._resolved = True
+            time.sleep(self._delay)
+        if self._error:
+            raise self._error
+        return getattr(self._response, name)
+
+
+class StubLLM:
+    """Seeded latency and error model shared by all stub clients"""
+
+    def __init__(
+        self,
+        latency: str = "lognormal:800,0.5",
+        route_latency: Optional[Dict[str, str]] = None,
+        error_rate: float = 0.0,
+        unsafe_rate: float = 0.0,
+        seed: int = 42,
+    ):
+        self.default_latency = Distribution(latency)
+        self.route_latency = {route: Distribution(spec) for route, spec in (route_latency or {}).items()}
+        self.error_rate = error_rate
+        self.unsafe_rate = unsafe_rate
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self.calls: Dict[str, int] = {}
+
+    @staticmethod
+    def route(prompt: Any) -> str:
+        text = json.dumps(prompt, ensure_ascii=False, default=str) if not isinstance(prompt, str) else prompt
+        for route, markers in ROUTES:
+            if all(marker in text for marker in markers):
+                return route
+        return "default"
+
+    def draw(self, route: str) -> Tuple[float, Optional[Exception], bool]:
+        """(delay seconds, injected error, unsafe verdict) for one call"""
+        distribution = self.route_latency.get(route, self.default_latency)
+        with self._lock:
+            self.calls[route] = self.calls.get(route, 0) + 1
+            delay = distribution.sample(self._rng) / 1000
+            failed = self._rng.random() < self.error_rate
+            unsafe = self._rng.random() < self.unsafe_rate
+        error = StubLLMError(f"429 Resource exhausted (stub, route={route})") if failed else None
+        return delay, error, unsafe
+
+    def respond(self, prompt: Any):
+        route = self.route(prompt)
+        delay, error, unsafe = self.draw(route)
+        if route == "image":
+            part = SimpleNamespace(inline_data=SimpleNamespace(data=PNG_BYTES, mime_type="image/png"))
+            response = SimpleNamespace(candidates=[SimpleNamespace(content=SimpleNamespace(parts=[part]))], text="")
+        else:
+            payload = _payload(route, unsafe)
+            response = SimpleNamespace(text=payload if isinstance(payload, str) else json.dumps(payload, ensure_ascii=False))
+        prompt_text = prompt if isinstance(prompt, str) else json.dumps(prompt, ensure_ascii=False, default=str)
+        response.usage_metadata = SimpleNamespace(
+            prompt_token_count=len(prompt_text) // 4,
+            candidates_token_count=len(response.text) // 4,
+        )
+        return response, delay, error
+
+
+def _in_event_loop() -> bool:
+    try:
+        asyncio.get_running_loop()
+        return True
+    except RuntimeError:
+        return False
+
+
+@contextmanager
+def patched_llms(stub: StubLLM):
+    """Replace genai.GenerativeModel/configure and openai.Audio with the stub"""
+    import google.generativeai as genai
+    import openai
+
+    class StubGenerativeModel:
+        def __init__(self, model_name: str = "stub", *args, **kwargs):
+            self.model_name = model_name
+
+        def generate_content(self, contents, *args, **kwargs):
+            response, delay, error = stub.respond(contents)
+            if _in_event_loop():
+                return _Awaitable(response, delay, error)
+            time.sleep(delay)
+            if error:
+                raise error
+            return response
+
+    class StubAudio:
+        @staticmethod
+        async def acreate(model: str, voice: str, input: str, **kwargs):
+            delay, error, _ = stub.draw("tts")
+            await asyncio.sleep(delay)
+            if error:
+                raise error
+            # ~1 KB of audio per 10 characters of narration
+            return SimpleNamespace(content=b"\x00" * (len(input) * 100))
+
+    saved = {
+        "GenerativeModel": genai.GenerativeModel,
+        "configure": genai.configure,
+        "Audio": getattr(openai, "Audio", None),
+    }
+    genai.GenerativeModel = StubGenerativeModel
+    genai.configure = lambda *args, **kwargs: None
+    openai.Audio = StubAudio
+    try:
+        yield stub
+    finally:
+        genai.GenerativeModel = saved["GenerativeModel"]
+        genai.configure = saved["configure"]
+        if saved["Audio"] is None:
+            del openai.Audio
+        else:
+            openai.Audio = saved["Audio"]
@@ -0,0 +1,72 @@
+"""
+Turkish text benchmark - Throughput of the normalization and search tokenizer
+
+Run from the _archive directory:
+
+    python -m bench.text
+    python -m bench.text --seconds 2 "SAYGI" "Keloğlan'ın"   # also prints the keys of each text
+
+Measures kokogretim.text (cache keys, value names) and the search tokenizer
+the backend indexes with (app.turkish_text), memoized and uncached.
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+from app.turkish_text import fold, tokens
+
+# kokogretim is the Streamlit app's package, at the repository root
+sys.path.append(str(Path(__file__).resolve().parents[2]))
+from kokogretim.text import CACHE_SIZE, normalize, turkish_lower, value_key  # noqa: E402
+
+SAMPLES = [
+    "Çocuğumun büyüklerine saygı göstermesini ve her zaman dürüst olmasını istiyorum. "
+    "Ailemizin değerlerini öğrenmesi çok önemli.",
+    "İSTANBUL'da dedesini ziyaret eden IŞIL'ın hikayesi!",
+    "Kardeşiyle oyuncaklarını PAYLAŞMAYI öğrensin…",
+    "Dürüstlük", "DÜRÜSTLÜK", "Saygı", "SAYGI", "Aile Bağları", "Çalışkanlık", "Misafirperverlik",
+]
+
+
+def throughput(fn, texts, seconds: float) -> float:
+    calls, start = 0, time.perf_counter()
+    while time.perf_counter() - start < seconds:
+        for text in texts:
+            fn(text)
+        calls += len(texts)
+    return calls / (time.perf_counter() - start)
+
+
+def benchmark(seconds: float = 0.5):
+    """Print calls per second for memoized and uncached normalization"""
+    # More distinct texts than CACHE_SIZE, so every call misses
+    variants = [f"{text} {i}" for i in range(CACHE_SIZE // 2) for text in SAMPLES[:3]]
+    cases = [
+        ("normalize (hit)", normalize, SAMPLES),
+        ("normalize (uncached)", normalize.__wrapped__, SAMPLES),
+        ("normalize (miss, unique)", normalize, variants),
+        ("value_key (hit)", value_key, SAMPLES[3:]),
+        ("turkish_lower", turkish_lower, SAMPLES),
+        ("str.lower (baseline)", str.lower, SAMPLES),
+        ("search fold", fold, SAMPLES),
+        ("search tokens", tokens, SAMPLES),
+    ]
+    for label, fn, texts in cases:
+        print(f"{label:<28} {throughput(fn, texts, seconds):>14,.0f} calls/s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark Turkish text normalization")
+    parser.add_argument("text", nargs="*", help="also print the normalized forms of these texts")
+    parser.add_argument("--seconds", type=float, default=0.5, help="time per benchmark case")
+    args = parser.parse_args()
+
+    benchmark(args.seconds)
+    for text in args.text:
+        print(f"{text!r} -> {normalize(text)!r} (value key {value_key(text)!r}, search terms {tokens(text)})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,3 @@
+"""
+Synthetic data generation for analytics scale testing
+"""
@@ -0,0 +1,277 @@
+"""
+Vectorized row generators for the AtaMind analytics tables
+
+Children are generated in chunks; every chunk draws its rows with NumPy from
+a generator seeded by (seed, chunk index), so a data set is reproducible and
+memory stays bounded by the chunk size whatever the total row count.
+
+Distributions:
+- sessions follow a diurnal curve (before school and early evening peaks,
+  busier weekends), scaled by a heavy-tailed per-child activity level
+- each child has its own activity-type preference, and ratings lean high
+  (J-shaped) with a per-child bias and a boost for preferred types
+- stories and listening history follow the same activity level, listening
+  completion is Beta distributed
+"""
+
+import hashlib
+from datetime import datetime, timedelta
+from typing import Dict, List, Any, Iterator, Optional, Tuple
+
+import numpy as np
+
+from app.ids import uuid7_at
+from app.turkish_text import search_document
+
+ACTIVITY_TYPES = ["story", "voice_message", "game", "song", "puzzle"]
+LEARNING_STYLES = ["visual", "auditory", "kinesthetic"]
+INTERESTS = ["hayvanlar", "müzik", "uzay", "doğa", "masallar", "spor", "resim", "dinozorlar"]
+NAMES = ["Ayşe", "Mehmet", "Elif", "Ali", "Zeynep", "Mustafa", "Defne", "Can", "Ece", "Emir", "Ada", "Yusuf"]
+VALUES = ["Saygı", "Paylaşım", "Dürüstlük", "Sevgi", "Yardımseverlik", "Sabır", "Aile bağları"]
+CULTURAL_ELEMENTS = ["Bayram", "Nasreddin Hoca", "Keloğlan", "el öpme", "misafirperverlik", "çay sohbeti"]
+
+# Relative session starts per hour of day (index = hour)
+DIURNAL = np.array([
+    0.1, 0.05, 0.02, 0.02, 0.02, 0.1, 0.6, 1.6, 1.8, 0.9, 0.6, 0.7,
+    0.9, 1.0, 1.1, 1.3, 1.6, 2.0, 2.6, 3.0, 2.7, 1.8, 0.7, 0.25,
+])
+DIURNAL = DIURNAL / DIURNAL.sum()
+# Monday..Sunday multiplier on session and listening counts
+WEEKDAY_FACTOR = np.array([0.9, 0.9, 0.95, 0.95, 1.0, 1.35, 1.4])
+
+DEFAULT_PROFILE = {
+    "sessions_per_day": 1.2,
+    "ratings_per_session": 3.0,
+    "listens_per_day": 0.8,
+    "stories_per_week": 2.0,
+    "children_per_parent": 1.6,
+    "activity_sigma": 0.6,  # spread of the per-child activity level
+}
+
+TABLES = ["users", "children", "stories", "usage_sessions", "activity_ratings", "listening_history"]
+
+COLUMNS = {
+    "users": ["id", "email", "first_name", "last_name", "created_at", "updated_at"],
+    "children": ["id", "parent_id", "name", "age", "interests", "learning_style", "personality_traits",
+                 "cultural_background", "created_at", "updated_at"],
+    "stories": ["id", "user_id", "child_id", "title", "content", "values_taught", "duration",
+                "difficulty_level", "cultural_elements", "created_at", "search_document"],
+    "usage_sessions": ["id", "child_id", "parent_id", "session_start", "session_end", "duration_minutes",
+                       "activities_completed", "average_rating"],
+    "activity_ratings": ["id", "child_id", "activity_type", "activity_id", "rating", "feedback_text", "rated_at"],
+    "listening_history": ["id", "child_id", "story_id", "duration_listened", "completion_rate",
+                          "engagement_score", "listened_at"],
+}
+
+Chunk = Tuple[str, List[str], List[tuple]]
+
+
+def rows_per_child(days: int, profile: Dict[str, float] = DEFAULT_PROFILE) -> float:
+    """Expected rows generated per child, users included"""
+    sessions = profile["sessions_per_day"] * WEEKDAY_FACTOR.mean() * days
+    listens = profile["listens_per_day"] * WEEKDAY_FACTOR.mean() * days
+    stories = profile["stories_per_week"] * days / 7
+    return 1 + 1 / profile["children_per_parent"] + sessions * (1 + profile["ratings_per_session"]) + listens + stories
+
+
+def children_for_rows(rows: int, days: int, profile: Dict[str, float] = DEFAULT_PROFILE) -> int:
+    return max(int(rows / rows_per_child(days, profile)), 1)
+
+
+def _uuid7_strings(rng: np.random.Generator, at_us: np.ndarray) -> List[str]:
+    """UUIDv7 strings (app.ids layout) timed by each row's own timestamp"""
+    n = len(at_us)
+    high = ((at_us // 1000).astype(np.uint64) << np.uint64(16)) | np.uint64(0x7000) | rng.integers(0, 0x1000, n, dtype=np.uint64)
+    low = np.uint64(0x8000_0000_0000_0000) | rng.integers(0, 1 << 62, n, dtype=np.uint64)
+    return [
+        f"{h >> 32:08x}-{(h >> 16) & 0xFFFF:04x}-{h & 0xFFFF:04x}-{l >> 48:04x}-{l & 0xFFFF_FFFF_FFFF:012x}"
+        for h, l in zip(high.tolist(), low.tolist())
+    ]
+
+
+def _timestamps(day_start_us: np.ndarray, offset_us: np.ndarray) -> List[datetime]:
+    return (day_start_us + offset_us).astype("datetime64[us]").tolist()
+
+
+def _categorical_rows(rng: np.random.Generator, probabilities: np.ndarray) -> np.ndarray:
+    """One category per row, each row drawn from its own distribution"""
+    cumulative = probabilities.cumsum(axis=1)
+    u = rng.random(len(probabilities)) * cumulative[:, -1]
+    return (u[:, None] > cumulative).sum(axis=1)
+
+
+class DatasetGenerator:
+    """Produces rows for children [0, children) chunk by chunk"""
+
+    def __init__(
+        self,
+        children: int,
+        days: int = 90,
+        seed: int = 7,
+        end: Optional[datetime] = None,
+        profile: Optional[Dict[str, float]] = None,
+        id_prefix: str = "gen",
+        pin_parent: Optional[str] = None,
+        pin_every: int = 10,
+    ):
+        self.children = children
+        self.days = days
+        self.seed = seed
+        self.end = (end or datetime.now()).replace(hour=0, minute=0, second=0, microsecond=0) + timedelta(days=1)
+        self.profile = {**DEFAULT_PROFILE, **(profile or {})}
+        self.parents = max(int(np.ceil(children / self.profile["children_per_parent"])), 1)
+        self.prefix = id_prefix
+        # Every `pin_every`-th child belongs to `pin_parent`, e.g. the mock API user
+        self.pin_parent = pin_parent
+        self.pin_every = pin_every
+
+    def child_id(self, index: int) -> str:
+        """Stable per (prefix, seed, index); ordered by index"""
+        digest = hashlib.blake2b(f"{self.prefix}:{self.seed}:{index}".encode(), digest_size=10).digest()
+        at = self.end - timedelta(days=self.days + 365) + timedelta(milliseconds=index)
+        return str(uuid7_at(at, int.from_bytes(digest, "big")))
+
+    def parent_of(self, index: np.ndarray) -> np.ndarray:
+        return index * self.parents // self.children
+
+    def chunks(self, chunk_children: int = 500) -> Iterator[List[Chunk]]:
+        """Per chunk, a list of (table, columns, rows) in foreign-key order"""
+        for number, start in enumerate(range(0, self.children, chunk_children)):
+            stop = min(start + chunk_children, self.children)
+            rng = np.random.default_rng([self.seed, number])
+            yield self._chunk(rng, start, stop)
+
+    def _chunk(self, rng: np.random.Generator, start: int, stop: int) -> List[Chunk]:
+        p = self.profile
+        index = np.arange(start, stop)
+        n = len(index)
+        first_day = np.datetime64(self.end - timedelta(days=self.days), "us").astype(np.int64)
+        day_us = 86_400_000_000
+
+        # Parents: a parent is emitted with its first child
+        parent_index = self.parent_of(index)
+        previous = self.parent_of(np.array([start - 1]))[0] if start else -1
+        parent_ids = np.array([f"{self.prefix}_parent_{i}" for i in parent_index], dtype=object)
+        if self.pin_parent:
+            parent_ids[index % self.pin_every == 0] = self.pin_parent
+        created = _timestamps(first_day - rng.integers(1, 365, n) * day_us, rng.integers(0, day_us, n))
+        users = [
+            (f"{self.prefix}_parent_{i}", f"{self.prefix}.parent{i}@example.com", "Veli", str(i), created[0], created[0])
+            for i in np.unique(parent_index[parent_index > previous])
+        ]
+        if self.pin_parent and start == 0:
+            users.append((self.pin_parent, f"{self.pin_parent}@example.com", "Veli", "Test", created[0], created[0]))
+
+        # Children and their hidden behaviour parameters
+        ages = rng.integers(3, 13, n)
+        level = rng.lognormal(-p["activity_sigma"] ** 2 / 2, p["activity_sigma"], n)  # mean 1
+        preference = rng.dirichlet(np.full(len(ACTIVITY_TYPES), 0.8), n)
+        bias = rng.normal(0, 0.45, n)
+        child_ids = [self.child_id(i) for i in index.tolist()]
+        interest_pairs = rng.integers(0, len(INTERESTS), (n, 2))
+        styles = rng.integers(0, len(LEARNING_STYLES), n)
+        names = rng.integers(0, len(NAMES), n)
+        children = [
+            (child_ids[k], parent_ids[k], NAMES[names[k]], int(ages[k]),
+             sorted({INTERESTS[interest_pairs[k, 0]], INTERESTS[interest_pairs[k, 1]]}),
+             LEARNING_STYLES[styles[k]], {"meraklı": bool(bias[k] > 0), "enerjik": bool(level[k] > 1)},
+             "Turkish", created[k], created[k])
+            for k in range(n)
+        ]
+
+        weekday = (np.arange(self.days) + (self.end - timedelta(days=self.days)).weekday()) % 7
+        day_factor = WEEKDAY_FACTOR[weekday]
+
+        # Usage sessions: Poisson count per child and day, diurnal start time
+        counts = rng.poisson(p["sessions_per_day"] * level[:, None] * day_factor[None, :])
+        s_child, s_day = np.nonzero(counts)
+        repeats = counts[s_child, s_day]
+        s_child, s_day = np.repeat(s_child, repeats), np.repeat(s_day, repeats)
+        s_total = len(s_child)
+        start_us = (rng.choice(24, s_total, p=DIURNAL) * 3600 + rng.integers(0, 3600, s_total)) * 1_000_000
+        duration = np.minimum(rng.lognormal(np.log(6 + ages[s_child] * 1.5), 0.5), 120)
+        session_start_us = first_day + s_day * day_us + start_us
+        session_ids = _uuid7_strings(rng, session_start_us)
+
+        # Ratings inside sessions, typed by the child's preference
+        r_counts = rng.poisson(p["ratings_per_session"], s_total)
+        r_session = np.repeat(np.arange(s_total), r_counts)
+        r_child = s_child[r_session]
+        r_total = len(r_session)
+        r_type = _categorical_rows(rng, preference[r_child])
+        affinity = preference[r_child, r_type] * len(ACTIVITY_TYPES) - 1
+        latent = 3.9 + bias[r_child] + 0.5 * affinity + rng.normal(0, 0.9, r_total)
+        ratings = np.clip(np.rint(latent), 1, 5).astype(int)
+        rated_us = session_start_us[r_session] + (rng.random(r_total) * duration[r_session] * 60e6).astype(np.int64)
+        activity_ids = rng.integers(1, 500, r_total)
+
+        rating_sum = np.bincount(r_session, weights=ratings, minlength=s_total)
+        average = np.divide(rating_sum, r_counts, out=np.full(s_total, np.nan), where=r_counts > 0)
+
+        session_starts = session_start_us.astype("datetime64[us]").tolist()
+        session_ends = (session_start_us + (duration * 60e6).astype(np.int64)).astype("datetime64[us]").tolist()
+        sessions = [
+            (session_ids[k], child_ids[s_child[k]], parent_ids[s_child[k]], session_starts[k], session_ends[k],
+             round(float(duration[k]), 1), int(r_counts[k]), None if np.isnan(average[k]) else round(float(average[k]), 2))
+            for k in range(s_total)
+        ]
+        rated_at = rated_us.astype("datetime64[us]").tolist()
+        rating_ids = _uuid7_strings(rng, rated_us)
+        activity_ratings = [
+            (rating_ids[k], child_ids[r_child[k]], ACTIVITY_TYPES[r_type[k]],
+             f"activity_{activity_ids[k]}", int(ratings[k]), None, rated_at[k])
+            for k in range(r_total)
+        ]
+
+        # Stories, then listening history over each child's own stories
+        st_counts = rng.poisson(p["stories_per_week"] * self.days / 7 * level)
+        st_child = np.repeat(np.arange(n), st_counts)
+        st_total = len(st_child)
+        st_created_us = first_day + rng.integers(0, self.days, st_total) * day_us + \
+            (rng.choice(24, st_total, p=DIURNAL) * 3600 * 1_000_000)
+        st_duration = np.clip(rng.normal(3 + ages[st_child] * 0.4, 1.0), 1, 12)
+        st_values = rng.integers(0, len(VALUES), (st_total, 2))
+        st_culture = rng.integers(0, len(CULTURAL_ELEMENTS), st_total)
+        st_created = st_created_us.astype("datetime64[us]").tolist()
+        story_ids = _uuid7_strings(rng, st_created_us)
+        difficulty = np.where(ages[st_child] <= 5, "easy", np.where(ages[st_child] <= 8, "medium", "hard"))
+        stories = [
+            (story_ids[k], parent_ids[st_child[k]], child_ids[st_child[k]],
+             f"{NAMES[names[st_child[k]]]} ve {VALUES[st_values[k, 0]]}",
+             f"Bir varmış bir yokmuş... {VALUES[st_values[k, 0]]} ve {VALUES[st_values[k, 1]]} üzerine bir masal.",
+             sorted({VALUES[st_values[k, 0]], VALUES[st_values[k, 1]]}), round(float(st_duration[k]), 1),
+             str(difficulty[k]), [CULTURAL_ELEMENTS[st_culture[k]]], st_created[k])
+            for k in range(st_total)
+        ]
+        # Filled here rather than by the column default so COPY loads get it too
+        stories = [row + (search_document(row[3], row[4], row[5], row[8]),) for row in stories]
+
+        # Listening: only children with stories listen; pick among their own stories
+        has_story = st_counts > 0
+        l_counts = rng.poisson(p["listens_per_day"] * level[:, None] * day_factor[None, :]) * has_story[:, None]
+        l_child, l_day = np.nonzero(l_counts)
+        repeats = l_counts[l_child, l_day]
+        l_child, l_day = np.repeat(l_child, repeats), np.repeat(l_day, repeats)
+        l_total = len(l_child)
+        story_offset = np.concatenate([[0], np.cumsum(st_counts)[:-1]])
+        l_story = story_offset[l_child] + (rng.random(l_total) * st_counts[l_child]).astype(int)
+        completion = rng.beta(5, 1.8, l_total)
+        engagement = np.clip(completion * 80 + rng.normal(10, 8, l_total), 0, 100)
+        listened_us = first_day + l_day * day_us + (rng.choice(24, l_total, p=DIURNAL) * 3600 + rng.integers(0, 3600, l_total)) * 1_000_000
+        listened_at = listened_us.astype("datetime64[us]").tolist()
+        listen_ids = _uuid7_strings(rng, listened_us)
+        listening = [
+            (listen_ids[k], child_ids[l_child[k]], story_ids[l_story[k]],
+             round(float(st_duration[l_story[k]] * completion[k]), 2), round(float(completion[k] * 100), 1),
+             round(float(engagement[k]), 1), listened_at[k])
+            for k in range(l_total)
+        ]
+
+        return [
+            ("users", COLUMNS["users"], users),
+            ("children", COLUMNS["children"], children),
+            ("stories", COLUMNS["stories"], stories),
+            ("usage_sessions", COLUMNS["usage_sessions"], sessions),
+            ("activity_ratings", COLUMNS["activity_ratings"], activity_ratings),
+            ("listening_history", COLUMNS["listening_history"], listening),
+        ]
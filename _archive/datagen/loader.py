@@ -0,0 +1,82 @@
+"""
+Bulk loaders: COPY on PostgreSQL, batched executemany elsewhere
+"""
+
+import csv
+import io
+import json
+from datetime import datetime
+from typing import List, Any
+
+from sqlalchemy import event, insert
+from sqlalchemy.engine import Engine
+
+from app.models import Base
+
+BATCH_SIZE = 20000
+
+
+def _csv_value(value: Any) -> Any:
+    if value is None:
+        return r"\N"
+    if isinstance(value, (list, dict)):
+        return json.dumps(value, ensure_ascii=False)
+    if isinstance(value, datetime):
+        return value.isoformat(sep=" ")
+    return value
+
+
+class CopyLoader:
+    """Streams rows into PostgreSQL with COPY ... FROM STDIN (CSV)"""
+
+    method = "copy"
+
+    def __init__(self, engine: Engine):
+        self.engine = engine
+
+    def load(self, table: str, columns: List[str], rows: List[tuple]):
+        if not rows:
+            return
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        for row in rows:
+            writer.writerow([_csv_value(v) for v in row])
+        buffer.seek(0)
+        connection = self.engine.raw_connection()
+        try:
+            with connection.cursor() as cursor:
+                cursor.copy_expert(
+                    f"COPY {table} ({', '.join(columns)}) FROM STDIN WITH (FORMAT csv, NULL '\\N')",
+                    buffer,
+                )
+            connection.commit()
+        finally:
+            connection.close()
+
+
+class InsertLoader:
+    """Batched Core INSERT executemany; SQLite durability is relaxed for the load"""
+
+    method = "insert"
+
+    def __init__(self, engine: Engine):
+        self.engine = engine
+        if engine.dialect.name == "sqlite":
+            @event.listens_for(engine, "connect")
+            def _fast_sqlite(dbapi_connection, connection_record):
+                cursor = dbapi_connection.cursor()
+                cursor.execute("PRAGMA journal_mode=WAL")
+                cursor.execute("PRAGMA synchronous=OFF")
+                cursor.close()
+
+    def load(self, table: str, columns: List[str], rows: List[tuple]):
+        statement = insert(Base.metadata.tables[table])
+        with self.engine.begin() as conn:
+            for start in range(0, len(rows), BATCH_SIZE):
+                conn.execute(statement, [dict(zip(columns, row)) for row in rows[start:start + BATCH_SIZE]])
+
+
+def loader_for(engine: Engine, method: str = "auto"):
+    if method == "copy" or (method == "auto" and engine.dialect.name == "postgresql"):
+        return CopyLoader(engine)
+    return InsertLoader(engine)
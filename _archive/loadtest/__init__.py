@@ -0,0 +1,3 @@
+"""
+HTTP load tests for the AtaMind API: database seeding, scenario mix and runner
+"""
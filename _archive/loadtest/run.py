@@ -0,0 +1,199 @@
+"""
+HTTP load runner for the AtaMind API
+
+Start the API against a seeded database, then replay the parent-session mix:
+
+    python -m loadtest.seed --db sqlite:///loadtest.db
+    python -m loadtest.serve --db sqlite:///loadtest.db --port 8000
+    python -m loadtest.run --base-url http://localhost:8000 --users 50 --duration 120
+
+Each virtual user picks a scenario from the weighted mix and a child from the
+seed manifest, runs the flow with think time between steps, and starts over.
+The result reports a latency histogram, percentiles, status codes and error
+rate per endpoint template.
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import time
+from bisect import bisect_left
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Any, Optional
+
+import httpx
+import numpy as np
+
+from .scenarios import SCENARIOS, DEFAULT_MIX, parse_mix
+
+# Upper bounds in ms; the last bucket catches everything slower
+BUCKETS_MS = [5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000]
+
+
+class EndpointStats:
+    """Latency samples and outcomes for one endpoint template"""
+
+    def __init__(self):
+        self.latencies: List[float] = []
+        self.histogram = [0] * (len(BUCKETS_MS) + 1)
+        self.statuses: Dict[str, int] = {}
+        self.errors = 0
+
+    def add(self, latency_ms: float, status: str, failed: bool):
+        self.latencies.append(latency_ms)
+        self.histogram[bisect_left(BUCKETS_MS, latency_ms)] += 1
+        self.statuses[status] = self.statuses.get(status, 0) + 1
+        if failed:
+            self.errors += 1
+
+    def to_dict(self, wall_seconds: float) -> Dict[str, Any]:
+        count = len(self.latencies)
+        p50, p95, p99 = np.percentile(self.latencies, [50, 95, 99]) if count else (None, None, None)
+        labels = [f"<={b}" for b in BUCKETS_MS] + [f">{BUCKETS_MS[-1]}"]
+        return {
+            "requests": count,
+            "rps": round(count / wall_seconds, 3) if wall_seconds else None,
+            "errors": self.errors,
+            "error_rate": round(self.errors / count, 4) if count else 0.0,
+            "statuses": self.statuses,
+            "latency_ms": {
+                "p50": round(float(p50), 2) if count else None,
+                "p95": round(float(p95), 2) if count else None,
+                "p99": round(float(p99), 2) if count else None,
+                "max": round(max(self.latencies), 2) if count else None,
+            },
+            "histogram_ms": dict(zip(labels, self.histogram)),
+        }
+
+
+class LoadClient:
+    """httpx client that times every call under its endpoint template"""
+
+    def __init__(self, http: httpx.AsyncClient, stats: Dict[str, EndpointStats]):
+        self.http = http
+        self.stats = stats
+
+    async def call(self, method: str, template: str, params: Optional[Dict[str, Any]] = None,
+                   json: Optional[Dict[str, Any]] = None, **path) -> Optional[httpx.Response]:
+        started = time.perf_counter()
+        try:
+            response = await self.http.request(method, template.format(**path), params=params, json=json)
+            status, failed = str(response.status_code), response.status_code >= 400
+        except httpx.HTTPError as e:
+            response, status, failed = None, type(e).__name__, True
+        latency_ms = (time.perf_counter() - started) * 1000
+        self.stats.setdefault(f"{method} {template}", EndpointStats()).add(latency_ms, status, failed)
+        return response
+
+
+def load_manifest(path: str) -> Dict[str, Any]:
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+async def virtual_user(index: int, client: LoadClient, manifest: Dict[str, Any], mix: Dict[str, float],
+                       deadline: Optional[float], iterations: Optional[int], think_time: float,
+                       seed: int, scenario_counts: Dict[str, int]):
+    rng = random.Random(seed * 100003 + index)
+    names, weights = list(mix), list(mix.values())
+    # Report endpoints are scoped to the mock parent, so those scenarios use its children
+    own_children = manifest.get("mock_parent_child_ids") or manifest["child_ids"]
+
+    async def think():
+        if think_time:
+            await asyncio.sleep(rng.uniform(0.5, 1.5) * think_time)
+
+    done = 0
+    while (iterations is None or done < iterations) and (deadline is None or time.monotonic() < deadline):
+        name = rng.choices(names, weights=weights)[0]
+        pool = own_children if name in ("report_request", "progress_check") else manifest["child_ids"]
+        await SCENARIOS[name](client, rng, rng.choice(pool), think)
+        scenario_counts[name] = scenario_counts.get(name, 0) + 1
+        done += 1
+        await think()
+
+
+async def run(args) -> Dict[str, Any]:
+    manifest = load_manifest(args.manifest)
+    mix = parse_mix(args.mix) if args.mix else DEFAULT_MIX
+    stats: Dict[str, EndpointStats] = {}
+    scenario_counts: Dict[str, int] = {}
+
+    limits = httpx.Limits(max_connections=args.users, max_keepalive_connections=args.users)
+    async with httpx.AsyncClient(base_url=args.base_url, timeout=args.timeout, limits=limits) as http:
+        client = LoadClient(http, stats)
+        started = time.monotonic()
+        deadline = started + args.ramp_up + args.duration if args.duration else None
+        iterations = args.iterations if not args.duration else None
+
+        async def delayed(i: int):
+            # Spread user start times evenly over the ramp-up window
+            await asyncio.sleep(args.ramp_up * i / args.users)
+            await virtual_user(i, client, manifest, mix, deadline, iterations, args.think_time, args.seed, scenario_counts)
+
+        await asyncio.gather(*(delayed(i) for i in range(args.users)))
+        wall = time.monotonic() - started
+
+    total = sum(len(s.latencies) for s in stats.values())
+    errors = sum(s.errors for s in stats.values())
+    return {
+        "generated_at": datetime.now().isoformat(),
+        "config": {
+            "base_url": args.base_url,
+            "users": args.users,
+            "duration": args.duration,
+            "iterations": iterations,
+            "ramp_up": args.ramp_up,
+            "think_time": args.think_time,
+            "mix": mix,
+            "seed": args.seed,
+            "seeded": manifest.get("counts"),
+        },
+        "wall_seconds": round(wall, 3),
+        "requests": total,
+        "rps": round(total / wall, 3) if wall else None,
+        "error_rate": round(errors / total, 4) if total else 0.0,
+        "scenarios": scenario_counts,
+        "endpoints": {name: stats[name].to_dict(wall) for name in sorted(stats)},
+    }
+
+
+def format_table(result: Dict[str, Any]) -> str:
+    header = f"{'endpoint':<46} {'reqs':>7} {'rps':>8} {'err%':>6} {'p50':>9} {'p95':>9} {'p99':>9}"
+    lines = [header, "-" * len(header)]
+    for name, endpoint in result["endpoints"].items():
+        latency = endpoint["latency_ms"]
+        lines.append(
+            f"{name:<46} {endpoint['requests']:>7} {endpoint['rps']:>8} {endpoint['error_rate'] * 100:>6.1f} "
+            f"{latency['p50']:>9} {latency['p95']:>9} {latency['p99']:>9}"
+        )
+    lines.append(f"\n{result['requests']} requests in {result['wall_seconds']}s "
+                 f"({result['rps']} rps), error rate {result['error_rate'] * 100:.2f}%")
+    return "\n".join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay parent sessions against a running AtaMind API")
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    parser.add_argument("--manifest", default="loadtest_manifest.json", help="written by loadtest.seed")
+    parser.add_argument("--users", type=int, default=20, help="concurrent virtual parents")
+    parser.add_argument("--duration", type=float, default=60.0, help="seconds after ramp-up; 0 to use --iterations")
+    parser.add_argument("--iterations", type=int, default=10, help="scenarios per user when --duration is 0")
+    parser.add_argument("--ramp-up", type=float, default=10.0, help="seconds over which users start")
+    parser.add_argument("--think-time", type=float, default=1.0, help="mean pause between steps in seconds")
+    parser.add_argument("--mix", help="scenario weights, e.g. parent_session=70,story_request=30")
+    parser.add_argument("--timeout", type=float, default=30.0)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", help="also write the JSON result here")
+    args = parser.parse_args()
+
+    result = asyncio.run(run(args))
+    if args.output:
+        Path(args.output).write_text(json.dumps(result, ensure_ascii=False, indent=2), encoding="utf-8")
+    print(format_table(result))
+
+
+if __name__ == "__main__":
+    main()
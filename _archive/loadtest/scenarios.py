@@ -0,0 +1,110 @@
+"""
+Parent-session scenarios replayed by the load runner
+
+Each scenario is an async flow of HTTP calls made by one virtual parent for one
+child. Calls are labelled with the endpoint template so the runner aggregates
+every `/api/child/<id>/usage-stats` call into one histogram.
+"""
+
+import random
+from typing import Dict, Callable, Awaitable
+
+PARENT_MESSAGES = [
+    "Çocuğumun büyüklerine saygı göstermesini istiyorum.",
+    "Paylaşmanın önemini öğrenmesini istiyorum.",
+    "Her zaman dürüst olmasını istiyorum.",
+    "Misafirlere nasıl davranılacağını öğrensin.",
+]
+
+
+async def parent_session(client, rng: random.Random, child_id: str, think):
+    """Open the app, check stats, play and rate a few activities, close the session"""
+    await client.call("GET", "/api/auth/user")
+    await client.call("GET", "/api/child/{child_id}/usage-stats", child_id=child_id)
+    response = await client.call("POST", "/api/start-session", params={"child_id": child_id})
+    session_id = response.json().get("session_id") if response is not None and response.status_code == 200 else None
+
+    activities = rng.randint(1, 6)
+    for _ in range(activities):
+        await think()
+        await client.call("POST", "/api/activity-rating", params={"child_id": child_id}, json={
+            "activity_type": rng.choice(["story", "voice_message", "game"]),
+            "activity_id": f"activity_{rng.randint(1, 200)}",
+            "rating": rng.choices([1, 2, 3, 4, 5], weights=[1, 2, 4, 8, 10])[0],
+        })
+
+    if session_id:
+        await client.call("POST", "/api/end-session", params={"session_id": session_id, "activities_completed": activities})
+
+
+async def game_burst(client, rng: random.Random, child_id: str, think):
+    """A game screen posting a session and a burst of ratings as one event batch"""
+    ratings = [{
+        "child_id": child_id,
+        "activity_type": "game",
+        "activity_id": f"activity_{rng.randint(1, 200)}",
+        "rating": rng.choices([1, 2, 3, 4, 5], weights=[1, 2, 4, 8, 10])[0],
+    } for _ in range(rng.randint(5, 20))]
+    response = await client.call("POST", "/api/events/batch", json={
+        "sessions": [{"type": "start", "child_id": child_id}],
+        "ratings": ratings,
+    })
+    if response is None or response.status_code != 202:
+        return
+    session_id = response.json()["session_ids"][0]
+    await think()
+    await client.call("POST", "/api/events/batch", json={
+        "sessions": [{"type": "end", "session_id": session_id, "activities_completed": len(ratings)}],
+    })
+
+
+async def progress_check(client, rng: random.Random, child_id: str, think):
+    """A parent looking at insights and past reports"""
+    await client.call("GET", "/api/child/{child_id}/usage-stats", child_id=child_id)
+    await think()
+    await client.call("GET", "/api/ai-insights/{child_id}", child_id=child_id)
+    await client.call("GET", "/api/child/{child_id}/reports", child_id=child_id)
+
+
+async def report_request(client, rng: random.Random, child_id: str, think):
+    """A parent opening the biweekly report (regenerated only if the data changed)"""
+    await client.call("POST", "/api/child/{child_id}/generate-report", child_id=child_id)
+    await think()
+    await client.call("GET", "/api/child/{child_id}/reports", child_id=child_id)
+
+
+async def story_request(client, rng: random.Random, child_id: str, think):
+    """A parent asking for a new story"""
+    await client.call("POST", "/api/generate-story", params={
+        "child_name": "Ayşe",
+        "parent_message": rng.choice(PARENT_MESSAGES),
+    })
+
+
+SCENARIOS: Dict[str, Callable[..., Awaitable[None]]] = {
+    "parent_session": parent_session,
+    "game_burst": game_burst,
+    "progress_check": progress_check,
+    "report_request": report_request,
+    "story_request": story_request,
+}
+
+# Share of virtual-user iterations per scenario during a school-day evening
+DEFAULT_MIX = {
+    "parent_session": 60,
+    "game_burst": 10,
+    "progress_check": 15,
+    "story_request": 12,
+    "report_request": 3,
+}
+
+
+def parse_mix(value: str) -> Dict[str, float]:
+    """`parent_session=70,story_request=30` -> weights"""
+    mix = {}
+    for item in value.split(","):
+        name, _, weight = item.partition("=")
+        if name not in SCENARIOS:
+            raise ValueError(f"Unknown scenario: {name}")
+        mix[name] = float(weight)
+    return mix
@@ -0,0 +1,38 @@
+"""
+Run the API for load tests with the stub LLM in place of Gemini and OpenAI
+
+    cd <repo root>   # main.py serves ./static and ./uploads
+    PYTHONPATH=_archive python -m loadtest.serve --db sqlite:///loadtest.db --port 8000
+
+Report generation and insights then cost stub latency instead of real quota,
+so the load test measures the API and database rather than the providers.
+"""
+
+import argparse
+import os
+
+import uvicorn
+
+from bench.stub_llm import StubLLM, patched_llms
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve the AtaMind API against a stub LLM")
+    parser.add_argument("--db", default="sqlite:///loadtest.db")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--latency", default="lognormal:800,0.5", help="stub latency, e.g. fixed:100")
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    # app.database reads DATABASE_URL at import time
+    os.environ["DATABASE_URL"] = args.db
+    stub = StubLLM(args.latency, error_rate=args.error_rate, seed=args.seed)
+    with patched_llms(stub):
+        from main import app
+        uvicorn.run(app, host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
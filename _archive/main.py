@@ -3,20 +3,29 @@ AtaMind - AI-powered Turkish children's education platform
 Main FastAPI application
 """
 
-from fastapi import FastAPI, HTTPException, Depends, UploadFile, File
+from fastapi import FastAPI, HTTPException, Depends, UploadFile, File, Query
 from fastapi.staticfiles import StaticFiles
 from fastapi.responses import HTMLResponse, FileResponse
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy.orm import Session
 import uvicorn
+import asyncio
 import os
 from pathlib import Path
+from uuid import UUID
 
 # Import our modules
-from app.database import get_db, create_tables
-from app.auth import mock_get_current_user
-from app.analytics import AnalyticsEngine
-from app.models import ActivityRatingCreate, UsageStatsResponse, BiweeklyReportResponse
+from app.database import get_db, create_tables, BackgroundSessionLocal
+from app.auth import mock_get_current_user, require_admin
+from app.analytics import AnalyticsEngine, run_session_reconciler
+from app.cohort_analytics import cohorts
+from app.recommendations import recommender, RECOMMEND_TOP_K
+from app import routes
+from app.models import ActivityRatingCreate, UsageStatsResponse, BiweeklyReportResponse, EventBatch
+from app.tracing import TracingMiddleware
+from app.ingest import ingestor
 
 # Initialize FastAPI app
 app = FastAPI(
@@ -32,8 +41,12 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["traceparent"],
 )
 
+# Request spans; continues the caller's trace when a traceparent header is sent
+app.add_middleware(TracingMiddleware)
+
 # Basic API endpoints
 @app.get("/api/health")
 async def api_health():
@@ -56,8 +69,16 @@ app.mount("/uploads", StaticFiles(directory="uploads"), name="uploads")
 @app.on_event("startup")
 async def startup_event():
     create_tables()
+    ingestor.start()
+    # Closes sessions abandoned without an end call (on its own connection pool, in a worker thread)
+    app.state.session_reconciler = asyncio.create_task(run_session_reconciler(BackgroundSessionLocal))
     print("🌈 AtaMind Python backend started successfully! 🌈")
 
+@app.on_event("shutdown")
+async def shutdown_event():
+    app.state.session_reconciler.cancel()
+    await ingestor.stop()
+
 @app.get("/")
 async def read_root():
     """Serve the main application"""
@@ -103,22 +124,22 @@ async def upload_voice(
 # AI Insights Endpoint
 @app.get("/api/ai-insights/{child_id}")
 async def get_ai_insights(
-    child_id: str,
+    child_id: UUID,
     current_user: dict = Depends(mock_get_current_user),
     db: Session = Depends(get_db)
 ):
     """Çocuk için AI analiz ve içgörüleri getir"""
     from app.models import Child
-    from app.ai_agents.psychology_agent_fixed import ChildPsychologyAgent
+    from app.ai_agents.psychology_agent_fixed import shared_agent
     
     try:
         # Get child profile
-        child = db.query(Child).filter(Child.id == child_id).first()
+        child = db.query(Child).filter(Child.id == str(child_id)).first()
         if not child:
             raise HTTPException(status_code=404, detail="Çocuk profili bulunamadı")
         
-        # Initialize psychology agent
-        psychology_agent = ChildPsychologyAgent()
+        # Process-wide psychology agent (model and milestone prompts built once)
+        psychology_agent = shared_agent()
         
         # Get comprehensive analysis
         analysis = psychology_agent.analyze_child_profile(child)
@@ -126,10 +147,10 @@ async def get_ai_insights(
         
         # Get analytics data for engagement metrics
         analytics = AnalyticsEngine(db)
-        stats = analytics.get_usage_statistics(child_id)
+        stats = analytics.get_usage_statistics(str(child_id))
         
         return {
-            "childId": child_id,
+            "childId": str(child_id),
             "childName": child.name,
             "psychologicalProfile": {
                 "developmentalStage": analysis.get("developmental_stage", "Analiz yapılıyor"),
@@ -157,7 +178,7 @@ async def get_ai_insights(
         print(f"AI Insights error: {e}")
         # Fallback to demo data with real child info
         return {
-            "childId": child_id,
+            "childId": str(child_id),
             "childName": child.name if 'child' in locals() and child else "Demo Çocuk",
             "psychologicalProfile": {
                 "developmentalStage": "Erken Çocukluk (3-5 yaş)",
@@ -188,16 +209,17 @@ async def get_ai_insights(
 # Activity Rating Endpoints
 @app.post("/api/activity-rating")
 async def rate_activity(
-    child_id: str,
+    child_id: UUID,
     rating_data: ActivityRatingCreate,
     current_user: dict = Depends(mock_get_current_user),
     db: Session = Depends(get_db)
 ):
-    """Çocuk aktivite puanlaması"""
-    analytics = AnalyticsEngine(db)
-    
-    rating_record = await analytics.record_activity_rating(
-        child_id=child_id,
+    """Çocuk aktivite puanlaması (toplu yazım için tampona alınır)"""
+    unknown_children, _ = ingestor.unknown_references(db.connection(), [str(child_id)])
+    if unknown_children:
+        raise HTTPException(status_code=404, detail="Çocuk profili bulunamadı")
+    rating_id = ingestor.add_rating(
+        child_id=str(child_id),
         activity_type=rating_data.activity_type,
         rating=rating_data.rating,
         activity_id=rating_data.activity_id,
@@ -205,21 +227,21 @@ async def rate_activity(
     )
     
     return {
-        "id": rating_record.id,
+        "id": rating_id,
         "message": f"Aktivite {rating_data.rating} yıldız ile puanlandı!",
         "child_encouragement": "Harika! Puanını kaydettik. Teşekkürler! ⭐" * rating_data.rating
     }
 
 @app.get("/api/child/{child_id}/usage-stats")
 async def get_usage_stats(
-    child_id: str,
+    child_id: UUID,
     current_user: dict = Depends(mock_get_current_user),
     db: Session = Depends(get_db)
 ):
     """Çocuğun uygulama kullanım istatistikleri"""
     try:
         analytics = AnalyticsEngine(db)
-        stats = analytics.get_usage_statistics(child_id)
+        stats = analytics.get_usage_statistics(str(child_id))
         return {
             "total_time_week": stats.get("total_time_week", 120),
             "activities_completed_week": stats.get("activities_completed_week", 8),
@@ -241,13 +263,15 @@ async def get_usage_stats(
 
 @app.post("/api/start-session")
 async def start_session(
-    child_id: str,
+    child_id: UUID,
     current_user: dict = Depends(mock_get_current_user),
     db: Session = Depends(get_db)
 ):
     """Uygulama oturumu başlat"""
-    analytics = AnalyticsEngine(db)
-    session_id = await analytics.start_usage_session(child_id, current_user["id"])
+    unknown_children, _ = ingestor.unknown_references(db.connection(), [str(child_id)])
+    if unknown_children:
+        raise HTTPException(status_code=404, detail="Çocuk profili bulunamadı")
+    session_id = ingestor.start_session(str(child_id), current_user["id"])
     
     return {
         "session_id": session_id,
@@ -256,28 +280,81 @@ async def start_session(
 
 @app.post("/api/end-session")
 async def end_session(
-    session_id: str,
+    session_id: UUID,
     activities_completed: int = 0,
     current_user: dict = Depends(mock_get_current_user),
     db: Session = Depends(get_db)
 ):
     """Uygulama oturumu bitir"""
-    analytics = AnalyticsEngine(db)
-    await analytics.end_usage_session(session_id, activities_completed)
+    _, unknown_sessions = ingestor.unknown_references(db.connection(), session_ids=[str(session_id)])
+    if unknown_sessions:
+        raise HTTPException(status_code=404, detail="Oturum bulunamadı")
+    ingestor.end_session(str(session_id), activities_completed)
     
     return {
         "message": f"Oturum tamamlandı! {activities_completed} aktivite bitirdin. Aferin! 🎉"
     }
 
+@app.post("/api/events/batch", status_code=202)
+async def ingest_events(
+    batch: EventBatch,
+    wait: bool = False,
+    current_user: dict = Depends(mock_get_current_user),
+    db: Session = Depends(get_db)
+):
+    """Puan ve oturum olaylarını toplu al; wait=true ise yazılana kadar bekle"""
+    for event in batch.sessions:
+        if event.type not in ("start", "end"):
+            raise HTTPException(status_code=422, detail=f"Bilinmeyen oturum olayı: {event.type}")
+        if event.type == "start" and not event.child_id:
+            raise HTTPException(status_code=422, detail="Oturum başlangıcı için child_id gerekli")
+        if event.type == "end" and not event.session_id:
+            raise HTTPException(status_code=422, detail="Oturum bitişi için session_id gerekli")
+
+    # Reject the whole batch up front rather than fail its flush later
+    started = {str(event.session_id) for event in batch.sessions if event.type == "start" and event.session_id}
+    unknown_children, unknown_sessions = ingestor.unknown_references(
+        db.connection(),
+        [str(r.child_id) for r in batch.ratings] + [str(e.child_id) for e in batch.sessions if e.type == "start"],
+        [str(e.session_id) for e in batch.sessions if e.type == "end" and str(e.session_id) not in started],
+    )
+    if unknown_children:
+        raise HTTPException(status_code=404, detail=f"Çocuk profili bulunamadı: {', '.join(sorted(unknown_children))}")
+    if unknown_sessions:
+        raise HTTPException(status_code=404, detail=f"Oturum bulunamadı: {', '.join(sorted(unknown_sessions))}")
+
+    session_ids = [
+        ingestor.start_session(str(event.child_id), current_user["id"], event.occurred_at,
+                               str(event.session_id) if event.session_id else None)
+        for event in batch.sessions if event.type == "start"
+    ]
+    rating_ids = [
+        ingestor.add_rating(str(r.child_id), r.activity_type, r.rating, r.activity_id, r.feedback_text, r.rated_at)
+        for r in batch.ratings
+    ]
+    for event in batch.sessions:
+        if event.type == "end":
+            ingestor.end_session(str(event.session_id), event.activities_completed, event.occurred_at)
+
+    if wait:
+        await ingestor.wait_flushed()
+    return {
+        "accepted": len(batch.ratings) + len(batch.sessions),
+        "rating_ids": rating_ids,
+        "session_ids": session_ids,
+        "flushed": wait,
+    }
+
 @app.post("/api/child/{child_id}/generate-report", response_model=BiweeklyReportResponse)
 async def generate_biweekly_report(
-    child_id: str,
+    child_id: UUID,
+    force: bool = False,
     current_user: dict = Depends(mock_get_current_user),
     db: Session = Depends(get_db)
 ):
-    """2 haftalık kapsamlı rapor oluştur"""
+    """2 haftalık kapsamlı rapor oluştur (veriler değişmediyse bugünkü rapor tekrar kullanılır)"""
     analytics = AnalyticsEngine(db)
-    report = await analytics.generate_biweekly_report(child_id, current_user["id"])
+    report = await analytics.generate_biweekly_report(str(child_id), current_user["id"], force=force)
     
     return BiweeklyReportResponse(
         id=report.id,
@@ -293,17 +370,84 @@ async def generate_biweekly_report(
         recommended_activities=report.recommended_activities or []
     )
 
+# Story search: the stories router's handler, with its query validation
+app.add_api_route("/api/stories/search", routes.search_stories, methods=["GET"])
+
+def _cohort_snapshot(max_age):
+    # Runs in the threadpool on its own connection; the first call scans every table
+    with BackgroundSessionLocal() as db:
+        return cohorts.get(db.connection(), max_age=max_age)
+
+@app.get("/api/analytics/cohorts")
+async def get_cohort_analytics(
+    refresh: bool = False,
+    current_user: dict = Depends(require_admin)
+):
+    """Tüm çocuklar genelinde yaş grubu, saat ve değer bazlı istatistikler (yalnızca yöneticiler)"""
+    return await run_in_threadpool(_cohort_snapshot, 0 if refresh else None)
+
+def _ranked_stories(child_id, parent_id, limit, max_age):
+    # Runs in the threadpool on its own connection; the first call folds every child, story and listen
+    with BackgroundSessionLocal() as db:
+        return recommender.get(db.connection(), child_id, parent_id, limit=limit, max_age=max_age)
+
+@app.get("/api/child/{child_id}/recommendations")
+async def get_story_recommendations(
+    child_id: str,
+    limit: int = Query(RECOMMEND_TOP_K, ge=1, le=RECOMMEND_TOP_K),
+    refresh: bool = False,
+    current_user: dict = Depends(mock_get_current_user),
+    db: Session = Depends(get_db)
+):
+    """Dinleme geçmişine göre çocuğa önerilen hikayeler (LLM çağrısı yapılmaz)"""
+    from app.models import Child, Story
+    
+    try:
+        child_id = str(UUID(child_id))
+    except ValueError:
+        raise HTTPException(status_code=404, detail="Çocuk profili bulunamadı")
+    if not db.query(Child.id).filter(Child.id == child_id, Child.parent_id == current_user["id"]).first():
+        raise HTTPException(status_code=404, detail="Çocuk profili bulunamadı")
+    
+    ranked = await run_in_threadpool(_ranked_stories, child_id, current_user["id"], limit, 0 if refresh else None)
+    
+    stories = {
+        row.id: row for row in db.query(
+            Story.id, Story.title, Story.values_taught, Story.cultural_elements, Story.duration
+        ).filter(Story.id.in_([item["story_id"] for item in ranked]))
+    }
+    return [
+        {
+            "id": item["story_id"],
+            "title": stories[item["story_id"]].title,
+            "values_taught": stories[item["story_id"]].values_taught or [],
+            "cultural_elements": stories[item["story_id"]].cultural_elements or [],
+            "duration": stories[item["story_id"]].duration,
+            "score": item["score"],
+        }
+        for item in ranked if item["story_id"] in stories
+    ]
+
 @app.get("/api/child/{child_id}/reports")
 async def get_child_reports(
-    child_id: str,
+    child_id: UUID,
     current_user: dict = Depends(mock_get_current_user),
     db: Session = Depends(get_db)
 ):
     """Çocuğun tüm raporlarını getir"""
     from app.models import BiweeklyReport
     
-    reports = db.query(BiweeklyReport).filter(
-        BiweeklyReport.child_id == child_id,
+    # Scalar columns only; the JSON sections are not loaded for the listing
+    reports = db.query(
+        BiweeklyReport.id,
+        BiweeklyReport.report_period_start,
+        BiweeklyReport.report_period_end,
+        BiweeklyReport.total_time_spent,
+        BiweeklyReport.activities_completed,
+        BiweeklyReport.voice_rating_avg,
+        BiweeklyReport.created_at
+    ).filter(
+        BiweeklyReport.child_id == str(child_id),
         BiweeklyReport.parent_id == current_user["id"]
     ).order_by(BiweeklyReport.created_at.desc()).all()
     
@@ -314,7 +458,7 @@ async def get_child_reports(
             "period_end": r.report_period_end,
             "total_time": r.total_time_spent,
             "activities": r.activities_completed,
-            "voice_rating_avg": r.voice_message_ratings.get("average_voice_rating", 0) if r.voice_message_ratings else 0,
+            "voice_rating_avg": r.voice_rating_avg or 0,
             "created_at": r.created_at
         } for r in reports
     ]
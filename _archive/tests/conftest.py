@@ -0,0 +1,58 @@
+"""
+Test setup - Import the archived app package against throwaway SQLite databases
+"""
+
+import importlib
+import os
+import sys
+from pathlib import Path
+
+import pytest
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+# app.database builds its engines at import; keep them off any configured server
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+
+from app.models import Base, User, Child  # noqa: E402
+
+
+@pytest.fixture
+def engine(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'atamind.db'}", connect_args={"check_same_thread": False})
+
+    @event.listens_for(engine, "connect")
+    def _foreign_keys(dbapi_connection, _):
+        dbapi_connection.execute("PRAGMA foreign_keys=ON")
+
+    Base.metadata.create_all(engine)
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def session_factory(engine):
+    return sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+
+@pytest.fixture
+def child(session_factory):
+    """A parent with one child; returns the child id"""
+    with session_factory() as db:
+        db.add(User(id="parent-1", email="veli@example.com"))
+        child = Child(parent_id="parent-1", name="Ayşe", age=6)
+        db.add(child)
+        db.commit()
+        return child.id
+
+
+@pytest.fixture
+def streamlit_module():
+    """Importer for modules of the Streamlit app's kokogretim package, at the repository root"""
+    if not (REPO_ROOT / "kokogretim").is_dir():
+        pytest.skip("kokogretim is not checked out next to the backend")
+    if str(REPO_ROOT) not in sys.path:
+        sys.path.append(str(REPO_ROOT))
+    return lambda name: importlib.import_module(f"kokogretim.{name}")
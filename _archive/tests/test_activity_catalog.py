@@ -0,0 +1,23 @@
+from app.ai_agents import activity_catalog
+
+
+def test_interests_match_derived_words():
+    assert activity_catalog.matching_terms(activity_catalog.interest_terms(["Müzik"]), ["muzikl", "masal"]) == {"muzik"}
+    ranked = activity_catalog.rank_content(
+        [{"title": "Uzay Macerası"}, {"title": "Müzikli masal"}], "5-6", interests=["müzik"])
+    assert ranked["recommended_content"] == "Müzikli masal"
+    assert ranked["recommended_option"]["reasons"] == ["İlgi alanı: muzik"]
+
+
+def test_short_terms_match_whole_words_only():
+    assert activity_catalog.matching_terms({"ol"}, ["olmak"]) == set()
+    assert activity_catalog.matching_terms({"ol"}, ["ol"]) == {"ol"}
+
+
+def test_unknown_age_is_not_the_oldest_band():
+    age, band, style, interests = activity_catalog.profile_fields({"interests": ["hayvanlar"]})
+    assert age is None and band is None
+    activities = activity_catalog.suggest_activities(None, style, interests)
+    assert activities
+    assert any("3-4" in activity["age_appropriateness"] for activity in activities)
+    assert activities[0]["score"] > 0  # interest points still count
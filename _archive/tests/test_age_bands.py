@@ -0,0 +1,23 @@
+from sqlalchemy import literal, select
+
+from app.ai_agents.developmental_stages import stage_key
+from app.cohort_analytics import age_band_expr
+from app.tracing import age_band
+
+AGES = range(0, 16)
+
+
+def test_span_band_is_the_developmental_stage():
+    assert [age_band(age) for age in AGES] == [stage_key(age) for age in AGES]
+    assert age_band(2) == "9-12"
+    assert age_band(None) is None
+
+
+def test_cohort_band_matches(engine):
+    with engine.connect() as conn:
+        assert [conn.execute(select(age_band_expr(literal(age)))).scalar() for age in AGES] == [stage_key(age) for age in AGES]
+
+
+def test_story_pool_band_matches(streamlit_module):
+    story_pool = streamlit_module("story_pool")
+    assert [story_pool.age_band(age) for age in AGES] == [stage_key(age) for age in AGES]
@@ -0,0 +1,11 @@
+import pytest
+
+from datagen.run import ExistingDataError, generate_dataset
+
+
+def test_rerun_needs_reset(tmp_path):
+    url = f"sqlite:///{tmp_path / 'scale.db'}"
+    first = generate_dataset(url, children=2, days=3)
+    with pytest.raises(ExistingDataError, match="--reset"):
+        generate_dataset(url, children=2, days=3)
+    assert generate_dataset(url, children=2, days=3, reset=True)["counts"] == first["counts"]
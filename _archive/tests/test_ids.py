@@ -0,0 +1,71 @@
+from datetime import datetime
+from uuid import UUID
+
+from sqlalchemy import text
+
+from app import ids
+from app.ids import id_timestamp, new_id, uuid7, uuid7_at
+from app.migrate_ids import migrate
+from app.models import ActivityRating, Child, ListeningHistory, Story, UsageSession
+
+
+def test_uuid7_is_monotonic():
+    generated = [uuid7() for _ in range(20000)]
+    assert all(u.version == 7 for u in generated)
+    assert generated == sorted(generated)
+    assert len(set(generated)) == len(generated)
+
+
+def test_uuid7_borrows_the_next_millisecond_when_the_counter_runs_out(monkeypatch):
+    monkeypatch.setattr(ids.time, "time_ns", lambda: 1_700_000_000_000 * 1_000_000)
+    generated = [uuid7() for _ in range(0x1000 + 10)]
+    assert generated == sorted(generated)
+    assert (generated[-1].int >> 80) > 1_700_000_000_000
+
+
+def test_id_timestamp():
+    at = datetime(2025, 3, 1, 12, 30)
+    assert id_timestamp(str(uuid7_at(at, 12345))) == at
+    assert id_timestamp(new_id()) is not None
+    assert id_timestamp("rating_1718000000.123") is None
+    assert id_timestamp("0b3e4f3c-8f0a-4d6e-9b43-5c1e2d6f7a80") is None  # uuid4
+
+
+def test_migrate_rewrites_legacy_ids(engine, session_factory, child):
+    legacy_child = "0b3e4f3c-8f0a-4d6e-9b43-5c1e2d6f7a80"
+    with engine.begin() as conn:
+        conn.execute(text(
+            "INSERT INTO children (id, parent_id, name, age, created_at) "
+            "VALUES (:id, 'parent-1', 'Can', 7, '2024-05-01 10:00:00')"), {"id": legacy_child})
+        conn.execute(text(
+            "INSERT INTO stories (id, user_id, child_id, title, content, created_at) "
+            "VALUES ('story_1714557600.5', 'parent-1', :child, 'Masal', 'Bir varmış', '2024-05-01 10:00:00')"),
+            {"child": legacy_child})
+        conn.execute(text(
+            "INSERT INTO listening_history (id, child_id, story_id, listened_at) "
+            "VALUES ('listen_1', :child, 'story_1714557600.5', '2024-05-02 09:00:00')"), {"child": legacy_child})
+        conn.execute(text(
+            "INSERT INTO activity_ratings (id, child_id, activity_type, rating, rated_at) "
+            "VALUES ('rating_1714640400.1', :child, 'story', 5, '2024-05-02 09:00:00')"), {"child": legacy_child})
+        conn.execute(text(
+            "INSERT INTO usage_sessions (id, child_id, parent_id, session_start) "
+            "VALUES (:id, :child, 'parent-1', '2024-05-02 08:55:00')"),
+            {"id": f"session_{legacy_child}_1714639500.0", "child": legacy_child})
+
+    counts = migrate(engine)
+    assert counts["children"] == 1 and counts["stories"] == 1 and counts["usage_sessions"] == 1
+    assert migrate(engine) == dict.fromkeys(counts, 0)
+
+    with session_factory() as db:
+        migrated = db.query(Child).filter(Child.name == "Can").one()
+        assert id_timestamp(migrated.id) == datetime(2024, 5, 1, 10)
+        assert sorted(c.id for c in db.query(Child)) == [migrated.id, child]
+        story = db.query(Story).one()
+        assert story.child_id == migrated.id
+        listen = db.query(ListeningHistory).one()
+        assert (listen.child_id, listen.story_id) == (migrated.id, story.id)
+        assert db.query(ActivityRating).one().child_id == migrated.id
+        session = db.query(UsageSession).one()
+        assert session.child_id == migrated.id
+        assert id_timestamp(session.id) == datetime(2024, 5, 2, 8, 55)
+        assert UUID(session.id).version == 7
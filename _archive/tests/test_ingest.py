@@ -0,0 +1,138 @@
+import asyncio
+import threading
+from datetime import datetime
+
+import pytest
+from sqlalchemy import select
+
+from app.ids import new_id
+from app.ingest import EventIngestor
+from app.models import ActivityRating, UsageSession
+from app.session_registry import registry
+
+
+def test_failed_batch_is_retried_per_event(session_factory, child):
+    ingestor = EventIngestor(session_factory=session_factory)
+    session_id = ingestor.start_session(child, "parent-1")
+    ingestor.add_rating(child, "story", 5)
+    ingestor.add_rating(new_id(), "story", 4)  # no such child: fails the batch insert
+    ingestor.end_session(session_id)
+
+    assert ingestor.flush() == 3
+    assert ingestor.stats["failed_flushes"] == 1
+    assert ingestor.stats["dropped_events"] == 1
+    [(kind, event, _)] = ingestor.dead_letters
+    assert kind == "rating" and event["rating"] == 4
+
+    with session_factory() as db:
+        assert db.scalars(select(ActivityRating.rating)).all() == [5]
+        session = db.get(UsageSession, session_id)
+        assert session.session_end is not None
+        assert session.activities_completed == 1
+    assert registry.lookup(child) is None
+
+
+def test_registry_unchanged_when_write_rolls_back(session_factory, child):
+    ingestor = EventIngestor(session_factory=session_factory)
+    session_id = new_id()
+    ingestor._write([], [{"id": session_id, "child_id": child, "parent_id": "parent-1",
+                          "session_start": None, "activities_completed": 0}], [])
+    assert registry.count(session_id) == 0
+
+    good = {"id": new_id(), "child_id": child, "activity_type": "game", "activity_id": None,
+            "rating": 3, "feedback_text": None, "rated_at": None}
+    bad = dict(good, id=new_id(), child_id=new_id())
+    with pytest.raises(Exception):
+        ingestor._write([good, bad], [], [])
+    assert registry.count(session_id) == 0
+
+    ingestor._write([good], [], [])
+    assert registry.count(session_id) == 1
+    registry.closed(session_id)
+
+
+def test_unknown_references(session_factory, child):
+    ingestor = EventIngestor(session_factory=session_factory)
+    buffered = ingestor.start_session(child, "parent-1")
+    missing_child, missing_session = new_id(), new_id()
+    with session_factory() as db:
+        children, sessions = ingestor.unknown_references(
+            db.connection(), [child, missing_child], [buffered, missing_session])
+    assert children == {missing_child}
+    assert sessions == {missing_session}
+
+
+def test_wait_flushed_writes_from_the_flush_task(session_factory, child):
+    async def run():
+        ingestor = EventIngestor(session_factory=session_factory, flush_interval=60)
+        ingestor.start()
+        ingestor.add_rating(child, "story", 5)
+        await asyncio.wait_for(ingestor.wait_flushed(), timeout=5)
+        await ingestor.stop()
+        return ingestor
+
+    ingestor = asyncio.run(run())
+    assert ingestor.stats == {"flushes": 1, "events": 1, "failed_flushes": 0, "retried_events": 0, "dropped_events": 0}
+    with session_factory() as db:
+        assert db.scalars(select(ActivityRating.child_id)).all() == [child]
+
+
+def test_wait_flushed_waits_for_the_flush_in_flight(session_factory, child):
+    release = threading.Event()
+
+    def slow_session():
+        release.wait(5)
+        return session_factory()
+
+    async def run():
+        ingestor = EventIngestor(session_factory=slow_session)
+        ingestor.add_rating(child, "story", 5)
+        flushing = asyncio.create_task(asyncio.to_thread(ingestor.flush))
+        while ingestor.pending:
+            await asyncio.sleep(0.01)  # buffer taken, write not committed yet
+        waiting = asyncio.create_task(ingestor.wait_flushed())
+        await asyncio.sleep(0.05)
+        assert not waiting.done()
+        release.set()
+        await asyncio.wait_for(waiting, timeout=5)
+        with session_factory() as db:
+            assert db.scalars(select(ActivityRating.child_id)).all() == [child]
+        await flushing
+
+    asyncio.run(run())
+
+
+def test_full_buffer_wakes_the_flush_task(session_factory, child):
+    async def run():
+        ingestor = EventIngestor(session_factory=session_factory, flush_interval=60, max_batch=2, max_pending=2)
+        ingestor.start()
+        ingestor.add_rating(child, "story", 5)
+        ingestor.add_rating(child, "story", 4)
+        assert ingestor.pending == 2  # not written inline on the loop
+        await asyncio.wait_for(ingestor.wait_flushed(), timeout=5)
+        await ingestor.stop()
+        return ingestor
+
+    assert asyncio.run(run()).stats["events"] == 2
+
+
+class _Archive:
+    def __init__(self, mark):
+        self.mark = mark
+
+    def watermark(self, table):
+        return self.mark
+
+
+def test_backdated_events_are_raised_to_the_archive_mark(session_factory, child):
+    mark = datetime(2026, 1, 10)
+    ingestor = EventIngestor(session_factory=session_factory, archive=_Archive(mark))
+    session_id = ingestor.start_session(child, "parent-1", started_at=datetime(2026, 1, 9))
+    ingestor.add_rating(child, "story", 5, rated_at=datetime(2026, 1, 9))
+    ingestor.add_rating(child, "story", 4, rated_at=datetime(2026, 1, 11))
+    ingestor.end_session(session_id, ended_at=datetime(2026, 1, 9, 1))
+    assert ingestor.flush() == 4
+
+    with session_factory() as db:
+        assert sorted(db.scalars(select(ActivityRating.rated_at))) == [mark, datetime(2026, 1, 11)]
+        assert db.get(UsageSession, session_id).session_end == mark
@@ -0,0 +1,48 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+from app import analytics_columnar as columnar
+from app.ids import new_id
+from app.models import ActivityRating, UsageSession
+from app.parquet_export import ParquetArchive
+
+pytest.importorskip("pyarrow")
+
+
+@pytest.fixture
+def archived(engine, session_factory, child, tmp_path):
+    """One closed session and one rating from three days ago, exported to Parquet"""
+    ended = datetime.now().replace(microsecond=0) - timedelta(days=3)
+    with session_factory() as db:
+        db.add(UsageSession(id=new_id(), child_id=child, parent_id="parent-1", session_start=ended - timedelta(minutes=20),
+                            session_end=ended, duration_minutes=20.0, activities_completed=2))
+        db.add(ActivityRating(id=new_id(), child_id=child, activity_type="story", rating=5, rated_at=ended))
+        db.commit()
+    archive = ParquetArchive(tmp_path / "analytics")
+    assert archive.export(engine, full=True, settle_seconds=0) == {
+        "usage_sessions": 1, "activity_ratings": 1, "listening_history": 0}
+    return archive, ended
+
+
+def test_report_rows_come_from_one_source(engine, child, archived):
+    archive, ended = archived
+    since = ended - timedelta(days=7)
+    with engine.connect() as conn:
+        assert len(columnar.load_sessions(conn, child, since, archive)) == 1
+        assert len(columnar.load_ratings(conn, child, since, archive)) == 1
+
+
+def test_files_ahead_of_the_saved_mark_are_not_read(engine, child, archived):
+    archive, ended = archived
+    # An export has moved its files in but not yet saved the new mark
+    state = archive.state()
+    for entry in state.values():
+        entry["watermark"] = (ended - timedelta(hours=1)).isoformat()
+    archive._save_state(state)
+    archive._state_mtime = None
+
+    since = ended - timedelta(days=7)
+    with engine.connect() as conn:
+        assert len(columnar.load_sessions(conn, child, since, archive)) == 1
+        assert len(columnar.load_ratings(conn, child, since, archive)) == 1
@@ -0,0 +1,90 @@
+import asyncio
+
+import pytest
+
+from app.analytics import AnalyticsEngine, report_window, _pending_reports
+from app.ids import new_id
+from app.models import ActivityRating, BiweeklyReport
+
+
+@pytest.fixture
+def analytics(session_factory, monkeypatch):
+    """Engine whose LLM steps return canned answers; counts the reports built"""
+    async def canned(self, *args):
+        return ["Daha fazla sesli hikaye"]
+
+    async def insights(self, *args):
+        await asyncio.sleep(0.05)  # long enough for concurrent requests to pile up
+        return {"güçlü_yönler": ["Hikaye dinleme"]}
+
+    for name in ("_generate_voice_improvement_suggestions", "_generate_activity_recommendations"):
+        monkeypatch.setattr(AnalyticsEngine, name, canned)
+    monkeypatch.setattr(AnalyticsEngine, "_generate_ai_insights", insights)
+
+    with session_factory() as db:
+        yield AnalyticsEngine(db)
+
+
+def _report(analytics, child, force=False):
+    return asyncio.run(analytics.generate_biweekly_report(child, "parent-1", force=force))
+
+
+def test_fingerprint_tracks_window_rollups(analytics, child):
+    start, end = report_window()
+    before = analytics.report_fingerprint(child, start, end)
+    assert analytics.report_fingerprint(child, start, end) == before
+
+    asyncio.run(analytics.record_activity_rating(child, "story", 4))
+    after = analytics.report_fingerprint(child, start, end)
+    assert after != before
+    # Every new rating moves it again
+    asyncio.run(analytics.record_activity_rating(child, "story", 4))
+    assert analytics.report_fingerprint(child, start, end) != after
+
+
+def test_report_reused_until_rollups_change(analytics, child):
+    first = _report(analytics, child)
+    assert _report(analytics, child).id == first.id
+
+    asyncio.run(analytics.record_activity_rating(child, "voice_message", 5))
+    second = _report(analytics, child)
+    assert second.id != first.id
+    assert second.rollup_fingerprint != first.rollup_fingerprint
+    assert _report(analytics, child).id == second.id
+
+    forced = _report(analytics, child, force=True)
+    assert forced.id != second.id
+    assert analytics.db.query(BiweeklyReport).count() == 3
+
+
+def test_concurrent_forced_reports_build_once(analytics, session_factory, child):
+    async def run():
+        with session_factory() as other:
+            return await asyncio.gather(
+                analytics.generate_biweekly_report(child, "parent-1", force=True),
+                AnalyticsEngine(other).generate_biweekly_report(child, "parent-1", force=True),
+            )
+
+    first, second = asyncio.run(run())
+    assert first.id == second.id
+    assert analytics.db.query(BiweeklyReport).count() == 1
+    assert not _pending_reports
+
+
+def test_waiters_rebuild_once_when_data_changes(analytics, session_factory, child):
+    async def run():
+        with session_factory() as b, session_factory() as c, session_factory() as writer:
+            building = asyncio.create_task(analytics.generate_biweekly_report(child, "parent-1"))
+            await asyncio.sleep(0.01)
+            waiting = [asyncio.create_task(AnalyticsEngine(db).generate_biweekly_report(child, "parent-1"))
+                       for db in (b, c)]
+            await asyncio.sleep(0.01)
+            # New data while the first build runs: the waiters need a newer report
+            writer.add(ActivityRating(id=new_id(), child_id=child, activity_type="story", rating=3))
+            writer.commit()
+            return await asyncio.gather(building, *waiting)
+
+    first, second, third = asyncio.run(run())
+    assert second.id == third.id != first.id
+    assert analytics.db.query(BiweeklyReport).count() == 2
+    assert not _pending_reports
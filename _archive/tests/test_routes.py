@@ -0,0 +1,37 @@
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app import routes
+from app.database import get_db
+from app.ids import new_id
+
+
+@pytest.fixture
+def client(session_factory):
+    app = FastAPI()
+    app.include_router(routes.children_router, prefix="/api/children")
+    app.include_router(routes.stories_router, prefix="/api/stories")
+
+    def db():
+        with session_factory() as session:
+            yield session
+
+    app.dependency_overrides[get_db] = db
+    return TestClient(app)
+
+
+@pytest.mark.parametrize("path", [
+    "/api/children/child_1718000000",
+    "/api/stories/story_1718000000",
+    "/api/stories/?child_id=not-a-uuid",
+    "/api/stories/search?q=masal&child_id=not-a-uuid",
+])
+def test_malformed_ids_are_rejected(client, path):
+    assert client.get(path).status_code == 422
+
+
+def test_unknown_ids_are_not_found(client):
+    assert client.get(f"/api/children/{new_id()}").status_code == 404
+    assert client.get(f"/api/stories/{new_id()}").status_code == 404
+    assert client.get(f"/api/stories/?child_id={new_id()}").json() == []
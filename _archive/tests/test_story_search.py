@@ -0,0 +1,36 @@
+from app.models import Story
+from app.story_search import search_stories
+from app.turkish_text import search_document, tokens
+
+
+def _titles(db, query):
+    total, hits = search_stories(db, query, user_id="parent-1")
+    return total, [story.title for story, _ in hits]
+
+
+def test_tokens_fold_and_stem():
+    assert tokens("SAYGI") == tokens("saygıyı") == tokens("Saygı") == ["sayk"]
+    assert tokens("Keloğlan'ın kitabı ve rengi") == ["keloglan", "kitap", "renk"]
+
+
+def test_search_document_follows_edits(session_factory, child):
+    with session_factory() as db:
+        story = Story(user_id="parent-1", child_id=child, title="Keloğlan ve Dev",
+                      content="Bir varmış bir yokmuş.", values_taught=["Cesaret"])
+        db.add(story)
+        db.commit()
+        assert _titles(db, "keloğlan") == (1, ["Keloğlan ve Dev"])
+
+        story.title = "Nasreddin Hoca"
+        story.values_taught = ["Saygı"]
+        db.commit()
+        assert story.search_document == search_document("Nasreddin Hoca", "Bir varmış bir yokmuş.", ["Saygı"])
+        assert _titles(db, "nasreddin") == (1, ["Nasreddin Hoca"])
+        assert _titles(db, "saygıyı") == (1, ["Nasreddin Hoca"])
+        assert _titles(db, "keloğlan") == (0, [])
+        assert _titles(db, "cesaret") == (0, [])
+
+        document = story.search_document
+        story.duration = 5.0
+        db.commit()
+        assert story.search_document == document
@@ -0,0 +1,14 @@
+import pytest
+
+
+@pytest.fixture
+def telemetry(streamlit_module):
+    return streamlit_module("telemetry")
+
+
+def test_zero_limits_count_as_unlimited(telemetry, tmp_path, monkeypatch):
+    monkeypatch.setitem(telemetry.QUOTAS, "gemini", {"rpm": 0, "tpm": 0, "rpd": 0})
+    assert telemetry.Telemetry(tmp_path).quota("gemini")["remaining_ratio"] == 1.0
+
+    monkeypatch.setitem(telemetry.QUOTAS, "gemini", {"rpm": 10, "tpm": 0, "rpd": 0})
+    assert telemetry.Telemetry(tmp_path).quota("gemini")["remaining_ratio"] == 1.0
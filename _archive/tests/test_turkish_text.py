@@ -0,0 +1,28 @@
+import json
+from pathlib import Path
+
+import pytest
+
+from app import turkish_text
+
+CASES = json.loads((Path(__file__).parent / "search_terms.json").read_text(encoding="utf-8"))
+
+
+@pytest.fixture
+def streamlit_search(streamlit_module):
+    return streamlit_module("search")
+
+
+@pytest.fixture(params=["backend", "streamlit"])
+def implementation(request):
+    return turkish_text if request.param == "backend" else request.getfixturevalue("streamlit_search")
+
+
+@pytest.mark.parametrize("case", CASES, ids=[case["text"] or "empty" for case in CASES])
+def test_search_terms(implementation, case):
+    assert implementation.tokens(case["text"]) == case["terms"]
+
+
+def test_same_stopwords_and_stem_length(streamlit_search):
+    assert turkish_text.STOPWORDS == streamlit_search.STOPWORDS
+    assert turkish_text.MIN_STEM == streamlit_search.MIN_STEM
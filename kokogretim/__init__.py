@@ -0,0 +1,3 @@
+"""
+KökÖğreti - Shared helpers for the Streamlit application
+"""
@@ -0,0 +1,142 @@
+"""
+Chart data and figures for the Streamlit dashboards
+
+Data loaders are cached with st.cache_data, keyed on child, date range and the
+story store's write version: a new story changes the version and invalidates
+the entry at once, the TTL bounds staleness otherwise. Figures are built once
+per data key with st.cache_resource and reused across reruns and sessions.
+"""
+
+from datetime import date, timedelta
+from typing import Dict, Optional
+
+import pandas as pd
+import plotly.express as px
+import streamlit as st
+
+CHART_TTL = 600  # seconds
+NARRATION_WPM = 100  # words per minute when stories are read aloud to children
+
+WEEKDAYS = ['Pazartesi', 'Salı', 'Çarşamba', 'Perşembe', 'Cuma', 'Cumartesi', 'Pazar']
+PALETTE = ['#98FB98', '#90EE90', '#8FBC8F', '#87CEEB', '#98FB98', '#F0FFF0']
+
+# Showcase numbers used until the store has real activity
+DEMO_DAILY_STORIES = [12, 8, 15, 6, 11, 9, 14]
+DEMO_DAILY_MINUTES = [45, 32, 58, 28, 41, 35, 52]
+DEMO_VALUE_COUNTS = {'Saygı': 28, 'Dürüstlük': 22, 'Paylaşım': 18, 'Sevgi': 25, 'Misafirperverlik': 15, 'Diğer': 12}
+
+
+def _style(fig, **layout):
+    fig.update_layout(
+        plot_bgcolor='rgba(0,0,0,0)',
+        paper_bgcolor='rgba(0,0,0,0)',
+        font_color='#2F4F2F',
+        **layout
+    )
+    return fig
+
+
+def last_days(days: int = 7):
+    """Inclusive (start, end) date range ending today"""
+    end = date.today()
+    return end - timedelta(days=days - 1), end
+
+
+# Data access
+
+@st.cache_data(ttl=CHART_TTL, max_entries=256)
+def load_daily_activity(_store, user_id: str, child_name: Optional[str], start: date, end: date, version: int) -> pd.DataFrame:
+    """Stories and narration minutes per day; `version` is the store write version"""
+    days = pd.date_range(start, end, freq="D")
+    rows = _store.daily_activity(user_id, start, end, child_name)
+    if not rows:
+        stories = DEMO_DAILY_STORIES[:len(days)]
+        minutes = DEMO_DAILY_MINUTES[:len(days)]
+        return pd.DataFrame({'Tarih': days[::-1][:len(stories)], 'Hikaye Sayısı': stories, 'Dinleme Süresi (dk)': minutes})
+
+    df = pd.DataFrame(rows)
+    df['Tarih'] = pd.to_datetime(df.pop('day'))
+    df = df.set_index('Tarih').reindex(days, fill_value=0).rename_axis('Tarih').reset_index()
+    df['Dinleme Süresi (dk)'] = (df['words'] / NARRATION_WPM).round(1)
+    return df.rename(columns={'stories': 'Hikaye Sayısı'})[['Tarih', 'Hikaye Sayısı', 'Dinleme Süresi (dk)']]
+
+
+@st.cache_data(ttl=CHART_TTL, max_entries=256)
+def load_value_counts(_store, user_id: str, child_name: Optional[str], version: int) -> Dict[str, int]:
+    """Stories per taught value; `version` is the store write version"""
+    return _store.value_counts(user_id, child_name) or DEMO_VALUE_COUNTS
+
+
+# Figures
+
+@st.cache_resource(ttl=CHART_TTL, max_entries=64)
+def activity_line_figure(_store, user_id: str, child_name: Optional[str], start: date, end: date, version: int):
+    """Home page activity chart for the date range"""
+    df = load_daily_activity(_store, user_id, child_name, start, end, version).copy()
+    df['Tarih'] = df['Tarih'].dt.strftime('%d/%m/%Y')
+    fig = px.line(df, x='Tarih', y=['Hikaye Sayısı', 'Dinleme Süresi (dk)'],
+                  title="Son 7 Günün Aktivite Grafiği",
+                  color_discrete_sequence=['#98FB98', '#90EE90'])
+    return _style(fig)
+
+
+@st.cache_resource(ttl=CHART_TTL, max_entries=64)
+def weekly_activity_figure(_store, user_id: str, child_name: Optional[str], start: date, end: date, version: int):
+    """Stories per weekday for the date range"""
+    df = load_daily_activity(_store, user_id, child_name, start, end, version)
+    weekly = df.groupby(df['Tarih'].dt.dayofweek)['Hikaye Sayısı'].sum().reindex(range(7), fill_value=0)
+    fig = px.bar(x=WEEKDAYS, y=weekly.values,
+                 labels={'x': 'Gün', 'y': 'Hikaye Sayısı'},
+                 title="📅 Haftalık Hikaye Dinleme Aktivitesi",
+                 color_discrete_sequence=['#98FB98'])
+    return _style(fig)
+
+
+@st.cache_resource(ttl=CHART_TTL, max_entries=64)
+def values_pie_figure(_store, user_id: str, child_name: Optional[str], version: int):
+    """Story distribution by taught value"""
+    counts = load_value_counts(_store, user_id, child_name, version)
+    fig = px.pie(values=list(counts.values()), names=list(counts.keys()),
+                 title="🎯 Değerlere Göre Hikaye Dağılımı",
+                 color_discrete_sequence=PALETTE)
+    return _style(fig)
+
+
+@st.cache_resource
+def development_figure():
+    """Monthly development chart"""
+    development_data = {
+        'Ay': ['Ocak', 'Şubat', 'Mart', 'Nisan', 'Mayıs', 'Haziran', 'Temmuz', 'Ağustos'],
+        'Sosyal Gelişim': [70, 75, 78, 82, 85, 88, 91, 94],
+        'Dil Gelişimi': [65, 70, 74, 79, 83, 87, 90, 93],
+        'Kültürel Farkındalık': [60, 68, 73, 78, 82, 86, 89, 92]
+    }
+    fig = px.line(development_data, x='Ay', y=['Sosyal Gelişim', 'Dil Gelişimi', 'Kültürel Farkındalık'],
+                  title="👶 Aylık Gelişim Grafiği (%)",
+                  color_discrete_sequence=['#98FB98', '#90EE90', '#8FBC8F'])
+    return _style(fig)
+
+
+@st.cache_resource
+def emotional_tone_figure():
+    """Voice analytics emotional tone chart"""
+    emotions = ['Sevgi Dolu', 'Destekleyici', 'Öğretici', 'Sabırlı', 'Koruyucu']
+    scores = [92, 88, 85, 90, 86]
+    fig = px.bar(x=emotions, y=scores,
+                 title="💖 Duygusal Ton Analizi",
+                 color=scores,
+                 color_continuous_scale=['#F0FFF0', '#98FB98', '#228B22'])
+    return _style(fig, showlegend=False)
+
+
+@st.cache_resource
+def parenting_style_figure():
+    """Voice analytics parenting style chart"""
+    parenting_styles = {
+        'Stil': ['Destekleyici', 'Demokratik', 'Öğretici', 'Koruyucu'],
+        'Yüzde': [35, 30, 25, 10]
+    }
+    fig = px.pie(parenting_styles, values='Yüzde', names='Stil',
+                 title="🎯 Ebeveynlik Stili Dağılımı",
+                 color_discrete_sequence=['#98FB98', '#90EE90', '#8FBC8F', '#87CEEB'])
+    return _style(fig)
@@ -0,0 +1,139 @@
+"""
+Client Registry - Process-wide Gemini and OpenAI clients with health probing
+
+The registry builds each client once, warms it with a cheap metadata call so
+the connection and TLS handshake are done before the first user request, and
+re-probes the services from a background thread. `status()` only reads the
+last probe results and never touches the network, so it is safe to call on
+every Streamlit rerun.
+"""
+
+import os
+import threading
+import time
+from datetime import datetime
+from typing import Dict, Any, Optional
+
+GEMINI_MODEL = "gemini-2.5-flash"
+PROBE_INTERVAL = int(os.getenv("CLIENT_PROBE_INTERVAL", "60"))  # seconds
+PROBE_TIMEOUT = 10  # seconds
+SLOW_PROBE_MS = 2000  # probes slower than this mark a service as degraded
+
+# Service states reported by status()
+MISSING_KEY = "missing_key"
+STARTING = "starting"
+HEALTHY = "healthy"
+DEGRADED = "degraded"
+DOWN = "down"
+
+
+def _is_rate_limited(error: Exception) -> bool:
+    text = f"{type(error).__name__} {error}".lower()
+    return "429" in text or "ratelimit" in text or "rate limit" in text or "resourceexhausted" in text or "quota" in text
+
+
+class ClientRegistry:
+    """Builds, warms and monitors the LLM clients used by the app"""
+
+    def __init__(self, probe_interval: int = PROBE_INTERVAL):
+        self.probe_interval = probe_interval
+        self.gemini_model = None
+        self.openai_client = None
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._built = threading.Event()
+        self._status: Dict[str, Dict[str, Any]] = {
+            "gemini": self._entry(STARTING if os.getenv("GEMINI_API_KEY") else MISSING_KEY),
+            "openai": self._entry(STARTING if os.getenv("OPENAI_API_KEY") else MISSING_KEY),
+        }
+
+    @staticmethod
+    def _entry(state: str, latency_ms: Optional[float] = None, error: Optional[str] = None) -> Dict[str, Any]:
+        return {
+            "state": state,
+            "latency_ms": latency_ms,
+            "error": error,
+            "checked_at": datetime.now().isoformat(),
+        }
+
+    def _set(self, service: str, entry: Dict[str, Any]):
+        with self._lock:
+            self._status[service] = entry
+
+    # Construction
+
+    def _build(self):
+        if os.getenv("GEMINI_API_KEY"):
+            try:
+                import google.generativeai as genai
+                genai.configure(api_key=os.getenv("GEMINI_API_KEY"))
+                self.gemini_model = genai.GenerativeModel(GEMINI_MODEL)
+            except Exception as e:
+                print(f"Gemini client error: {e}")
+                self._set("gemini", self._entry(DOWN, error=str(e)))
+
+        if os.getenv("OPENAI_API_KEY"):
+            try:
+                import openai
+                self.openai_client = openai.OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+            except Exception as e:
+                print(f"OpenAI client error: {e}")
+                self._set("openai", self._entry(DOWN, error=str(e)))
+
+    # Probing
+
+    def _probe_gemini(self):
+        import google.generativeai as genai
+        from google.api_core.retry import Retry
+        genai.get_model(f"models/{GEMINI_MODEL}", request_options={"timeout": PROBE_TIMEOUT, "retry": Retry(timeout=PROBE_TIMEOUT)})
+
+    def _probe_openai(self):
+        self.openai_client.with_options(timeout=PROBE_TIMEOUT, max_retries=0).models.list()
+
+    def _probe(self, service: str, probe):
+        started = time.perf_counter()
+        try:
+            probe()
+        except Exception as e:
+            state = DEGRADED if _is_rate_limited(e) else DOWN
+            self._set(service, self._entry(state, error=str(e)))
+            return
+        latency_ms = round((time.perf_counter() - started) * 1000, 1)
+        self._set(service, self._entry(HEALTHY if latency_ms < SLOW_PROBE_MS else DEGRADED, latency_ms))
+
+    def probe(self):
+        """Probe every configured client once; also serves as the warm-up call"""
+        if self.gemini_model is not None:
+            self._probe("gemini", self._probe_gemini)
+        if self.openai_client is not None:
+            self._probe("openai", self._probe_openai)
+
+    def _run(self):
+        self._build()
+        self._built.set()
+        self.probe()
+        while not self._stop.wait(self.probe_interval):
+            self.probe()
+
+    def start(self) -> "ClientRegistry":
+        """Build and warm the clients in the background, then keep probing"""
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="client-registry", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+
+    # Accessors
+
+    def clients(self, timeout: float = PROBE_TIMEOUT):
+        """(gemini_model, openai_client); waits for construction on a cold start"""
+        self._built.wait(timeout)
+        return self.gemini_model, self.openai_client
+
+    def status(self) -> Dict[str, Dict[str, Any]]:
+        """Last known state of every service; never makes a network call"""
+        with self._lock:
+            return {service: dict(entry) for service, entry in self._status.items()}
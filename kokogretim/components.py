@@ -0,0 +1,39 @@
+"""
+UI components shared by several Streamlit pages
+"""
+
+import streamlit as st
+
+
+def show_games_section(story, values):
+    """Show educational games based on the story"""
+    st.markdown("### 🎮 Hikaye Tabanlı Oyunlar")
+    
+    games_col1, games_col2 = st.columns(2)
+    
+    with games_col1:
+        st.markdown("""
+        <div class="story-card">
+            <h4>🧩 Değer Eşleştirme Oyunu</h4>
+            <p>Hikayedeki karakterleri ve değerleri eşleştirin!</p>
+        </div>
+        """, unsafe_allow_html=True)
+        
+        # Simple matching game
+        if st.button("🎯 Oyunu Başlat", key="matching_game"):
+            st.balloons()
+            st.success("🎉 Harika! Tüm değerleri doğru eşleştirdin!")
+    
+    with games_col2:
+        st.markdown("""
+        <div class="story-card">
+            <h4>📝 Hikaye Tamamlama</h4>
+            <p>Hikayenin eksik kısımlarını tamamlayın!</p>
+        </div>
+        """, unsafe_allow_html=True)
+        
+        # Story completion game
+        if st.button("✏️ Hikaye Devamı", key="story_completion"):
+            st.text_area("Hikayenin devamını yaz:", height=100)
+            if st.button("Gönder", key="submit_story"):
+                st.success("🌟 Harika bir devam yazdın!")
@@ -0,0 +1,79 @@
+"""
+Shared Streamlit resources used by the app shell and its pages
+
+Kept free of LLM and charting imports so loading it stays cheap on every rerun;
+the client registry imports the LLM SDKs on its own background thread.
+"""
+
+import os
+from datetime import date, timedelta
+
+import streamlit as st
+
+from .clients import ClientRegistry
+from .story_store import StoryStore
+
+LIBRARY_PAGE_SIZE = 5
+
+# Comma-separated user ids allowed to see the system monitoring page
+ADMIN_USER_IDS = frozenset(u.strip() for u in os.getenv("ADMIN_USER_IDS", "").split(",") if u.strip())
+
+
+@st.cache_resource
+def load_client_registry():
+    """LLM clients shared by all sessions; built and warmed in the background"""
+    return ClientRegistry().start()
+
+
+@st.cache_resource
+def load_story_store():
+    """Story persistence shared by all sessions"""
+    return StoryStore()
+
+
+@st.cache_data(ttl=300)
+def cached_story_count(user_id, version):
+    """Saved story count; `version` changes after every store write"""
+    return load_story_store().count_stories(user_id)
+
+
+@st.cache_data(ttl=300)
+def cached_story_page(user_id, page, version):
+    """One library page; `version` changes after every store write"""
+    offset = (page - 1) * LIBRARY_PAGE_SIZE
+    return load_story_store().list_stories(user_id, LIBRARY_PAGE_SIZE, offset)
+
+
+@st.cache_data(ttl=300)
+def cached_search_page(user_id, query, page, version):
+    """(total matches, one page of search results); `version` changes after every store write"""
+    offset = (page - 1) * LIBRARY_PAGE_SIZE
+    return load_story_store().search_stories(user_id, query, LIBRARY_PAGE_SIZE, offset)
+
+
+@st.cache_data(ttl=300)
+def cached_usage_counts(user_id, version):
+    """(all stories, children) for the sidebar; `version` changes after every store write"""
+    store = load_story_store()
+    return store.count_stories(user_id, saved_only=False), store.count_children(user_id)
+
+
+@st.cache_data(ttl=300)
+def cached_weekly_totals(user_id, version):
+    """(stories, words) of the last 7 days and distinct values taught; `version` changes after every store write"""
+    store = load_story_store()
+    end = date.today()
+    rows = store.daily_activity(user_id, end - timedelta(days=6), end)
+    stories = sum(row["stories"] for row in rows)
+    words = sum(row["words"] or 0 for row in rows)
+    return stories, words, len(store.value_counts(user_id))
+
+
+def current_user_id():
+    """Owner id for stored stories"""
+    return st.session_state.user_name or "demo"
+
+
+def is_admin():
+    """Whether the current user is listed in ADMIN_USER_IDS"""
+    return current_user_id() in ADMIN_USER_IDS
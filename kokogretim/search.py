@@ -0,0 +1,70 @@
+"""
+Story search terms - Turkish folding and light stemming for the library index
+
+Titles, content, values and cultural elements are reduced to folded, stemmed
+terms and stored in the story store's `search_document` column, which an FTS5
+table indexes. Queries are tokenized the same way and every term must match
+as a prefix, so "SAYGI", "saygıyı" and "Saygı" all find a story about Saygı.
+The FastAPI backend keeps a copy (_archive/app/turkish_text); both are tested
+against _archive/tests/search_terms.json.
+"""
+
+import re
+from typing import Iterable, List, Optional
+
+from .text import ascii_fold, turkish_lower
+
+_NON_WORD = re.compile(r"[^a-z0-9]+")
+_APOSTROPHE_SUFFIX = re.compile(r"['’]\w+")
+
+# Inflectional suffixes in folded form, longest first
+_SUFFIXES = sorted({
+    "lerinden", "larindan", "lerinde", "larinda", "lerine", "larina", "lerini", "larini",
+    "lerin", "larin", "leri", "lari", "ler", "lar",
+    "ndan", "nden", "dan", "den", "tan", "ten", "nda", "nde", "da", "de", "ta", "te",
+    "nin", "nun", "yla", "yle", "ya", "ye", "yi", "yu", "in", "un",
+    "si", "su", "na", "ne", "ni", "nu", "i", "u", "a", "e",
+}, key=len, reverse=True)
+_DEVOICE = {"b": "p", "d": "t", "g": "k"}
+MIN_STEM = 3
+
+STOPWORDS = frozenset({
+    "ve", "ile", "bir", "bu", "su", "o", "da", "de", "ki", "mi", "mu", "icin", "gibi",
+    "cok", "ama", "ya", "ne", "en", "daha", "her", "olan", "diye",
+})
+
+
+def fold(text: Optional[str]) -> str:
+    """Turkish lowercase, ASCII-folded, punctuation replaced by single spaces"""
+    folded = ascii_fold(turkish_lower(_APOSTROPHE_SUFFIX.sub("", text or "")))
+    return " ".join(_NON_WORD.sub(" ", folded).split())
+
+
+def stem(word: str) -> str:
+    """Strip up to three suffixes (keeping MIN_STEM letters) and devoice the last consonant"""
+    for _ in range(3):
+        for suffix in _SUFFIXES:
+            if word.endswith(suffix) and len(word) - len(suffix) >= MIN_STEM:
+                word = word[:-len(suffix)]
+                break
+        else:
+            break
+    return word[:-1] + _DEVOICE[word[-1]] if word[-1] in _DEVOICE else word
+
+
+def tokens(text: Optional[str]) -> List[str]:
+    """Stemmed search terms, stopwords and single letters dropped"""
+    return [stem(word) for word in fold(text).split() if len(word) > 1 and word not in STOPWORDS]
+
+
+def search_document(title: Optional[str], content: Optional[str], values: Optional[Iterable[str]] = None,
+                    cultural_elements: Optional[Iterable[str]] = None) -> str:
+    """Indexed text of a story: title, values, cultural elements, then content"""
+    parts = [title, " ".join(values or []), " ".join(cultural_elements or []), content]
+    return " ".join(term for part in parts for term in tokens(part))
+
+
+def match_expression(query: str) -> Optional[str]:
+    """FTS5 MATCH expression requiring every query term as a prefix; None if nothing to search"""
+    terms = tokens(query)
+    return " AND ".join(f'"{term}"*' for term in terms) if terms else None
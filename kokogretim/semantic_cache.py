@@ -0,0 +1,200 @@
+"""
+Semantic Story Cache - Reuse stories generated for near-identical requests
+
+Candidates are the stored stories with the same age band and value set; among
+those, the normalized parent message is embedded and compared by brute-force
+cosine similarity over a NumPy matrix kept on disk. Only the message is
+embedded: band and values are exact filters, and a shared "band | values"
+prefix in every text would push unrelated messages over the threshold.
+Stored stories are templatized with the story pool's name slots so a match can
+be re-personalized for another child without an LLM call.
+"""
+
+import json
+import os
+import re
+import threading
+import zlib
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Any, Optional, Iterable
+
+import numpy as np
+
+from .story_pool import age_band, inflect_name, personalize, NAME_SLOTS
+from .telemetry import get_telemetry, usage_tokens
+from .text import normalize, value_keys
+
+DEFAULT_CACHE_DIR = Path(os.getenv("STORY_CACHE_DIR", "data/semantic_cache"))
+MAX_ENTRIES = 5000
+INDEX_FORMAT = "message-v2"  # what the stored vectors embed; older indexes are discarded
+
+
+def normalize_message(message: str) -> str:
+    """Lowercase (Turkish rules), strip punctuation and collapse whitespace"""
+    return normalize(message)
+
+
+def request_text(message: str) -> str:
+    """Canonical text that gets embedded for a request"""
+    return normalize_message(message)
+
+
+def templatize(text: str, child_name: str) -> str:
+    """Replace a child's name (and its inflected forms) with pool name slots"""
+    if not child_name:
+        return text
+    for slot, case in NAME_SLOTS.items():
+        if case != "nominative":
+            text = text.replace(inflect_name(child_name, case), slot)
+    return re.sub(rf"\b{re.escape(child_name)}\b", "{isim}", text)
+
+
+class HashingEmbedder:
+    """Local character-trigram embedder; no API call, good for near-duplicates"""
+
+    name = "hashing-3gram-512"
+    threshold = 0.88  # sample paraphrases score >= 0.93, different wishes <= 0.77
+
+    def __init__(self, dim: int = 512):
+        self.dim = dim
+
+    def __call__(self, texts: List[str]) -> np.ndarray:
+        vectors = np.zeros((len(texts), self.dim), dtype=np.float32)
+        for row, text in enumerate(texts):
+            padded = f"  {text}  "
+            for i in range(len(padded) - 2):
+                bucket = zlib.crc32(padded[i:i + 3].encode("utf-8")) % self.dim
+                vectors[row, bucket] += 1.0
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        return vectors / np.maximum(norms, 1e-12)
+
+
+class OpenAIEmbedder:
+    """OpenAI text-embedding-3-small, same model as server/utils/embeddings.ts"""
+
+    name = "text-embedding-3-small"
+    threshold = 0.92
+
+    def __init__(self, client):
+        self.client = client
+
+    def __call__(self, texts: List[str]) -> np.ndarray:
+        with get_telemetry().track("llm", "embedding", provider="openai") as call:
+            response = self.client.embeddings.create(model=self.name, input=texts)
+            call.update(usage_tokens(response))
+        vectors = np.array([item.embedding for item in response.data], dtype=np.float32)
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        return vectors / np.maximum(norms, 1e-12)
+
+
+class SemanticStoryCache:
+    """Near-duplicate story lookup backed by a brute-force vector index"""
+
+    def __init__(self, embedder=None, cache_dir: Path = DEFAULT_CACHE_DIR, threshold: Optional[float] = None):
+        self.embedder = embedder or HashingEmbedder()
+        self.threshold = threshold if threshold is not None else self.embedder.threshold
+        self.cache_dir = Path(cache_dir)
+        self._lock = threading.Lock()
+        self.entries: List[Dict[str, Any]] = []
+        self.vectors: Optional[np.ndarray] = None
+        self._load()
+
+    @property
+    def _vectors_path(self) -> Path:
+        return self.cache_dir / "vectors.npy"
+
+    @property
+    def _entries_path(self) -> Path:
+        return self.cache_dir / "entries.json"
+
+    def _load(self):
+        if not (self._vectors_path.exists() and self._entries_path.exists()):
+            return
+        try:
+            with open(self._entries_path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            # Vectors from another embedder or text format are not comparable
+            if data.get("embedder") != self.embedder.name or data.get("format") != INDEX_FORMAT:
+                return
+            self.entries = data["entries"]
+            self.vectors = np.load(self._vectors_path)
+        except Exception as e:
+            print(f"Semantic cache load error: {e}")
+            self.entries, self.vectors = [], None
+
+    def _save(self):
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        np.save(self._vectors_path, self.vectors)
+        with open(self._entries_path, "w", encoding="utf-8") as f:
+            json.dump({"embedder": self.embedder.name, "format": INDEX_FORMAT, "entries": self.entries}, f, ensure_ascii=False)
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def lookup(self, age: int, values: Iterable[str], parent_message: str) -> Optional[Dict[str, Any]]:
+        """Best stored story for the same age band and values above the threshold"""
+        with get_telemetry().track("cache", "semantic_cache") as call:
+            entry = self._lookup(age, values, parent_message)
+            call["cache"] = "hit" if entry else "miss"
+        return entry
+
+    def _lookup(self, age: int, values: Iterable[str], parent_message: str) -> Optional[Dict[str, Any]]:
+        band, keys = age_band(age), value_keys(values)
+        # add() appends and trims both together; read a consistent pair
+        with self._lock:
+            entries, vectors = self.entries, self.vectors
+        if not entries:
+            return None
+        candidates = [
+            i for i, entry in enumerate(entries)
+            if entry["age_band"] == band and value_keys(entry["values"]) == keys
+        ]
+        if not candidates:
+            return None
+        try:
+            query = self.embedder([request_text(parent_message)])[0]
+        except Exception as e:
+            print(f"Semantic cache embedding error: {e}")
+            return None
+
+        scores = vectors[candidates] @ query
+        best = int(np.argmax(scores))
+        if scores[best] < self.threshold:
+            return None
+        return {**entries[candidates[best]], "similarity": float(scores[best])}
+
+    def add(self, age: int, values: Iterable[str], parent_message: str, child_name: str, title: str, content: str):
+        """Store a freshly generated story for later reuse"""
+        band, value_set = age_band(age), sorted(values)
+        try:
+            vector = self.embedder([request_text(parent_message)])
+        except Exception as e:
+            print(f"Semantic cache embedding error: {e}")
+            return
+
+        entry = {
+            "age_band": band,
+            "values": value_set,
+            "parent_message": parent_message,
+            "title": templatize(title, child_name),
+            "content": templatize(content, child_name),
+            "created_at": datetime.now().isoformat(),
+        }
+        with self._lock:
+            # New list and matrix rather than in-place changes, so a lookup's snapshot stays valid
+            entries = (self.entries + [entry])[-MAX_ENTRIES:]
+            vectors = vector if self.vectors is None else np.vstack([self.vectors, vector])[-MAX_ENTRIES:]
+            self.entries, self.vectors = entries, vectors
+            self._save()
+
+    def render(self, entry: Dict[str, Any], child_name: str) -> Dict[str, Any]:
+        """Re-personalize a cached story for a child"""
+        return {
+            "title": personalize(entry["title"], child_name),
+            "content": personalize(entry["content"], child_name),
+            "values": entry["values"],
+            "age_band": entry["age_band"],
+            "source": "semantic_cache",
+            "similarity": entry.get("similarity"),
+        }
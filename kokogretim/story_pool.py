@@ -0,0 +1,320 @@
+"""
+Story Pool - Pregenerated, Guardian-validated template stories for common requests
+
+Build the pool offline (requires GEMINI_API_KEY):
+
+    python -m kokogretim.story_pool --variants 2 --max-values 2
+
+At request time the Streamlit app picks a template for the child's age band and
+selected values and fills in the child's name locally, so default-ish requests
+never reach the LLM.
+"""
+
+import argparse
+import json
+import os
+import random
+import re
+from datetime import datetime
+from itertools import combinations
+from pathlib import Path
+from typing import Dict, List, Any, Optional, Callable, Iterable, Tuple
+
+from .telemetry import get_telemetry
+from .text import normalize, turkish_lower, value_keys
+
+# Values offered by show_story_generation
+STORY_VALUES = [
+    "Saygı", "Dürüstlük", "Paylaşım", "Sevgi",
+    "Misafirperverlik", "Aile Bağları", "Çalışkanlık"
+]
+DEFAULT_VALUES = ["Saygı", "Sevgi"]
+DEFAULT_PARENT_MESSAGE = (
+    "Çocuğumun büyüklerine saygı göstermesini ve her zaman dürüst olmasını istiyorum. "
+    "Ailemizin değerlerini öğrenmesi çok önemli."
+)
+
+# Same bands as the backend's developmental_stages.stage_key, including 9-12 for
+# ages outside 3-12 (checked by _archive/tests/test_age_bands.py)
+AGE_BANDS = {
+    "3-4": (3, 4),
+    "5-6": (5, 6),
+    "7-8": (7, 8),
+    "9-12": (9, 12),
+}
+
+DEFAULT_POOL_PATH = Path(os.getenv("STORY_POOL_PATH", "data/story_pool.json"))
+
+# Name slots used in templates. Turkish attaches case suffixes to proper names
+# after an apostrophe and the suffix follows the name's vowel harmony, so the
+# generator is asked to use one slot per grammatical case.
+NAME_SLOTS = {
+    "{isim}": "nominative",
+    "{isim_in}": "genitive",
+    "{isim_e}": "dative",
+    "{isim_i}": "accusative",
+    "{isim_le}": "comitative",
+}
+
+_BACK_VOWELS = "aıou"
+_VOWELS = "aeıioöuü"
+
+
+def age_band(age: int) -> str:
+    """Map an age to its pool band"""
+    for band, (low, high) in AGE_BANDS.items():
+        if low <= age <= high:
+            return band
+    return "9-12"
+
+
+def pool_key(age: int, values: Iterable[str]) -> Tuple[str, Tuple[str, ...]]:
+    """Lookup key for an age and a set of values (compared as text.value_keys)"""
+    return age_band(age), value_keys(values)
+
+
+def is_default_request(parent_message: str) -> bool:
+    """True when the parent kept the suggested message (or left it empty)"""
+    message = normalize(parent_message)
+    return not message or message == normalize(DEFAULT_PARENT_MESSAGE)
+
+
+def _last_vowel(name: str) -> str:
+    lowered = turkish_lower(name)
+    for char in reversed(lowered):
+        if char in _VOWELS:
+            return char
+    return "e"
+
+
+def _ends_with_vowel(name: str) -> bool:
+    lowered = turkish_lower(name)
+    return bool(lowered) and lowered[-1] in _VOWELS
+
+
+def _harmony_4(name: str) -> str:
+    return {"a": "ı", "ı": "ı", "o": "u", "u": "u", "e": "i", "i": "i", "ö": "ü", "ü": "ü"}[_last_vowel(name)]
+
+
+def _harmony_2(name: str) -> str:
+    return "a" if _last_vowel(name) in _BACK_VOWELS else "e"
+
+
+def inflect_name(name: str, case: str) -> str:
+    """Attach a Turkish case suffix to a proper name (Ayşe'nin, Ali'ye, Mehmet'le)"""
+    if case == "nominative":
+        return name
+    vowel_end = _ends_with_vowel(name)
+    if case == "genitive":
+        suffix = ("n" if vowel_end else "") + _harmony_4(name) + "n"
+    elif case == "dative":
+        suffix = ("y" if vowel_end else "") + _harmony_2(name)
+    elif case == "accusative":
+        suffix = ("y" if vowel_end else "") + _harmony_4(name)
+    elif case == "comitative":
+        suffix = ("y" if vowel_end else "") + "l" + _harmony_2(name)
+    else:
+        raise ValueError(f"Unknown case: {case}")
+    return f"{name}'{suffix}"
+
+
+def personalize(template: str, child_name: str) -> str:
+    """Fill the name slots of a pooled template"""
+    text = template
+    for slot, case in NAME_SLOTS.items():
+        text = text.replace(slot, inflect_name(child_name, case))
+    return text
+
+
+class StoryPool:
+    """In-memory index of pooled template stories"""
+
+    def __init__(self, entries: Optional[List[Dict[str, Any]]] = None):
+        self.entries = entries or []
+        self._index: Dict[Tuple[str, Tuple[str, ...]], List[Dict[str, Any]]] = {}
+        for entry in self.entries:
+            key = (entry["age_band"], value_keys(entry["values"]))
+            self._index.setdefault(key, []).append(entry)
+
+    @classmethod
+    def load(cls, path: Path = DEFAULT_POOL_PATH) -> "StoryPool":
+        """Load a pool file; a missing file yields an empty pool"""
+        path = Path(path)
+        if not path.exists():
+            return cls()
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        return cls(data.get("entries", []))
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def lookup(self, age: int, values: Iterable[str], rng: Optional[random.Random] = None) -> Optional[Dict[str, Any]]:
+        """Pick a pooled template for the age band and exact value set"""
+        with get_telemetry().track("cache", "story_pool") as call:
+            candidates = self._index.get(pool_key(age, values))
+            call["cache"] = "hit" if candidates else "miss"
+        if not candidates:
+            return None
+        return (rng or random).choice(candidates)
+
+    def render(self, entry: Dict[str, Any], child_name: str) -> Dict[str, Any]:
+        """Personalize a pooled entry for a child"""
+        return {
+            "title": personalize(entry["title"], child_name),
+            "content": personalize(entry["content"], child_name),
+            "values": entry["values"],
+            "age_band": entry["age_band"],
+            "source": "pool",
+        }
+
+
+# Offline builder
+
+def pool_combinations(max_values: int = 2) -> List[Tuple[str, Tuple[str, ...]]]:
+    """Every (age band, value subset) pair up to max_values values"""
+    combos = []
+    for band in AGE_BANDS:
+        for size in range(1, max_values + 1):
+            for subset in combinations(STORY_VALUES, size):
+                combos.append((band, subset))
+    return combos
+
+
+def build_story_prompt(band: str, values: Tuple[str, ...]) -> str:
+    """Prompt for a template story with name slots"""
+    return f"""
+    Türk kültürü ve geleneksel değerlerini içeren, {band} yaş grubundaki bir çocuk için hikaye oluştur.
+
+    İşlenecek Değerler: {', '.join(values)}
+
+    Hikaye şu özellikleri içermeli:
+    - Türk kültürüne uygun karakterler ve ortam
+    - {band} yaş grubuna uygun dil ve kavramlar
+    - Seçilen değerleri doğal bir şekilde işlemeli
+    - Eğlenceli ve öğretici olmalı
+    - Yaklaşık 200-300 kelime olmalı
+
+    Çocuğun adını asla yazma, bunun yerine şu yer tutucuları kullan:
+    - {{isim}} (yalın hal, örn. "{{isim}} koştu")
+    - {{isim_in}} (tamlayan, örn. "{{isim_in}} annesi")
+    - {{isim_e}} (yönelme, örn. "{{isim_e}} sarıldı")
+    - {{isim_i}} (belirtme, örn. "herkes {{isim_i}} sevdi")
+    - {{isim_le}} (birliktelik, örn. "{{isim_le}} oynadılar")
+
+    JSON formatında yanıt ver:
+    {{
+        "title": "Hikaye başlığı",
+        "content": "Hikaye metni"
+    }}
+    """
+
+
+def build_guardian_prompt(band: str, story: Dict[str, Any]) -> str:
+    """Safety prompt using GuardianAgent.validate_content criteria"""
+    return f"""
+    Bu hikaye içeriğini çocuk güvenliği ve Türk kültürel değerleri açısından değerlendir:
+
+    Hikaye: {json.dumps(story, ensure_ascii=False)}
+
+    Çocuk Bilgileri:
+    - Yaş Grubu: {band}
+    - Kültürel Geçmiş: Turkish
+
+    Potansiyel Riskler:
+    - Korku verici içerik
+    - Yaş üstü kavramlar
+    - Kültürel duyarsızlık
+    - Olumsuz rol modeller
+    - Şiddet veya zararlı davranışlar
+
+    JSON formatında yanıt ver:
+    {{
+        "is_safe": true/false,
+        "safety_score": 0-100,
+        "identified_risks": ["risk listesi"]
+    }}
+    """
+
+
+def _parse_json(text: str) -> Any:
+    """Parse a JSON reply, tolerating markdown code fences"""
+    cleaned = re.sub(r"^```(?:json)?|```$", "", text.strip(), flags=re.MULTILINE).strip()
+    return json.loads(cleaned)
+
+
+def build_pool(
+    generate: Callable[[str], str],
+    validate: Callable[[str], str],
+    variants: int = 2,
+    max_values: int = 2,
+    min_safety_score: int = 90,
+    attempts: int = 2,
+) -> List[Dict[str, Any]]:
+    """Generate and validate template stories for every combination"""
+    entries = []
+    for band, values in pool_combinations(max_values):
+        for _ in range(variants):
+            for _ in range(attempts):
+                try:
+                    story = _parse_json(generate(build_story_prompt(band, values)))
+                    if "{isim}" not in story.get("content", ""):
+                        continue
+                    verdict = _parse_json(validate(build_guardian_prompt(band, story)))
+                except Exception as e:
+                    print(f"Pool generation error ({band}, {values}): {e}")
+                    continue
+                if verdict.get("is_safe") and verdict.get("safety_score", 0) >= min_safety_score:
+                    entries.append({
+                        "age_band": band,
+                        "values": list(values),
+                        "title": story.get("title", ""),
+                        "content": story["content"],
+                        "safety_score": verdict["safety_score"],
+                    })
+                    break
+    return entries
+
+
+def save_pool(entries: List[Dict[str, Any]], path: Path = DEFAULT_POOL_PATH) -> None:
+    """Write a pool file"""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({
+            "version": 1,
+            "generated_at": datetime.now().isoformat(),
+            "entries": entries,
+        }, f, ensure_ascii=False, indent=2)
+
+
+def main():
+    """Build the story pool with Gemini"""
+    parser = argparse.ArgumentParser(description="Build the KökÖğreti story pool")
+    parser.add_argument("--output", default=str(DEFAULT_POOL_PATH))
+    parser.add_argument("--variants", type=int, default=2)
+    parser.add_argument("--max-values", type=int, default=2)
+    parser.add_argument("--min-safety-score", type=int, default=90)
+    args = parser.parse_args()
+
+    from dotenv import load_dotenv
+    import google.generativeai as genai
+
+    load_dotenv()
+    genai.configure(api_key=os.getenv("GEMINI_API_KEY"))
+    storyteller = genai.GenerativeModel("gemini-2.5-flash")
+    guardian = genai.GenerativeModel("gemini-2.5-pro")
+
+    entries = build_pool(
+        generate=lambda prompt: storyteller.generate_content(prompt).text,
+        validate=lambda prompt: guardian.generate_content(prompt).text,
+        variants=args.variants,
+        max_values=args.max_values,
+        min_safety_score=args.min_safety_score,
+    )
+    save_pool(entries, Path(args.output))
+    print(f"✅ {len(entries)} hikaye havuza eklendi: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,270 @@
+"""
+Story Store - Server-side persistence for stories generated in the Streamlit app
+
+Stories are written to a local SQLite database whose `stories` table mirrors the
+columns of the backend `Story` model. Writes go through a single background
+writer thread so the UI never waits on disk; reads use their own connections
+and are paginated.
+
+Library search uses an FTS5 table over `search_document` (folded, stemmed
+terms from kokogretim.search), kept in sync by triggers.
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import uuid
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import contextmanager
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from typing import Dict, List, Any, Optional, Tuple
+
+from .search import search_document, match_expression
+from .telemetry import get_telemetry
+
+DEFAULT_DB_PATH = Path(os.getenv("STORY_DB_PATH", "data/kokogretim.db"))
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS stories (
+    id TEXT PRIMARY KEY,
+    user_id TEXT NOT NULL,
+    child_id TEXT,
+    child_name TEXT,
+    child_age INTEGER,
+    title TEXT NOT NULL,
+    content TEXT NOT NULL,
+    values_taught TEXT,
+    audio_url TEXT,
+    image_url TEXT,
+    duration REAL,
+    difficulty_level TEXT,
+    cultural_elements TEXT,
+    ai_analysis TEXT,
+    source TEXT,
+    saved INTEGER NOT NULL DEFAULT 0,
+    created_at TEXT NOT NULL,
+    search_document TEXT
+);
+CREATE INDEX IF NOT EXISTS ix_stories_user_created ON stories (user_id, created_at DESC);
+"""
+
+_SEARCH_SCHEMA = """
+CREATE VIRTUAL TABLE IF NOT EXISTS stories_fts USING fts5(
+    search_document, content='stories', content_rowid='rowid'
+);
+CREATE TRIGGER IF NOT EXISTS stories_fts_insert AFTER INSERT ON stories BEGIN
+    INSERT INTO stories_fts (rowid, search_document) VALUES (new.rowid, new.search_document);
+END;
+CREATE TRIGGER IF NOT EXISTS stories_fts_delete AFTER DELETE ON stories BEGIN
+    INSERT INTO stories_fts (stories_fts, rowid, search_document) VALUES ('delete', old.rowid, old.search_document);
+END;
+CREATE TRIGGER IF NOT EXISTS stories_fts_update AFTER UPDATE OF search_document ON stories BEGIN
+    INSERT INTO stories_fts (stories_fts, rowid, search_document) VALUES ('delete', old.rowid, old.search_document);
+    INSERT INTO stories_fts (rowid, search_document) VALUES (new.rowid, new.search_document);
+END;
+"""
+
+_JSON_COLUMNS = ("values_taught", "cultural_elements", "ai_analysis")
+
+
+class StoryStore:
+    """SQLite-backed story storage with an asynchronous writer"""
+
+    def __init__(self, db_path: Path = DEFAULT_DB_PATH):
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="story-store")
+        self._version_lock = threading.Lock()
+        # Bumped after every committed write; used as a cache key by readers
+        self.version = 0
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(_SCHEMA)
+            self._ensure_search_index(conn)
+
+    @contextmanager
+    def _connect(self, operation: str = "schema"):
+        """Connection that commits on success and is always closed; timed as `operation`"""
+        with get_telemetry().track("db", operation, provider="sqlite"):
+            conn = sqlite3.connect(self.db_path, timeout=10)
+            conn.row_factory = sqlite3.Row
+            # INSERT OR REPLACE only fires the FTS delete trigger with recursive triggers on
+            conn.execute("PRAGMA recursive_triggers = ON")
+            try:
+                with conn:
+                    yield conn
+            finally:
+                conn.close()
+
+    def _ensure_search_index(self, conn: sqlite3.Connection):
+        """Add the search column and FTS table to stores created before search existed"""
+        columns = {row["name"] for row in conn.execute("PRAGMA table_info(stories)")}
+        if "search_document" not in columns:
+            conn.execute("ALTER TABLE stories ADD COLUMN search_document TEXT")
+        # Backfill before the triggers exist: they assume every row is already indexed
+        missing = conn.execute(
+            "SELECT id, title, content, values_taught, cultural_elements FROM stories WHERE search_document IS NULL"
+        ).fetchall()
+        if missing:
+            conn.executemany("UPDATE stories SET search_document = ? WHERE id = ?", [
+                (search_document(row["title"], row["content"],
+                                 json.loads(row["values_taught"]) if row["values_taught"] else None,
+                                 json.loads(row["cultural_elements"]) if row["cultural_elements"] else None),
+                 row["id"])
+                for row in missing
+            ])
+        conn.executescript(_SEARCH_SCHEMA)
+        if missing:
+            conn.execute("INSERT INTO stories_fts (stories_fts) VALUES ('rebuild')")
+
+    def _bump_version(self):
+        with self._version_lock:
+            self.version += 1
+
+    @staticmethod
+    def _to_row(story: Dict[str, Any]) -> Dict[str, Any]:
+        row = {
+            "id": story.get("id") or uuid.uuid4().hex,
+            "user_id": story["user_id"],
+            "child_id": story.get("child_id"),
+            "child_name": story.get("child_name"),
+            "child_age": story.get("child_age"),
+            "title": story["title"],
+            "content": story["content"],
+            "audio_url": story.get("audio_url"),
+            "image_url": story.get("image_url"),
+            "duration": story.get("duration"),
+            "difficulty_level": story.get("difficulty_level"),
+            "source": story.get("source"),
+            "saved": int(bool(story.get("saved"))),
+            "created_at": story.get("created_at") or datetime.now().isoformat(),
+        }
+        for column in _JSON_COLUMNS:
+            row[column] = json.dumps(story.get(column), ensure_ascii=False) if story.get(column) is not None else None
+        row["search_document"] = search_document(
+            story["title"], story["content"], story.get("values_taught"), story.get("cultural_elements")
+        )
+        return row
+
+    @staticmethod
+    def _from_row(row: sqlite3.Row) -> Dict[str, Any]:
+        story = dict(row)
+        story.pop("search_document", None)
+        for column in _JSON_COLUMNS:
+            story[column] = json.loads(story[column]) if story[column] else None
+        story["saved"] = bool(story["saved"])
+        return story
+
+    def _insert(self, row: Dict[str, Any]) -> str:
+        columns = ", ".join(row)
+        placeholders = ", ".join(f":{c}" for c in row)
+        with self._connect("insert_story") as conn:
+            conn.execute(f"INSERT OR REPLACE INTO stories ({columns}) VALUES ({placeholders})", row)
+        self._bump_version()
+        return row["id"]
+
+    def _mark_saved(self, story_id: str) -> str:
+        with self._connect("mark_saved") as conn:
+            conn.execute("UPDATE stories SET saved = 1 WHERE id = ?", (story_id,))
+        self._bump_version()
+        return story_id
+
+    def save_story(self, story: Dict[str, Any]) -> Future:
+        """Queue a story for writing; the id is assigned immediately"""
+        row = self._to_row(story)
+        story["id"] = row["id"]
+        return self._writer.submit(self._insert, row)
+
+    def mark_saved(self, story_id: str) -> Future:
+        """Queue marking a story as saved to the library"""
+        return self._writer.submit(self._mark_saved, story_id)
+
+    def get_story(self, story_id: str) -> Optional[Dict[str, Any]]:
+        with self._connect("get_story") as conn:
+            row = conn.execute("SELECT * FROM stories WHERE id = ?", (story_id,)).fetchone()
+        return self._from_row(row) if row else None
+
+    def latest_story(self, user_id: str) -> Optional[Dict[str, Any]]:
+        """Most recent story for a user, saved or not"""
+        with self._connect("latest_story") as conn:
+            row = conn.execute(
+                "SELECT * FROM stories WHERE user_id = ? ORDER BY created_at DESC LIMIT 1",
+                (user_id,)
+            ).fetchone()
+        return self._from_row(row) if row else None
+
+    def count_stories(self, user_id: str, saved_only: bool = True) -> int:
+        query = "SELECT COUNT(*) FROM stories WHERE user_id = ?"
+        if saved_only:
+            query += " AND saved = 1"
+        with self._connect("count_stories") as conn:
+            return conn.execute(query, (user_id,)).fetchone()[0]
+
+    def count_children(self, user_id: str) -> int:
+        """Distinct children a user has generated stories for"""
+        with self._connect("count_children") as conn:
+            return conn.execute(
+                "SELECT COUNT(DISTINCT child_name) FROM stories WHERE user_id = ?", (user_id,)
+            ).fetchone()[0]
+
+    def list_stories(self, user_id: str, limit: int = 10, offset: int = 0, saved_only: bool = True) -> List[Dict[str, Any]]:
+        """One page of a user's stories, newest first"""
+        query = "SELECT * FROM stories WHERE user_id = ?"
+        if saved_only:
+            query += " AND saved = 1"
+        query += " ORDER BY created_at DESC LIMIT ? OFFSET ?"
+        with self._connect("list_stories") as conn:
+            rows = conn.execute(query, (user_id, limit, offset)).fetchall()
+        return [self._from_row(row) for row in rows]
+
+    def search_stories(self, user_id: str, query: str, limit: int = 10, offset: int = 0,
+                       saved_only: bool = True) -> Tuple[int, List[Dict[str, Any]]]:
+        """(total matches, one page of matching stories), best match first"""
+        match = match_expression(query)
+        if match is None:
+            return 0, []
+        where = "stories_fts MATCH ? AND stories.user_id = ?"
+        if saved_only:
+            where += " AND stories.saved = 1"
+        joined = "FROM stories_fts JOIN stories ON stories.rowid = stories_fts.rowid WHERE " + where
+        with self._connect("search_stories") as conn:
+            total = conn.execute(f"SELECT COUNT(*) {joined}", (match, user_id)).fetchone()[0]
+            rows = conn.execute(
+                f"SELECT stories.* {joined} ORDER BY bm25(stories_fts), stories.created_at DESC LIMIT ? OFFSET ?",
+                (match, user_id, limit, offset)
+            ).fetchall()
+        return total, [self._from_row(row) for row in rows]
+
+    def daily_activity(self, user_id: str, start: date, end: date, child_name: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Stories and words generated per day in [start, end]"""
+        query = """
+            SELECT substr(created_at, 1, 10) AS day,
+                   COUNT(*) AS stories,
+                   SUM(length(content) - length(replace(content, ' ', '')) + 1) AS words
+            FROM stories
+            WHERE user_id = ? AND created_at >= ? AND created_at < ?
+        """
+        params = [user_id, start.isoformat(), (end + timedelta(days=1)).isoformat()]
+        if child_name:
+            query += " AND child_name = ?"
+            params.append(child_name)
+        query += " GROUP BY day ORDER BY day"
+        with self._connect("daily_activity") as conn:
+            return [dict(row) for row in conn.execute(query, params).fetchall()]
+
+    def value_counts(self, user_id: str, child_name: Optional[str] = None) -> Dict[str, int]:
+        """Number of stories teaching each value"""
+        query = """
+            SELECT value_item.value AS value, COUNT(*) AS stories
+            FROM stories, json_each(stories.values_taught) AS value_item
+            WHERE stories.user_id = ?
+        """
+        params = [user_id]
+        if child_name:
+            query += " AND stories.child_name = ?"
+            params.append(child_name)
+        query += " GROUP BY value_item.value ORDER BY stories DESC"
+        with self._connect("value_counts") as conn:
+            return {row["value"]: row["stories"] for row in conn.execute(query, params).fetchall()}
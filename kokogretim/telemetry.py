@@ -0,0 +1,224 @@
+"""
+Telemetry - Latency, token, cache and error records for LLM, TTS and DB calls
+
+Every call is recorded into an in-memory ring buffer, which feeds the live
+sidebar numbers, and appended to a daily JSONL file by a background writer,
+which feeds the admin page history. Quota estimates compare recent usage with
+the provider limits configured through the environment.
+"""
+
+import json
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from typing import Dict, List, Any, Optional
+
+import numpy as np
+
+DEFAULT_TELEMETRY_DIR = Path(os.getenv("TELEMETRY_DIR", "data/telemetry"))
+RING_SIZE = 5000
+
+# Provider limits (requests per minute, tokens per minute, requests per day).
+# Defaults match the paid Tier 1 limits; override them for your account. A limit
+# of 0 means unlimited and is left out of the quota estimates.
+QUOTAS = {
+    "gemini": {
+        "rpm": int(os.getenv("GEMINI_RPM_LIMIT", "1000")),
+        "tpm": int(os.getenv("GEMINI_TPM_LIMIT", "1000000")),
+        "rpd": int(os.getenv("GEMINI_RPD_LIMIT", "10000")),
+    },
+    "openai": {
+        "rpm": int(os.getenv("OPENAI_RPM_LIMIT", "3000")),
+        "tpm": int(os.getenv("OPENAI_TPM_LIMIT", "1000000")),
+        "rpd": int(os.getenv("OPENAI_RPD_LIMIT", "100000")),
+    },
+}
+
+
+def usage_tokens(response) -> Dict[str, int]:
+    """Prompt/completion token counts from a Gemini or OpenAI response"""
+    usage = getattr(response, "usage_metadata", None)
+    if usage is not None:
+        return {
+            "tokens_in": getattr(usage, "prompt_token_count", 0) or 0,
+            "tokens_out": getattr(usage, "candidates_token_count", 0) or 0,
+        }
+    usage = getattr(response, "usage", None)
+    if usage is not None:
+        return {
+            "tokens_in": getattr(usage, "prompt_tokens", 0) or 0,
+            "tokens_out": getattr(usage, "completion_tokens", 0) or 0,
+        }
+    return {"tokens_in": 0, "tokens_out": 0}
+
+
+class Telemetry:
+    """Ring buffer of call records with an on-disk JSONL time series"""
+
+    def __init__(self, directory: Path = DEFAULT_TELEMETRY_DIR, ring_size: int = RING_SIZE):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._events: deque = deque(maxlen=ring_size)
+        self._lock = threading.Lock()
+        self._writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="telemetry")
+        # Requests per provider and day; seeded from disk so restarts keep the daily quota
+        self._daily: Dict[str, int] = {}
+        for event in self.history(date.today(), date.today()):
+            self._events.append(event)
+            self._count_daily(event)
+
+    def _path(self, day: date) -> Path:
+        return self.directory / f"{day.isoformat()}.jsonl"
+
+    def _count_daily(self, event: Dict[str, Any]):
+        if event["kind"] == "llm" and event.get("provider"):
+            key = f"{event['ts'][:10]}:{event['provider']}"
+            self._daily[key] = self._daily.get(key, 0) + 1
+
+    def _append(self, event: Dict[str, Any]):
+        with open(self._path(date.fromisoformat(event["ts"][:10])), "a", encoding="utf-8") as f:
+            f.write(json.dumps(event, ensure_ascii=False) + "\n")
+
+    def record(
+        self,
+        kind: str,
+        name: str,
+        latency_ms: float,
+        provider: Optional[str] = None,
+        tokens_in: int = 0,
+        tokens_out: int = 0,
+        cache: Optional[str] = None,
+        error: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """Record one call; kind is llm, tts, db or cache, cache is hit or miss"""
+        event = {
+            "ts": datetime.now().isoformat(),
+            "kind": kind,
+            "name": name,
+            "provider": provider,
+            "latency_ms": round(latency_ms, 2),
+            "tokens_in": tokens_in,
+            "tokens_out": tokens_out,
+            "cache": cache,
+            "error": error,
+        }
+        with self._lock:
+            self._events.append(event)
+            self._count_daily(event)
+        self._writer.submit(self._append, event)
+        return event
+
+    @contextmanager
+    def track(self, kind: str, name: str, provider: Optional[str] = None):
+        """Time a block; set tokens_in, tokens_out or cache on the yielded dict"""
+        fields: Dict[str, Any] = {}
+        started = time.perf_counter()
+        try:
+            yield fields
+        except Exception as e:
+            self.record(kind, name, (time.perf_counter() - started) * 1000, provider, error=type(e).__name__, **fields)
+            raise
+        self.record(kind, name, (time.perf_counter() - started) * 1000, provider, **fields)
+
+    # Queries over the ring buffer
+
+    def recent(self, seconds: float = 300, kind: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Events from the last `seconds`, optionally of one kind"""
+        since = (datetime.now() - timedelta(seconds=seconds)).isoformat()
+        with self._lock:
+            events = list(self._events)
+        return [e for e in events if e["ts"] >= since and (kind is None or e["kind"] == kind)]
+
+    def latency(self, seconds: float = 300, kind: Optional[str] = None, name: Optional[str] = None) -> Dict[str, Optional[float]]:
+        """p50/p95 latency in milliseconds for successful calls"""
+        values = [
+            e["latency_ms"] for e in self.recent(seconds, kind)
+            if not e["error"] and (name is None or e["name"] == name)
+        ]
+        if not values:
+            return {"count": 0, "p50": None, "p95": None}
+        p50, p95 = np.percentile(values, [50, 95])
+        return {"count": len(values), "p50": float(p50), "p95": float(p95)}
+
+    def tokens_per_minute(self, provider: Optional[str] = None, minutes: float = 1) -> float:
+        events = self.recent(minutes * 60, "llm")
+        tokens = sum(e["tokens_in"] + e["tokens_out"] for e in events if provider is None or e["provider"] == provider)
+        return tokens / minutes
+
+    def quota(self, provider: str) -> Dict[str, Any]:
+        """Remaining share of each configured limit, from the last minute and today"""
+        limits = QUOTAS[provider]
+        minute = [e for e in self.recent(60, "llm") if e["provider"] == provider]
+        with self._lock:
+            today = self._daily.get(f"{date.today().isoformat()}:{provider}", 0)
+        used = {
+            "rpm": len(minute),
+            "tpm": sum(e["tokens_in"] + e["tokens_out"] for e in minute),
+            "rpd": today,
+        }
+        remaining = {key: max(limits[key] - used[key], 0) for key in limits}
+        return {
+            "used": used,
+            "limits": limits,
+            "remaining": remaining,
+            "remaining_ratio": min((remaining[key] / limits[key] for key in limits if limits[key]), default=1.0),
+        }
+
+    def summary(self, seconds: float = 3600) -> List[Dict[str, Any]]:
+        """Per-call statistics: count, errors, p50/p95, tokens and cache hit rate"""
+        groups: Dict[tuple, List[Dict[str, Any]]] = {}
+        for event in self.recent(seconds):
+            groups.setdefault((event["kind"], event["name"]), []).append(event)
+
+        rows = []
+        for (kind, name), events in sorted(groups.items()):
+            latencies = [e["latency_ms"] for e in events if not e["error"]]
+            lookups = [e for e in events if e["cache"]]
+            p50, p95 = (float(v) for v in np.percentile(latencies, [50, 95])) if latencies else (None, None)
+            rows.append({
+                "kind": kind,
+                "name": name,
+                "count": len(events),
+                "errors": sum(1 for e in events if e["error"]),
+                "p50_ms": p50,
+                "p95_ms": p95,
+                "tokens": sum(e["tokens_in"] + e["tokens_out"] for e in events),
+                "hit_rate": sum(1 for e in lookups if e["cache"] == "hit") / len(lookups) if lookups else None,
+            })
+        return rows
+
+    # On-disk time series
+
+    def history(self, start: date, end: date) -> List[Dict[str, Any]]:
+        """Recorded events for the days in [start, end]"""
+        events = []
+        day = start
+        while day <= end:
+            path = self._path(day)
+            if path.exists():
+                with open(path, "r", encoding="utf-8") as f:
+                    for line in f:
+                        try:
+                            events.append(json.loads(line))
+                        except json.JSONDecodeError:
+                            continue
+            day += timedelta(days=1)
+        return events
+
+
+_telemetry: Optional[Telemetry] = None
+_telemetry_lock = threading.Lock()
+
+
+def get_telemetry() -> Telemetry:
+    """Process-wide telemetry instance"""
+    global _telemetry
+    with _telemetry_lock:
+        if _telemetry is None:
+            _telemetry = Telemetry()
+        return _telemetry
@@ -0,0 +1,81 @@
+"""
+Turkish text - Shared normalization for cache keys, value names and search
+
+str.lower() maps "I" to "i" and "İ" to "i̇" (i plus a combining dot), so
+"SAYGI" and "Saygı" compare unequal and the semantic cache, the story pool
+and the search index each used to patch this up differently. Everything that
+compares Turkish text goes through the functions here instead:
+
+- turkish_lower: NFC, then Turkish casefolding (I -> ı, İ -> i)
+- normalize: turkish_lower plus punctuation -> space, whitespace collapsed
+- ascii_fold: ç ğ ı ö ş ü (and circumflexed â î û) folded to ASCII
+- value_key / value_keys: comparison keys for value names, so "Dürüstlük",
+  "DÜRÜSTLÜK" and "dürüstlük" are the same value
+
+The search tokenizer (kokogretim.search) builds on turkish_lower and
+ascii_fold; the FastAPI backend's app.turkish_text is a copy of it, kept in
+step by a shared set of test cases.
+
+Replacement pairs and patterns are built once at import. normalize and
+value_key are LRU-memoized since the same parent messages and value names
+repeat across requests; turkish_lower and ascii_fold are plain so whole story
+texts (search indexing) don't churn the caches. Throughput is measured by
+_archive/bench/text.py.
+"""
+
+import re
+import unicodedata
+from functools import lru_cache
+from typing import Iterable, Optional, Tuple
+
+CACHE_SIZE = 4096
+
+# Applied with str.replace: a dict-based str.translate table walks every
+# character in Python-level lookups and is ~30x slower on story-length text
+_LOWER = (("I", "ı"), ("İ", "i"))
+_FOLD = (("ç", "c"), ("ğ", "g"), ("ı", "i"), ("ö", "o"), ("ş", "s"), ("ü", "u"), ("â", "a"), ("î", "i"), ("û", "u"))
+_PUNCTUATION = re.compile(r"[^\w\s]", re.UNICODE)
+
+
+def turkish_lower(text: Optional[str]) -> str:
+    """Lowercase with Turkish rules (I -> ı, İ -> i) after NFC composition"""
+    text = text or ""
+    if not text.isascii():
+        text = unicodedata.normalize("NFC", text)
+        for upper, lower in _LOWER:
+            text = text.replace(upper, lower)
+    elif "I" in text:
+        text = text.replace("I", "ı")
+    return text.lower()
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def normalize(text: Optional[str]) -> str:
+    """Turkish lowercase, punctuation replaced by spaces, whitespace collapsed"""
+    return " ".join(_PUNCTUATION.sub(" ", turkish_lower(text)).split())
+
+
+def ascii_fold(text: str) -> str:
+    """Fold Turkish letters of already-lowercased text to ASCII"""
+    if text.isascii():
+        return text
+    for letter, ascii_letter in _FOLD:
+        if letter in text:
+            text = text.replace(letter, ascii_letter)
+    return text
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def value_key(name: Optional[str]) -> str:
+    """Comparison key for a value name: normalized and ASCII-folded"""
+    return ascii_fold(normalize(name))
+
+
+def value_keys(names: Iterable[str]) -> Tuple[str, ...]:
+    """Sorted, de-duplicated value keys of a value selection"""
+    return tuple(sorted({value_key(name) for name in names}))
+
+
+def cache_info():
+    """LRU statistics of the memoized functions"""
+    return {fn.__name__: fn.cache_info() for fn in (normalize, value_key)}
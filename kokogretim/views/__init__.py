@@ -0,0 +1 @@
+"""Streamlit page scripts registered with st.navigation in streamlit_app.py"""
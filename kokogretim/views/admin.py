@@ -0,0 +1,80 @@
+"""System monitoring page: latency, token usage, cache hit rates and quotas"""
+
+from datetime import date, timedelta
+
+import pandas as pd
+import plotly.express as px
+import streamlit as st
+
+from kokogretim.resources import is_admin
+from kokogretim.telemetry import get_telemetry, QUOTAS
+
+HISTORY_DAYS = 7
+
+
+def show_quota(provider, quota):
+    """Remaining quota metrics for one provider"""
+    st.markdown(f"#### {provider.capitalize()}")
+    col1, col2, col3 = st.columns(3)
+    labels = {"rpm": "İstek / dk", "tpm": "Token / dk", "rpd": "İstek / gün"}
+    for col, key in zip((col1, col2, col3), ("rpm", "tpm", "rpd")):
+        with col:
+            limit = quota['limits'][key]
+            if not limit:
+                st.metric(labels[key], f"{quota['used'][key]:,}", "Sınırsız", delta_color="off")
+                continue
+            st.metric(labels[key], f"{quota['used'][key]:,} / {limit:,}",
+                      f"%{quota['remaining'][key] / limit * 100:.0f} kaldı", delta_color="off")
+
+
+@st.cache_data(ttl=60)
+def load_hourly_latency(start, end):
+    """Hourly p50/p95 latency per call kind from the on-disk time series"""
+    events = get_telemetry().history(start, end)
+    if not events:
+        return pd.DataFrame()
+    df = pd.DataFrame(events)
+    df = df[df['error'].isna()]
+    df['Saat'] = pd.to_datetime(df['ts']).dt.floor('h')
+    grouped = df.groupby(['Saat', 'kind'])['latency_ms']
+    hourly = pd.DataFrame({'p50': grouped.median(), 'p95': grouped.quantile(0.95)}).reset_index()
+    return hourly.rename(columns={'kind': 'Tür'})
+
+
+def show_admin():
+    """Display telemetry collected from LLM, TTS, database and cache calls"""
+    if not is_admin():
+        st.error("Bu sayfa yalnızca yöneticilere açıktır.")
+        st.stop()
+    st.markdown("## 🛠️ Sistem İzleme")
+    telemetry = get_telemetry()
+
+    st.markdown("### 📉 Kalan Kota Tahmini")
+    for provider in QUOTAS:
+        show_quota(provider, telemetry.quota(provider))
+
+    st.markdown("### ⏱️ Son 1 Saat")
+    rows = telemetry.summary(seconds=3600)
+    if rows:
+        summary = pd.DataFrame(rows).rename(columns={
+            'kind': 'Tür', 'name': 'Çağrı', 'count': 'Adet', 'errors': 'Hata',
+            'p50_ms': 'p50 (ms)', 'p95_ms': 'p95 (ms)', 'tokens': 'Token', 'hit_rate': 'Önbellek İsabeti',
+        })
+        st.dataframe(summary.round(1), use_container_width=True, hide_index=True)
+    else:
+        st.info("Henüz kayıtlı çağrı yok.")
+
+    st.markdown(f"### 📈 Son {HISTORY_DAYS} Gün Gecikme (p95)")
+    end = date.today()
+    hourly = load_hourly_latency(end - timedelta(days=HISTORY_DAYS - 1), end)
+    if hourly.empty:
+        st.info("Henüz zaman serisi verisi yok.")
+        return
+    fig = px.line(hourly, x='Saat', y='p95', color='Tür', log_y=True,
+                  labels={'p95': 'p95 (ms)'},
+                  color_discrete_sequence=['#98FB98', '#228B22', '#87CEEB', '#8FBC8F', '#2F4F2F'])
+    fig.update_layout(plot_bgcolor='rgba(0,0,0,0)', paper_bgcolor='rgba(0,0,0,0)', font_color='#2F4F2F')
+    st.plotly_chart(fig, use_container_width=True)
+
+
+show_admin()
@@ -0,0 +1,71 @@
+"""Educational games page"""
+
+import streamlit as st
+
+
+def show_games_main():
+    """Main games page"""
+    st.markdown("## 🎮 Eğitici Oyunlar")
+    
+    st.markdown("""
+    <div class="story-card">
+        <h3>🎯 Hikaye Tabanlı Eğitici Oyunlar</h3>
+        <p>KökÖğreti'nin eğitici oyunları, çocukların öğrendikleri değerleri pekiştirmelerine yardımcı olur.</p>
+    </div>
+    """, unsafe_allow_html=True)
+    
+    games_col1, games_col2 = st.columns(2)
+    
+    with games_col1:
+        st.markdown("""
+        <div class="story-card">
+            <h4>🧩 Değer Eşleştirme</h4>
+            <p>Hikayedeki karakterleri ve değerleri doğru şekilde eşleştirin!</p>
+        </div>
+        """, unsafe_allow_html=True)
+        
+        if st.button("🎯 Eşleştirme Oyunu", use_container_width=True):
+            st.balloons()
+            st.success("🎉 Tüm değerleri doğru eşleştirdin! +10 puan!")
+            
+        st.markdown("""
+        <div class="story-card">
+            <h4>📝 Hikaye Tamamlama</h4>
+            <p>Eksik kelimeleri tamamlayarak hikayeyi bitirin!</p>
+        </div>
+        """, unsafe_allow_html=True)
+        
+        if st.button("✏️ Tamamlama Oyunu", use_container_width=True):
+            st.text_input("Cümledeki eksik kelime: '______ çok önemli bir değerdir.'")
+            if st.button("Kontrol Et", key="check_word"):
+                st.success("🌟 Doğru! Saygı gerçekten önemli bir değerdir!")
+    
+    with games_col2:
+        st.markdown("""
+        <div class="story-card">
+            <h4>🎭 Karakter Oyunu</h4>
+            <p>Hikayedeki karakterlerin rollerini tahmin edin!</p>
+        </div>
+        """, unsafe_allow_html=True)
+        
+        if st.button("🎪 Karakter Oyunu", use_container_width=True):
+            character = st.selectbox("Bu karakter hangi değeri temsil ediyor?", 
+                                   ["Dürüstlük", "Saygı", "Paylaşım", "Yardımlaşma"])
+            if st.button("Yanıtla", key="answer_character"):
+                st.success(f"✅ Harika! {character} doğru bir seçim!")
+        
+        st.markdown("""
+        <div class="story-card">
+            <h4>🏆 Değer Yarışması</h4>
+            <p>Hangi değerin en önemli olduğunu düşünüyorsun?</p>
+        </div>
+        """, unsafe_allow_html=True)
+        
+        if st.button("🏅 Yarışmaya Katıl", use_container_width=True):
+            favorite_value = st.selectbox("En sevdiğin değer:", 
+                                        ["Saygı", "Dürüstlük", "Paylaşım", "Yardımlaşma", "Nezaket"])
+            if st.button("Oyla", key="vote_value"):
+                st.success(f"🎊 {favorite_value} değerine oyun verdin! Toplam: +5 puan!")
+
+
+show_games_main()
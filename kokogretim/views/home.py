@@ -0,0 +1,59 @@
+"""Home page"""
+
+import streamlit as st
+
+from kokogretim import charts
+from kokogretim.resources import load_story_store, current_user_id
+
+
+def show_home_page():
+    """Display home page"""
+    col1, col2, col3 = st.columns([1, 2, 1])
+    
+    with col2:
+        st.markdown("""
+        <div class="story-card">
+            <h3>🎯 KökÖğreti Nedir?</h3>
+            <p>KökÖğreti, Türk kültürü ve geleneksel değerlerini çocuklarınıza öğretmek için 
+            geliştirilmiş yapay zeka destekli bir eğitim platformudur.</p>
+            
+            <h4>🚀 Özellikler:</h4>
+            <ul>
+                <li>🎭 Çok-Agent AI ile kişiselleştirilmiş hikaye oluşturma</li>
+                <li>📊 Çocuk gelişim takibi ve analizi</li>
+                <li>🎤 Ses tabanlı değer aktarımı</li>
+                <li>🔒 Güvenli ve kültürel olarak uygun içerik</li>
+                <li>📈 Gerçek zamanlı öğrenme analitiği</li>
+            </ul>
+        </div>
+        """, unsafe_allow_html=True)
+    
+    # Quick action buttons
+    st.markdown("### 🎯 Hızlı İşlemler")
+    col1, col2, col3, col4 = st.columns(4)
+    
+    with col1:
+        if st.button("🎭 Yeni Hikaye Oluştur", use_container_width=True):
+            st.switch_page("kokogretim/views/story_generation.py")
+    
+    with col2:
+        if st.button("📊 İstatistikleri Gör", use_container_width=True):
+            st.switch_page("kokogretim/views/statistics.py")
+    
+    with col3:
+        if st.button("🧠 AI Analizini İncele", use_container_width=True):
+            st.switch_page("kokogretim/views/insights.py")
+    
+    with col4:
+        if st.button("🎤 Ses Kaydı Yap", use_container_width=True):
+            st.switch_page("kokogretim/views/voice.py")
+    
+    # Recent activities
+    st.markdown("### 📈 Son Aktiviteler")
+    store = load_story_store()
+    start, end = charts.last_days(7)
+    fig = charts.activity_line_figure(store, current_user_id(), None, start, end, store.version)
+    st.plotly_chart(fig, use_container_width=True)
+
+
+show_home_page()
@@ -0,0 +1,122 @@
+"""AI insights page"""
+
+import plotly.graph_objects as go
+import streamlit as st
+
+
+def show_ai_insights():
+    """Display AI insights page"""
+    st.markdown("## 🧠 AI Analizi ve Gelişim Öngörüleri")
+    
+    # Child psychology insights
+    col1, col2 = st.columns([2, 1])
+    
+    with col1:
+        st.markdown("""
+        <div class="story-card">
+            <h3>👶 Çocuk Psikolojisi Profili</h3>
+            <h4>🎯 Ana Bulgular:</h4>
+            <ul>
+                <li><strong>Öğrenme Stili:</strong> %60 Görsel, %30 İşitsel, %10 Kinestetik</li>
+                <li><strong>Dikkat Süresi:</strong> Ortalama 8-10 dakika (yaş grubu ortalaması: 6-8 dk)</li>
+                <li><strong>Tercih Edilen Değerler:</strong> Aile bağları, Saygı, Paylaşım</li>
+                <li><strong>Kültürel Öğrenme Hızı:</strong> Hızlı (%85 başarı oranı)</li>
+            </ul>
+            
+            <h4>💡 AI Önerileri:</h4>
+            <ul>
+                <li>Görsel öğeleri zengin hikayeler tercih edin</li>
+                <li>8-10 dakikalık hikayeler optimal</li>
+                <li>Aile temalı hikayeleri artırın</li>
+                <li>İnteraktif sorularla katılımı artırın</li>
+            </ul>
+        </div>
+        """, unsafe_allow_html=True)
+        
+        # Learning progress radar chart
+        categories = ['Sosyal Beceriler', 'Dil Gelişimi', 'Kültürel Farkındalık', 
+                     'Değer Öğrenimi', 'Dinleme Becerisi', 'Hikaye Anlama']
+        values = [94, 89, 87, 92, 88, 91]
+        
+        fig = go.Figure(data=go.Scatterpolar(
+            r=values,
+            theta=categories,
+            fill='toself',
+            fillcolor='rgba(152, 251, 152, 0.3)',
+            line_color='#98FB98',
+            name='Gelişim Durumu'
+        ))
+        
+        fig.update_layout(
+            polar=dict(
+                radialaxis=dict(
+                    visible=True,
+                    range=[0, 100],
+                    gridcolor='#E8F5E8'
+                )
+            ),
+            title="🎯 Çok Boyutlu Gelişim Analizi",
+            font_color='#2F4F2F',
+            paper_bgcolor='rgba(0,0,0,0)',
+            plot_bgcolor='rgba(0,0,0,0)'
+        )
+        st.plotly_chart(fig, use_container_width=True)
+    
+    with col2:
+        st.markdown("""
+        <div class="metric-card">
+            <h3>🛡️ Güvenlik Skoru</h3>
+            <h2 style="color: #228B22;">98.5%</h2>
+            <small>Tüm içerik güvenli</small>
+        </div>
+        """, unsafe_allow_html=True)
+        
+        st.markdown("""
+        <div class="metric-card">
+            <h3>🎯 Kültürel Uygunluk</h3>
+            <h2 style="color: #228B22;">96.2%</h2>
+            <small>Yüksek uygunluk</small>
+        </div>
+        """, unsafe_allow_html=True)
+        
+        st.markdown("""
+        <div class="metric-card">
+            <h3>💡 Öğrenme Verimliliği</h3>
+            <h2 style="color: #228B22;">91.7%</h2>
+            <small>Çok başarılı</small>
+        </div>
+        """, unsafe_allow_html=True)
+    
+    # Weekly insights
+    st.markdown("### 📈 Bu Haftanın AI Öngörüleri")
+    
+    insights_col1, insights_col2 = st.columns(2)
+    
+    with insights_col1:
+        st.info("""
+        🎯 **Öğrenme Fırsatı**: 
+        Bu hafta "misafirperverlik" değerine odaklanmak için mükemmel bir zaman. 
+        Çocuğunuz bu konuya özel ilgi gösteriyor.
+        """)
+        
+        st.success("""
+        ✅ **Başarı Alanı**: 
+        Saygı değerinde %15 gelişme kaydedildi. 
+        Bu konuda hikaye sayısını artırabilirsiniz.
+        """)
+    
+    with insights_col2:
+        st.warning("""
+        ⚠️ **Dikkat Edilmesi Gereken**: 
+        Dinleme süreleri hafif azaldı. 
+        Daha kısa ve interaktif hikayeler önerilir.
+        """)
+        
+        st.info("""
+        🔮 **Gelecek Tahmin**: 
+        Mevcut hızla ilerleyerek, 2 ay içinde 
+        %95+ genel gelişim skoruna ulaşabilir.
+        """)
+
+
+show_ai_insights()
@@ -0,0 +1,73 @@
+"""Story library page"""
+
+from datetime import datetime
+
+import streamlit as st
+
+from kokogretim.resources import (
+    load_story_store, cached_story_count, cached_story_page, cached_search_page, current_user_id, LIBRARY_PAGE_SIZE
+)
+from kokogretim.components import show_games_section
+
+
+def show_story_library():
+    """Display saved stories with listening options"""
+    st.markdown("## 📚 Hikaye Kütüphanesi")
+    
+    store = load_story_store()
+    user_id = current_user_id()
+    total = cached_story_count(user_id, store.version)
+    
+    if not total:
+        st.info("📭 Henüz kaydedilmiş hikaye yok. Oluşturduğunuz hikayeleri 💾 Kaydet ile kütüphanenize ekleyebilirsiniz.")
+        return
+    
+    query = st.text_input("🔍 Hikaye ara", placeholder="Başlık, değer veya kültürel öğe (ör. saygı, Keloğlan)").strip()
+    if query:
+        total, _ = cached_search_page(user_id, query, 1, store.version)
+        if not total:
+            st.info(f"🔎 \"{query}\" için sonuç bulunamadı.")
+            return
+        st.caption(f"{total} hikaye bulundu")
+    
+    page_count = (total + LIBRARY_PAGE_SIZE - 1) // LIBRARY_PAGE_SIZE
+    page = 1
+    if page_count > 1:
+        page = st.number_input(f"Sayfa (toplam {page_count}):", min_value=1, max_value=page_count, value=1)
+    
+    stories = cached_search_page(user_id, query, page, store.version)[1] if query else cached_story_page(user_id, page, store.version)
+    for story in stories:
+        values = story.get("values_taught") or []
+        excerpt = story["content"].strip()[:240]
+        created_at = datetime.fromisoformat(story["created_at"])
+        st.markdown(f"""
+        <div class="story-card">
+            <h4>📖 {story['title']}</h4>
+            <p>{excerpt}...</p>
+            <div style="display: flex; justify-content: space-between; align-items: center; margin-top: 15px;">
+                <div>
+                    <small><strong>Değerler:</strong> {', '.join(values)}</small><br>
+                    <small><strong>Yaş:</strong> {story['child_age']} | <strong>Tarih:</strong> {created_at.strftime('%d/%m/%Y')}</small>
+                </div>
+            </div>
+        </div>
+        """, unsafe_allow_html=True)
+        
+        # Action buttons for each story
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            if st.button("🔊 Anne Sesi ile Dinle", key=f"listen_{story['id']}"):
+                st.success(f"🎵 {story['title']} anne sesi ile çalınıyor...")
+                # Would integrate with TTS here
+                st.audio("https://www.soundjay.com/misc/sounds/bell-ringing-05.wav", format="audio/wav")
+        with col2:
+            if st.button("👂 Normal Dinle", key=f"normal_{story['id']}"):
+                st.info(f"📖 {story['title']} hikayesi başlıyor...")
+        with col3:
+            if st.button("🎮 Oyunlar", key=f"games_{story['id']}"):
+                show_games_section(story['content'], values)
+        
+        st.markdown("<hr>", unsafe_allow_html=True)
+
+
+show_story_library()
@@ -0,0 +1,54 @@
+"""Usage statistics and development report page"""
+
+import streamlit as st
+
+from kokogretim import charts
+from kokogretim.resources import load_story_store, current_user_id, cached_usage_counts, cached_weekly_totals
+
+
+def show_statistics():
+    """Display statistics page"""
+    st.markdown("## 📊 Kullanım İstatistikleri ve Çocuk Gelişim Raporu")
+    
+    store = load_story_store()
+    user_id = current_user_id()
+
+    # Key metrics
+    story_total, child_total = cached_usage_counts(user_id, store.version)
+    week_stories, week_words, value_total = cached_weekly_totals(user_id, store.version)
+    cards = [
+        ("📚 Toplam Hikaye", story_total, f"+{week_stories} bu hafta"),
+        ("⏱️ Dinleme Süresi", f"{week_words / charts.NARRATION_WPM:.0f} dk", "son 7 gün"),
+        ("🎯 Öğrenilen Değer", value_total, "farklı değer"),
+        ("👧 Aktif Çocuk", child_total, "hikaye oluşturulan"),
+    ]
+    for col, (label, value, note) in zip(st.columns(4), cards):
+        with col:
+            st.markdown(f"""
+            <div class="metric-card">
+                <h3>{label}</h3>
+                <h2 style="color: #228B22;">{value}</h2>
+                <small>{note}</small>
+            </div>
+            """, unsafe_allow_html=True)
+    
+    # Charts
+    start, end = charts.last_days(7)
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        # Weekly activity chart
+        fig = charts.weekly_activity_figure(store, user_id, None, start, end, store.version)
+        st.plotly_chart(fig, use_container_width=True)
+    
+    with col2:
+        # Values learned pie chart
+        fig = charts.values_pie_figure(store, user_id, None, store.version)
+        st.plotly_chart(fig, use_container_width=True)
+    
+    # Development tracking
+    st.markdown("### 📈 Çocuk Gelişim Takibi")
+    st.plotly_chart(charts.development_figure(), use_container_width=True)
+
+
+show_statistics()
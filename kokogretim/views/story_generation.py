@@ -0,0 +1,222 @@
+"""Story generation page; the only page that calls the LLM clients"""
+
+import time
+from datetime import datetime
+
+import streamlit as st
+
+from kokogretim.story_pool import StoryPool, STORY_VALUES, DEFAULT_VALUES, DEFAULT_PARENT_MESSAGE, is_default_request
+from kokogretim.semantic_cache import SemanticStoryCache, OpenAIEmbedder
+from kokogretim.clients import MISSING_KEY
+from kokogretim.telemetry import get_telemetry, usage_tokens
+from kokogretim.resources import load_story_store, load_client_registry, current_user_id
+from kokogretim.components import show_games_section
+
+
+@st.cache_resource
+def load_story_pool():
+    """Load pregenerated template stories once per process"""
+    return StoryPool.load()
+
+@st.cache_resource
+def load_story_cache():
+    """Semantic near-duplicate story cache shared by all sessions"""
+    _, openai_client = load_client_registry().clients()
+    return SemanticStoryCache(OpenAIEmbedder(openai_client) if openai_client else None)
+
+def show_story_generation():
+    """Display story generation page"""
+    st.markdown("## 🎭 AI Destekli Hikaye Oluşturma")
+    
+    registry = load_client_registry()
+    gemini_model, openai_client = registry.clients()
+    client_status = registry.status()
+    
+    if client_status["openai"]["state"] == MISSING_KEY:
+        st.warning("⚠️ OpenAI API anahtarı bulunamadı")
+    if not gemini_model:
+        # Pool and cached stories are still served; only new stories need Gemini
+        if client_status["gemini"]["state"] == MISSING_KEY:
+            st.warning("⚠️ Gemini API anahtarı bulunamadı; yalnızca hazır hikayeler sunulabilir. "
+                       "Yeni hikayeler için .env dosyanıza GEMINI_API_KEY ekleyin.")
+        else:
+            st.warning(f"Gemini başlatılırken hata: {client_status['gemini']['error']}; "
+                       "yalnızca hazır hikayeler sunulabilir.")
+    
+    # Child selection
+    col1, col2 = st.columns([1, 2])
+    
+    with col1:
+        st.markdown("### 👶 Çocuk Profili")
+        child_name = st.text_input("Çocuk Adı:", value="Ayşe")
+        child_age = st.slider("Yaş:", min_value=3, max_value=12, value=6)
+        
+        # Values selection
+        st.markdown("### 🎯 İşlemek İstediğiniz Değerler")
+        values = st.multiselect(
+            "Değerleri Seçin:",
+            STORY_VALUES,
+            default=DEFAULT_VALUES
+        )
+    
+    with col2:
+        st.markdown("### 🎤 Ses Mesajı veya Metin")
+        input_method = st.radio("Giriş Yöntemi:", ["Metin", "Ses Kaydı"])
+        
+        if input_method == "Metin":
+            parent_message = st.text_area(
+                "Anne/Baba Mesajı:",
+                DEFAULT_PARENT_MESSAGE,
+                height=150
+            )
+        else:
+            st.info("🎤 Ses kaydı özelliği geliştirilme aşamasında...")
+            parent_message = st.text_area("Geçici olarak metninizi yazın:", height=100)
+    
+    # Generate story button
+    if st.button("✨ Hikaye Oluştur", use_container_width=True, type="primary"):
+        if parent_message and values:
+            started = time.perf_counter()
+            # Default requests are answered from the pregenerated story pool,
+            # near-duplicates of earlier requests from the semantic cache
+            reused = None
+            if is_default_request(parent_message):
+                pool = load_story_pool()
+                entry = pool.lookup(child_age, values)
+                if entry:
+                    reused = pool.render(entry, child_name)
+            if not reused:
+                cache = load_story_cache()
+                entry = cache.lookup(child_age, values, parent_message)
+                if entry:
+                    reused = cache.render(entry, child_name)
+            
+            if reused or gemini_model:
+                generate_story(gemini_model, child_name, child_age, values, parent_message, reused,
+                               time.perf_counter() - started)
+            else:
+                st.error("⚠️ Bu istek için hazır hikaye yok ve Gemini kullanılamıyor. "
+                         "Varsayılan mesajı deneyin veya GEMINI_API_KEY ekleyin.")
+        else:
+            st.warning("⚠️ Lütfen anne/baba mesajı yazın ve en az bir değer seçin.")
+    
+    # Rendered outside the button branch so the actions keep working across reruns
+    if st.session_state.current_story:
+        show_current_story(st.session_state.current_story)
+
+def generate_story(gemini_model, child_name, child_age, values, parent_message, reused, lookup_seconds):
+    """Show a reused story or generate one with Gemini, then persist it"""
+    # Story latency: pool/cache lookups plus the Gemini call, not the progress animation
+    elapsed = lookup_seconds
+    with st.spinner("🤖 AI ajanları çalışıyor... Hikaye oluşturuluyor..."):
+        # Progress bar
+        progress_bar = st.progress(0)
+        status_text = st.empty()
+        
+        if not reused:
+            # Simulate multi-agent processing
+            status_text.text("🎭 StorytellerAgent analiz ediyor...")
+            progress_bar.progress(25)
+            time.sleep(1)
+        
+            status_text.text("🛡️ GuardianAgent güvenlik kontrolü yapıyor...")
+            progress_bar.progress(50)
+            time.sleep(1)
+        
+            status_text.text("💭 ChildPsychologyAgent yaş uygunluğunu değerlendiriyor...")
+            progress_bar.progress(75)
+            time.sleep(1)
+        
+            status_text.text("🎤 VoiceAgent tamamlanıyor...")
+            progress_bar.progress(100)
+        
+        try:
+            if reused:
+                story = reused["content"]
+                title = reused.get("title")
+            else:
+                # Generate story with Gemini
+                prompt = f"""
+                Türk kültürü ve geleneksel değerlerini içeren, {child_age} yaşındaki {child_name} için kişiselleştirilmiş bir hikaye oluştur.
+            
+                Anne/Baba Mesajı: {parent_message}
+                İşlenecek Değerler: {', '.join(values)}
+            
+                Hikaye şu özellikleri içermeli:
+                - Türk kültürüne uygun karakterler ve ortam
+                - {child_age} yaş grubuna uygun dil ve kavramlar
+                - Seçilen değerleri doğal bir şekilde işlemeli
+                - Eğlenceli ve öğretici olmalı
+                - Yaklaşık 200-300 kelime olmalı
+            
+                Hikayen sadece hikaye metni olsun, başka açıklama ekleme.
+                """
+            
+                generation_started = time.perf_counter()
+                with get_telemetry().track("llm", "story_generation", provider="gemini") as call:
+                    response = gemini_model.generate_content(prompt)
+                    call.update(usage_tokens(response))
+                elapsed += time.perf_counter() - generation_started
+                story = response.text
+                title = f"{child_name} için Özel Hikaye"
+                load_story_cache().add(child_age, values, parent_message, child_name, title, story)
+            
+            progress_bar.empty()
+            status_text.empty()
+            
+            # Persist right away so a rerun or reconnect never forces a paid regeneration
+            current = {
+                "user_id": current_user_id(),
+                "child_name": child_name,
+                "child_age": child_age,
+                "title": title or f"{child_name} için Özel Hikaye",
+                "content": story,
+                "values_taught": values,
+                "source": reused["source"] if reused else "gemini",
+                "created_at": datetime.now().isoformat(),
+            }
+            load_story_store().save_story(current)
+            st.session_state.current_story = current
+            get_telemetry().record("story", current["source"], elapsed * 1000)
+            
+            st.success("✅ Hikaye başarıyla oluşturuldu!")
+            
+        except Exception as e:
+            st.error(f"Hikaye oluşturulurken hata: {str(e)}")
+
+def show_current_story(story):
+    """Display the current story with its action buttons"""
+    values = story.get("values_taught") or []
+    created_at = datetime.fromisoformat(story["created_at"])
+    
+    st.markdown(f"""
+    <div class="story-card">
+        <h3>📖 {story['title']}</h3>
+        <div style="font-size: 1.1em; line-height: 1.6; color: #2F4F2F;">
+            {story['content']}
+        </div>
+        <hr>
+        <small><strong>İşlenen Değerler:</strong> {', '.join(values)}</small><br>
+        <small><strong>Yaş Grubu:</strong> {story['child_age']} yaş</small><br>
+        <small><strong>Oluşturulma Tarihi:</strong> {created_at.strftime('%d/%m/%Y %H:%M')}</small>
+    </div>
+    """, unsafe_allow_html=True)
+    
+    # Action buttons
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        if st.button("🔊 Anne Sesi ile Dinle", use_container_width=True, key="listen_story"):
+            st.success("🎵 Hikaye anne sesi ile hazırlanıyor...")
+            # This would integrate with text-to-speech
+            st.audio("https://www.soundjay.com/misc/sounds/bell-ringing-05.wav", format="audio/wav")
+    with col2:
+        if st.button("💾 Kaydet", use_container_width=True, disabled=bool(story.get("saved"))):
+            load_story_store().mark_saved(story["id"])
+            story["saved"] = True
+            st.success("✅ Hikaye kütüphaneye kaydedildi!")
+    with col3:
+        if st.button("🎮 Oyunlar", use_container_width=True):
+            show_games_section(story["content"], values)
+
+
+show_story_generation()
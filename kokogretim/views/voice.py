@@ -0,0 +1,72 @@
+"""Voice analytics page"""
+
+import streamlit as st
+
+from kokogretim import charts
+
+
+def show_voice_analytics():
+    """Display voice analytics page"""
+    st.markdown("## 🎤 Ses Analizi ve Ebeveyn Geri Bildirimi")
+    
+    st.markdown("""
+    <div class="story-card">
+        <h3>🎵 Ses Kaydı Özelliği</h3>
+        <p>Bu özellik şu anda geliştirilme aşamasında. Yakında şu özellikleri kullanabileceksiniz:</p>
+        <ul>
+            <li>🎤 Gerçek zamanlı ses kaydı</li>
+            <li>🧠 Duygusal ton analizi</li>
+            <li>📊 Ebeveynlik stili tespiti</li>
+            <li>🎯 Kültürel değer çıkarımı</li>
+            <li>🔊 Ses optimizasyonu</li>
+        </ul>
+    </div>
+    """, unsafe_allow_html=True)
+    
+    # Simulated voice analytics
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        st.markdown("### 🎤 Son Ses Analizleri")
+        
+        # Emotional tone chart
+        st.plotly_chart(charts.emotional_tone_figure(), use_container_width=True)
+    
+    with col2:
+        st.markdown("### 👨‍👩‍👧‍👦 Ebeveynlik Stili")
+        st.plotly_chart(charts.parenting_style_figure(), use_container_width=True)
+    
+    # Voice improvement suggestions
+    st.markdown("### 💡 Ses Geliştirme Önerileri")
+    
+    col1, col2, col3 = st.columns(3)
+    
+    with col1:
+        st.success("""
+        ✅ **Güçlü Yanlar**
+        - Sevgi dolu ton
+        - Net telaffuz
+        - Uygun hız
+        - Duygusal bağlantı
+        """)
+    
+    with col2:
+        st.info("""
+        💡 **Geliştirilebilir**
+        - Hikaye dramatizasyonu
+        - Vurgulama teknikleri
+        - İnteraktif sorular
+        - Duraklamalar
+        """)
+    
+    with col3:
+        st.warning("""
+        📈 **Öneriler**
+        - Ses tonunu çeşitlendirin
+        - Karakter sesleri deneyin
+        - Daha fazla duygusal ifade
+        - Çocuğun tepkilerini bekleyin
+        """)
+
+
+show_voice_analytics()